@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import sys
+import time
+
+# 索引に使う部分文字列（q-gram）の長さと、代表を選ぶ窓のq-gramの数
+# この2つで決まる長さ（GRAM_LENGTH + WINDOW_SIZE - 1 = 16文字）以上の文字列は索引で判定できる
+GRAM_LENGTH = 4
+WINDOW_SIZE = 13
+
+class ChunkIndex:
+    """
+    登録したチャンクのいずれかに、指定した文字列が部分文字列として含まれるかを判定する索引
+
+    チャンクの連続するWINDOW_SIZE個のq-gramごとに、ハッシュ値が最小のもの（minimizer）を代表として登録する
+    ある文字列がチャンクに含まれていれば、その文字列の先頭の窓はチャンクの中の窓と一致するため、
+    文字列の先頭の窓の代表で引いたチャンクだけを調べればよい（含まれるかどうかの確認は str の検索で行う）
+    登録済みのチャンクを一つずつ検索する方法（チャンク数の二乗に比例する時間）と異なり、ほぼ線形の時間で判定できる
+    索引で判定できない短い文字列だけは、登録済みのチャンクを順に検索する
+    """
+
+    def __init__(self):
+        # 登録したチャンク（登録順）と、完全一致の判定用の集合
+        self.chunks = []
+        self.chunk_set = set()
+        # 代表のハッシュ値 → その代表を含むチャンクの番号のリスト
+        self.anchors = {}
+
+    def __len__(self):
+        return len(self.chunks)
+
+    def __contains__(self, text):
+        return self.contains(text)
+
+    @staticmethod
+    def _gram_hashes(text):
+        """文字列のすべてのq-gramのハッシュ値のリスト"""
+        return [hash(text[i:i + GRAM_LENGTH]) for i in range(len(text) - GRAM_LENGTH + 1)]
+
+    def contains(self, text):
+        """
+        登録済みのチャンクのいずれかにtextが含まれていればTrueを返す（any(text in c for c in chunks)と同じ）
+        """
+        if text in self.chunk_set:
+            return True
+        if len(text) < GRAM_LENGTH + WINDOW_SIZE - 1:
+            # 窓が一つも取れない短い文字列は、すべてのチャンクを検索する
+            return any(text in chunk for chunk in self.chunks)
+        anchor = min(self._gram_hashes(text[:GRAM_LENGTH + WINDOW_SIZE - 1]))
+        chunks = self.chunks
+        return any(text in chunks[number] for number in self.anchors.get(anchor, ()))
+
+    def add(self, chunk):
+        """
+        チャンクを登録する
+        """
+        if chunk in self.chunk_set:
+            return
+        number = len(self.chunks)
+        self.chunks.append(chunk)
+        self.chunk_set.add(chunk)
+        hashes = self._gram_hashes(chunk)
+        # すべての窓の代表（同じ代表は一度だけ登録する）
+        representatives = {min(hashes[i:i + WINDOW_SIZE]) for i in range(len(hashes) - WINDOW_SIZE + 1)}
+        anchors = self.anchors
+        for anchor in representatives:
+            numbers = anchors.get(anchor)
+            if numbers is None:
+                anchors[anchor] = [number]
+            else:
+                numbers.append(number)
+
+def unique_chunks(chunks, accept=None):
+    """
+    既に採用したチャンクに含まれないチャンクだけを、出現順に採用する
+
+    Args:
+        chunks: チャンクのイテラブル
+        accept (callable, optional): 採用する条件（Falseのチャンクは採用せず、索引にも登録しない）
+
+    Returns:
+        list: 採用したチャンクのリスト
+    """
+    index = ChunkIndex()
+    # 一度判定したチャンクは、結果が変わらないため再度判定しない
+    # （採用したチャンクや含まれていたチャンクは以降も含まれ、条件を満たさないチャンクは以降も満たさない）
+    checked = set()
+    result = []
+    for chunk in chunks:
+        if chunk in checked:
+            continue
+        checked.add(chunk)
+        if accept is not None and not accept(chunk):
+            continue
+        if not index.contains(chunk):
+            index.add(chunk)
+            result.append(chunk)
+    return result
+
+def main():
+    if len(sys.argv) < 2:
+        print("使用方法: python chunk_index.py <テキストファイル>")
+        print("  空行で区切られたチャンクの重複（他のチャンクに含まれるもの）を除去した数と処理時間を表示する")
+        return
+
+    with open(sys.argv[1], 'r', encoding='utf-8', errors='ignore') as f:
+        chunks = [chunk for chunk in f.read().split('\n\n') if chunk]
+
+    start = time.perf_counter()
+    result = unique_chunks(chunks)
+    print(f"チャンク数: {len(chunks)}, 採用: {len(result)} ({time.perf_counter() - start:.3f}秒)")
+
+if __name__ == "__main__":
+    main()
@@ -5,10 +5,122 @@ import os
 import sys
 import re
 from pathlib import Path
+from line_classifier import has_text_content
+from text_stream import iter_file_blocks, write_joined
+from line_dedupe import create_line_set, ExactLineSet, DEDUPE_MODES, DEFAULT_BLOOM_CAPACITY, DEFAULT_BLOOM_ERROR_RATE
 
-def clean_text(input_path, output_path=None, encoding='utf-8'):
+# クリーニングで使用するパターン（読み込み時に一度だけコンパイル）
+XML_DECLARATION_PATTERN = re.compile(r'<\?xml.*?>', flags=re.DOTALL)
+MARKUP_TAG_PATTERN = re.compile(r'</?[a-zA-Z0-9:]+.*?>', flags=re.DOTALL)
+BINARY_GARBAGE_PATTERN = re.compile(r'[^\x20-\x7E\u3000-\u30FF\u4E00-\u9FFF\u3040-\u309F\uFF00-\uFF9F\u2000-\u206F\n]+')
+CONTROL_CHAR_PATTERN = re.compile(r'[\x00-\x1F\x7F]')
+
+def _strip_markup(chunks, pattern):
+    """
+    テキストの断片の並びから、'<'で始まり'>'で終わるパターンを削除しながら順に出力する
+
+    タグは複数の行にまたがることがあるため、閉じていない'<'以降の部分だけを次の断片まで持ち越す
+    （テキスト全体にpattern.subを適用した場合と同じ結果になる）
+    """
+    carry = []
+    for chunk in chunks:
+        if carry and '>' not in chunk:
+            # 閉じていないタグの続き
+            carry.append(chunk)
+            continue
+        if carry:
+            carry.append(chunk)
+            chunk = ''.join(carry)
+            carry = []
+        last = chunk.rfind('>')
+        # 最後の'>'までに始まるパターンは、すべてその'>'までに終わる
+        head = pattern.sub('', chunk[:last + 1]) if last >= 0 else ''
+        tail = chunk[last + 1:]
+        start = tail.find('<')
+        if start >= 0:
+            carry.append(tail[start:])
+            tail = tail[:start]
+        if head or tail:
+            yield head + tail
+    if carry:
+        yield ''.join(carry)
+
+def iter_clean_lines(chunks, stats=None, line_set=None):
+    """
+    テキストの断片の並びから、読みやすい行だけを重複を除いて順に出力する
+
+    テキスト全体をメモリに保持しないため、保持するのは処理中の行と重複チェック用の行の集合だけになる
+    重複チェックにハッシュやブルームフィルタ、ディスク上の集合を使うと、行の集合のメモリも一定に抑えられる
+
+    Args:
+        chunks: テキストの断片のイテラブル（iter_file_blocksの結果や、テキスト全体を一つだけ含むリストなど）
+        stats (dict, optional): 指定した場合はXML除去後の行数（'lines'）を格納する
+        line_set (optional): 重複チェックに使う行の集合（line_dedupe.create_line_setの結果）
+            複数のファイルで同じ集合を使うと、ファイルをまたいで重複を除去する。指定がない場合は行そのものを保持する
+
+    Yields:
+        str: 抽出した行
+    """
+    # ステップ1: 明らかなバイナリデータやXMLを削除
+    stream = _strip_markup(_strip_markup(chunks, XML_DECLARATION_PATTERN), MARKUP_TAG_PATTERN)
+    
+    line_count = 0
+    if line_set is None:
+        line_set = ExactLineSet()
+    
+    def split_lines():
+        """XML除去後のテキストを改行で分割して出力する（str.split('\\n')と同じ行）"""
+        partial = []
+        for piece in stream:
+            end = piece.rfind('\n')
+            if end < 0:
+                partial.append(piece)
+                continue
+            partial.append(piece[:end])
+            # ステップ2: 制御文字やバイナリゴミを削除（改行は対象外のため、完結した行の並びにまとめて適用できる）
+            yield from BINARY_GARBAGE_PATTERN.sub(' ', ''.join(partial)).split('\n')
+            partial = [piece[end + 1:]]
+        yield BINARY_GARBAGE_PATTERN.sub(' ', ''.join(partial))
+    
+    for line in split_lines():
+        line_count += 1
+        
+        # ステップ3: 日本語文字と英数字、句読点のみの行を抽出
+        # 基本的なクリーンアップ
+        line = line.strip()
+        
+        # 空行をスキップ
+        if not line:
+            continue
+        
+        # 日本語文字または英数字を含む行のみを保持
+        if has_text_content(line):
+            # さらに不要な記号を削除
+            line = CONTROL_CHAR_PATTERN.sub('', line)  # 制御文字を削除
+            
+            # 行に十分な文字数があり、まだ出力していない行のみ出力
+            if len(line) > 3 and line_set.add_new(line):
+                yield line
+    
+    if stats is not None:
+        stats['lines'] = line_count
+
+def clean_text_content(content):
+    """
+    テキストをクリーニングし、読みやすいテキストだけを返す（ファイルの読み書きは行わない）
+
+    Args:
+        content (str): クリーニングするテキスト
+
+    Returns:
+        str: クリーニング済みテキスト
+    """
+    return '\n'.join(iter_clean_lines([content]))
+
+def clean_text(input_path, output_path=None, encoding='utf-8', line_set=None):
     """
     テキストファイルをクリーニングし、読みやすいテキストだけを抽出する
+    line_setを指定した場合は、その集合で重複行を判定する（複数のファイルで共有するとファイルをまたいで重複を除去）
     """
     # 出力パスが指定されていない場合は入力ファイルに _cleaned を付加
     if output_path is None:
@@ -18,86 +130,129 @@ def clean_text(input_path, output_path=None, encoding='utf-8'):
     print(f"出力先: {output_path}")
     
     try:
-        # ファイルを読み込む
-        with open(input_path, 'r', encoding=encoding, errors='ignore') as f:
-            content = f.read()
-        
-        # ステップ1: 明らかなバイナリデータやXMLを削除
-        cleaned_text = re.sub(r'<\?xml.*?>', '', content, flags=re.DOTALL)
-        cleaned_text = re.sub(r'</?[a-zA-Z0-9:]+.*?>', '', cleaned_text, flags=re.DOTALL)
-        
-        # ステップ2: 制御文字やバイナリゴミを削除
-        cleaned_text = re.sub(r'[^\x20-\x7E\u3000-\u30FF\u4E00-\u9FFF\u3040-\u309F\uFF00-\uFF9F\u2000-\u206F\n]+', ' ', cleaned_text)
-        
-        # ステップ3: 日本語文字と英数字、句読点のみの行を抽出
-        lines = cleaned_text.split('\n')
-        meaningful_lines = []
-        
-        for line in lines:
-            # 基本的なクリーンアップ
-            line = line.strip()
-            
-            # 空行をスキップ
-            if not line:
-                continue
-            
-            # 日本語文字または英数字を含む行のみを保持
-            if re.search(r'[ぁ-んァ-ヶ一-龠々〆〜]', line) or re.search(r'[a-zA-Z0-9]{3,}', line):
-                # さらに不要な記号を削除
-                line = re.sub(r'[\x00-\x1F\x7F]', '', line)  # 制御文字を削除
-                
-                # 行に十分な文字数がある場合のみ追加
-                if len(line) > 3:
-                    meaningful_lines.append(line)
-        
-        # 重複行を削除
-        unique_lines = []
-        seen = set()
-        
-        for line in meaningful_lines:
-            if line not in seen:
-                seen.add(line)
-                unique_lines.append(line)
-        
-        # クリーニング済みテキストを書き込む
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(unique_lines))
+        # 一定の大きさずつ読み込み、抽出した行をそのまま書き込む（ファイル全体をメモリに読み込まない）
+        stats = {}
+        line_count = write_joined(output_path, iter_clean_lines(iter_file_blocks(input_path, encoding), stats, line_set))
         
         print(f"クリーニング完了: {output_path}")
-        print(f"元の行数: {len(lines)}, クリーニング後の行数: {len(unique_lines)}")
+        print(f"元の行数: {stats['lines']}, クリーニング後の行数: {line_count}")
+        if line_set is not None and not isinstance(line_set, ExactLineSet):
+            print(f"重複チェック: 記録済みの行数 {len(line_set)}, 誤判定率の上限 {line_set.false_positive_bound():.3g}")
         return True
     
     except Exception as e:
         print(f"エラー: {str(e)}")
         return False
 
+def find_text_files(directory_path):
+    """
+    ディレクトリ内（サブディレクトリを含む）のクリーニング対象のテキストファイルを返す
+    クリーニング済みのファイル（_cleaned.txt）は対象外
+    """
+    return sorted(str(p) for p in Path(directory_path).glob("**/*.txt") if not p.name.endswith("_cleaned.txt"))
+
+def parse_number(arg, convert, minimum=None, maximum=None):
+    """
+    --name=VALUE形式の引数の値を数値に変換する
+
+    Args:
+        arg (str): コマンドライン引数
+        convert (callable): intまたはfloat
+        minimum (optional): 許可する最小値
+        maximum (optional): 許可する最大値
+
+    Returns:
+        変換した数値
+
+    Raises:
+        Exception: 数値でない場合、または範囲外の場合
+    """
+    name, _, value = arg.partition("=")
+    try:
+        number = convert(value)
+    except ValueError:
+        kind = "整数" if convert is int else "数値"
+        raise Exception(f"{name}には{kind}を指定してください: '{value}'")
+    if (minimum is not None and number < minimum) or (maximum is not None and number > maximum):
+        if maximum is None:
+            bounds = f"{minimum}以上の値"
+        elif minimum is None:
+            bounds = f"{maximum}以下の値"
+        else:
+            bounds = f"{minimum}〜{maximum}の範囲の値"
+        raise Exception(f"{name}には{bounds}を指定してください: '{value}'")
+    return number
+
 def main():
     if len(sys.argv) < 2:
-        print("使用方法: python cleanup_text.py <テキストファイル> [--encoding=ENCODING] [--output=OUTPUT_PATH]")
+        print("使用方法: python cleanup_text.py <テキストファイルまたはディレクトリ> [--encoding=ENCODING] [--output=OUTPUT_PATH] [--dedupe=MODE] [--dedupe-db=PATH] [--bloom-capacity=N] [--bloom-error=RATE]")
         print("  --encoding=ENCODING: 入力ファイルのエンコーディング (デフォルト: utf-8)")
         print("  --output=OUTPUT_PATH: 出力先ファイルパス (デフォルト: 入力ファイル名_cleaned.txt)")
+        print(f"  --dedupe=MODE: 重複行の判定方式（{', '.join(DEDUPE_MODES)}） (デフォルト: exact)")
+        print("      digest64/digest128は行のハッシュだけを、bloomは固定サイズのビット列を、diskはSQLiteファイルを使う")
+        print("      ディレクトリを指定した場合は、すべてのファイルで重複チェックを共有する（ページごとのヘッダーなどを除去）")
+        print("  --dedupe-db=PATH: diskの場合のデータベースファイルのパス（指定しない場合は実行ごとの一時ファイル）")
+        print("      指定したファイルには記録が残り、次回以降の実行では記録済みの行を重複として除去する")
+        print(f"  --bloom-capacity=N: bloomの場合の想定する一意な行数 (デフォルト: {DEFAULT_BLOOM_CAPACITY})")
+        print(f"  --bloom-error=RATE: bloomの場合の誤判定率 (デフォルト: {DEFAULT_BLOOM_ERROR_RATE})")
         return
     
     input_path = sys.argv[1]
     encoding = 'utf-8'
     output_path = None
+    dedupe_mode = 'exact'
+    dedupe_db = None
+    bloom_capacity = DEFAULT_BLOOM_CAPACITY
+    bloom_error = DEFAULT_BLOOM_ERROR_RATE
     
     # コマンドライン引数を解析
-    for arg in sys.argv[2:]:
-        if arg.startswith("--encoding="):
-            encoding = arg.split("=")[1]
-        elif arg.startswith("--output="):
-            output_path = arg.split("=")[1]
+    try:
+        for arg in sys.argv[2:]:
+            if arg.startswith("--encoding="):
+                encoding = arg.split("=")[1]
+            elif arg.startswith("--output="):
+                output_path = arg.split("=")[1]
+            elif arg.startswith("--dedupe="):
+                dedupe_mode = arg.split("=")[1]
+            elif arg.startswith("--dedupe-db="):
+                dedupe_db = arg.split("=", 1)[1]
+            elif arg.startswith("--bloom-capacity="):
+                bloom_capacity = parse_number(arg, int, 1)
+            elif arg.startswith("--bloom-error="):
+                # 誤判定率は0と1を含まない（0や1ではブルームフィルタのサイズを計算できない）
+                bloom_error = parse_number(arg, float)
+                if not 0 < bloom_error < 1:
+                    raise Exception(f"--bloom-errorには0より大きく1より小さい値を指定してください: '{arg.split('=', 1)[1]}'")
+    except Exception as e:
+        print(f"エラー: {str(e)}")
+        return
     
     if not os.path.exists(input_path):
         print(f"エラー: 指定されたファイル '{input_path}' が存在しません。")
         return
     
-    # ファイルをクリーニング
-    if clean_text(input_path, output_path, encoding):
-        print(f"クリーニングが完了しました。")
-    else:
-        print(f"クリーニングに失敗しました。")
+    try:
+        line_set = create_line_set(dedupe_mode, dedupe_db, bloom_capacity, bloom_error)
+    except Exception as e:
+        print(f"エラー: {str(e)}")
+        return
+    if getattr(line_set, 'preexisting', 0):
+        print(f"警告: {dedupe_db} には以前の実行で記録された {line_set.preexisting} 行があり、これらの行は重複として除去されます")
+    
+    try:
+        if os.path.isdir(input_path):
+            # ディレクトリ内のすべてのファイルを、重複チェックを共有してクリーニング
+            files = find_text_files(input_path)
+            print(f"クリーニング対象: {len(files)}ファイル")
+            failed = [path for path in files if not clean_text(path, None, encoding, line_set)]
+            print(f"クリーニングが完了しました。成功: {len(files) - len(failed)}ファイル, 失敗: {len(failed)}ファイル")
+        # ファイルをクリーニング
+        elif clean_text(input_path, output_path, encoding, line_set):
+            print(f"クリーニングが完了しました。")
+        else:
+            print(f"クリーニングに失敗しました。")
+    finally:
+        line_set.close()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
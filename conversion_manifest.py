@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+import sys
+import json
+import hashlib
+import time
+
+# 出力ルートに作成するマニフェストのファイル名
+MANIFEST_FILENAME = '.conversion_manifest.sqlite3'
+
+# ハッシュ計算時の読み込み単位
+HASH_CHUNK_SIZE = 1024 * 1024
+
+def file_sha256(path):
+    """
+    ファイル内容のSHA-256ハッシュを計算する
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def options_key(options):
+    """
+    変換結果に影響するオプションを比較用の文字列にまとめる
+    """
+    return json.dumps(options or {}, sort_keys=True, ensure_ascii=False)
+
+class ConversionManifest:
+    """
+    変換済みファイルの情報（サイズ・更新日時・ハッシュ・変換方法・出力先）を記録するマニフェスト
+    ディレクトリのルートにSQLiteファイルとして保存し、次回以降の実行で変更のないファイルを判定する
+    """
+
+    def __init__(self, directory_path, filename=MANIFEST_FILENAME):
+        """
+        Args:
+            directory_path (str): 処理対象のルートディレクトリ
+            filename (str): マニフェストのファイル名
+        """
+        self.root = os.path.abspath(directory_path)
+        self.path = os.path.join(self.root, filename)
+        # sqlite3はマニフェストを使う場合だけ読み込む（起動時間の短縮）
+        import sqlite3
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS files (
+                source TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                sha256 TEXT NOT NULL,
+                method TEXT,
+                output TEXT NOT NULL,
+                options TEXT NOT NULL,
+                converted_at REAL NOT NULL
+            )"""
+        )
+        self.conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+
+    def close(self):
+        """マニフェストを閉じる"""
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def _key(self, source_path):
+        """ルートからの相対パス（区切りは/）をキーとして使う"""
+        return os.path.relpath(os.path.abspath(source_path), self.root).replace(os.sep, '/')
+
+    def _output_path(self, output):
+        """記録された出力先を絶対パスに戻す"""
+        return os.path.join(self.root, output.replace('/', os.sep))
+
+    def get(self, source_path):
+        """
+        記録されているエントリを返す（記録がない場合はNone）
+        """
+        row = self.conn.execute(
+            "SELECT size, mtime_ns, sha256, method, output, options FROM files WHERE source = ?",
+            (self._key(source_path),)
+        ).fetchone()
+        if row is None:
+            return None
+        size, mtime_ns, sha256, method, output, options = row
+        return {
+            'size': size,
+            'mtime_ns': mtime_ns,
+            'sha256': sha256,
+            'method': method,
+            'output': self._output_path(output),
+            'options': options,
+        }
+
+    def is_up_to_date(self, source_path, options=None):
+        """
+        前回の変換以降、ファイルが変更されていないか確認する
+
+        サイズと更新日時が一致すればハッシュは計算しない。更新日時だけが異なる場合は
+        ハッシュを比較し、内容が同じであれば記録された更新日時を更新する
+
+        Args:
+            source_path (str): 変換元ファイルのパス
+            options (dict, optional): 変換オプション（異なる場合は再変換が必要と判定）
+
+        Returns:
+            bool: 再変換が不要な場合はTrue
+        """
+        entry = self.get(source_path)
+        if entry is None or entry['options'] != options_key(options):
+            return False
+        if not os.path.exists(entry['output']):
+            return False
+
+        stat = os.stat(source_path)
+        if stat.st_size != entry['size']:
+            return False
+        if stat.st_mtime_ns == entry['mtime_ns']:
+            return True
+
+        # 更新日時だけが変わった場合（コピーやチェックアウトなど）は内容で判定する
+        if file_sha256(source_path) != entry['sha256']:
+            return False
+        self.conn.execute(
+            "UPDATE files SET mtime_ns = ? WHERE source = ?",
+            (stat.st_mtime_ns, self._key(source_path))
+        )
+        self.conn.commit()
+        return True
+
+    def record(self, source_path, output_path, method=None, options=None):
+        """
+        変換に成功したファイルの情報を記録する
+
+        Args:
+            source_path (str): 変換元ファイルのパス
+            output_path (str): 作成されたテキストファイルのパス
+            method (str, optional): 採用された変換方法
+            options (dict, optional): 変換オプション
+        """
+        stat = os.stat(source_path)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (self._key(source_path), stat.st_size, stat.st_mtime_ns, file_sha256(source_path),
+             method, self._key(output_path), options_key(options), time.time())
+        )
+        self.conn.commit()
+
+    def remove(self, source_path):
+        """
+        ファイルの記録を削除する（変換に失敗した場合など）
+        """
+        self.conn.execute("DELETE FROM files WHERE source = ?", (self._key(source_path),))
+        self.conn.commit()
+
+    def entries(self):
+        """
+        記録されているすべてのエントリを (変換元, 変換方法, 出力先) のリストで返す
+        """
+        rows = self.conn.execute("SELECT source, method, output FROM files ORDER BY source").fetchall()
+        return [(source, method, output) for source, method, output in rows]
+
+def main():
+    if len(sys.argv) < 2:
+        print("使用方法: python conversion_manifest.py <ディレクトリパス>")
+        return
+
+    directory_path = sys.argv[1]
+    manifest_path = os.path.join(directory_path, MANIFEST_FILENAME)
+    if not os.path.exists(manifest_path):
+        print(f"エラー: マニフェスト '{manifest_path}' が存在しません。")
+        return
+
+    with ConversionManifest(directory_path) as manifest:
+        entries = manifest.entries()
+        for source, method, output in entries:
+            print(f"{source} -> {output} ({method or '不明'})")
+        print(f"記録済み: {len(entries)}ファイル")
+
+if __name__ == "__main__":
+    main()
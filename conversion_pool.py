@@ -0,0 +1,242 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+import sys
+import time
+import queue
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from extraction_cache import DEFAULT_MAX_BYTES
+
+# ワーカー数あたりの、同時にプールに投入するファイル数（残りは投入せずに待たせるため、キャンセルするとすぐに止まる）
+QUEUE_PER_WORKER = 2
+
+# キャンセルされたかどうかを確認する間隔（秒）
+CANCEL_POLL_INTERVAL = 0.1
+
+# ワーカープロセスに渡されるキャンセルフラグの共有配列（プールの作成時に受け取る）
+_cancel_flags = None
+
+def _init_worker(flags):
+    global _cancel_flags
+    _cancel_flags = flags
+
+class SlotToken:
+    """
+    ワーカープロセスから参照する、1ファイル分のキャンセルフラグ（threading.Eventと同じis_set()で確認する）
+    """
+
+    def __init__(self, flags, slot):
+        self.flags = flags
+        self.slot = slot
+
+    def is_set(self):
+        return bool(self.flags[self.slot])
+
+def _run_job(slot, file_path, options, cache_path, cache_max_bytes):
+    """ワーカープロセスで1ファイルを変換する（変換方法の合間にキャンセルフラグを確認する）"""
+    # 変換モジュールの読み込みは重いため、ワーカーで初めて変換する時点で読み込む
+    from word_to_text_converter import convert_file_job
+    return convert_file_job(file_path, options, cache_path, cache_max_bytes,
+                            cancel=SlotToken(_cancel_flags, slot))
+
+class FileTask:
+    """
+    プールに投入した1ファイルの変換
+    """
+
+    def __init__(self, pool, file_path, slot, future):
+        self.pool = pool
+        self.file_path = file_path
+        self.slot = slot
+        self.future = future
+        self.finished = False
+
+    def cancel(self):
+        """
+        この変換をキャンセルする
+        まだ開始していなければ実行せず、実行中であれば現在の変換方法が終わった時点で中断する
+        """
+        if self.future.cancel():
+            return
+        with self.pool.lock:
+            # 終了した変換のフラグは次のファイルが使うため、実行中の場合だけ立てる
+            if not self.finished:
+                self.pool.flags[self.slot] = 1
+
+    def result(self):
+        """
+        変換結果を返す
+
+        Returns:
+            tuple: (ファイルパス, 出力パス, エラーメッセージ, 変換中の出力, 変換方法などの詳細)
+            キャンセルされた場合は詳細の'cancelled'がTrue
+        """
+        if self.future.cancelled():
+            return self.file_path, None, None, "", {'cancelled': True}
+        try:
+            return self.future.result()
+        except Exception as e:
+            return self.file_path, None, str(e), "", {}
+
+class ConversionPool:
+    """
+    複数のプロセスでファイルを変換するプール
+
+    同時に投入するファイルの数を制限し、キャンセルされた場合は未投入のファイルを投入せず、
+    投入済みで未開始の変換は取り消し、実行中の変換は現在の変換方法が終わった時点で中断させる
+    """
+
+    def __init__(self, jobs=None, queue_size=None, cache_path=None, cache_max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Args:
+            jobs (int, optional): ワーカープロセスの数（Noneの場合はCPUのコア数）
+            queue_size (int, optional): 同時に投入するファイルの数（Noneの場合はワーカー数のQUEUE_PER_WORKER倍）
+            cache_path (str, optional): 抽出結果のキャッシュファイルのパス
+            cache_max_bytes (int): キャッシュの上限サイズ（バイト）
+        """
+        self.jobs = max(jobs or os.cpu_count() or 1, 1)
+        self.capacity = max(queue_size or self.jobs * QUEUE_PER_WORKER, self.jobs)
+        self.cache_path = cache_path
+        self.cache_max_bytes = cache_max_bytes
+        context = multiprocessing.get_context()
+        # 投入中のファイルごとのキャンセルフラグ（スロット番号で参照し、変換が終わったスロットは次のファイルが使う）
+        self.flags = context.RawArray('b', self.capacity)
+        self.free_slots = list(range(self.capacity))
+        self.lock = threading.Lock()
+        self.tasks = set()
+        self.cancelled = threading.Event()
+        self.executor = ProcessPoolExecutor(max_workers=self.jobs, mp_context=context,
+                                            initializer=_init_worker, initargs=(self.flags,))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def submit(self, file_path, options, on_done=None):
+        """
+        ファイルの変換を投入する（空いているスロットがない場合はExceptionを送出する。runを使えば自動的に待つ）
+
+        Args:
+            file_path (str): 変換するファイルのパス
+            options (dict): convert_word_fileに渡すオプション
+            on_done (callable, optional): 変換が終わったときにFileTaskを受け取る関数（プール内部のスレッドで呼ばれる）
+
+        Returns:
+            FileTask: 投入した変換
+        """
+        with self.lock:
+            if not self.free_slots:
+                raise Exception(f"同時に投入できるファイル数（{self.capacity}）を超えています")
+            slot = self.free_slots.pop()
+            self.flags[slot] = 0
+        future = self.executor.submit(_run_job, slot, file_path, options, self.cache_path, self.cache_max_bytes)
+        task = FileTask(self, file_path, slot, future)
+        with self.lock:
+            self.tasks.add(task)
+
+        def release(_):
+            with self.lock:
+                task.finished = True
+                self.tasks.discard(task)
+                self.free_slots.append(slot)
+            if on_done is not None:
+                on_done(task)
+        future.add_done_callback(release)
+        return task
+
+    def cancel_all(self):
+        """
+        すべての変換をキャンセルする（以降のrunは新しいファイルを投入しない）
+        """
+        self.cancelled.set()
+        with self.lock:
+            tasks = list(self.tasks)
+        for task in tasks:
+            task.cancel()
+
+    def run(self, files, options, on_result, cancel=None, on_submit=None):
+        """
+        ファイルを順に投入し、変換が終わったものから結果をon_resultに渡す（呼び出したスレッドで呼ぶ）
+
+        Args:
+            files: 変換するファイルのパスのイテラブル
+            options (dict): convert_word_fileに渡すオプション
+            on_result (callable): (ファイルパス, 出力パス, エラーメッセージ, 変換中の出力, 詳細)を受け取る関数
+            cancel (threading.Event, optional): セットされるとcancel_all()と同じくすべての変換をキャンセルする
+            on_submit (callable, optional): ファイルをプールに投入した時点でファイルパスを受け取る関数
+
+        Returns:
+            list: キャンセルにより投入しなかったファイルのリスト
+        """
+        pending = iter(files)
+        completed = queue.Queue()
+        active = 0
+        while True:
+            if cancel is not None and cancel.is_set() and not self.cancelled.is_set():
+                self.cancel_all()
+            # 空いているスロットの数だけ投入する（キャンセルされた後は投入しない）
+            while active < self.capacity and not self.cancelled.is_set():
+                file_path = next(pending, None)
+                if file_path is None:
+                    break
+                self.submit(file_path, options, completed.put)
+                active += 1
+                if on_submit is not None:
+                    on_submit(file_path)
+            if active == 0:
+                break
+            try:
+                task = completed.get(timeout=CANCEL_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+            active -= 1
+            on_result(*task.result())
+        return list(pending)
+
+    def close(self):
+        """
+        ワーカープロセスを終了する（キャンセルされている場合は未開始の変換を取り消す）
+        """
+        self.executor.shutdown(wait=True, cancel_futures=self.cancelled.is_set())
+
+def main():
+    if len(sys.argv) < 2:
+        print("使用方法: python conversion_pool.py <Word文書> [<Word文書> ...] [--jobs=N]")
+        print("  複数のプロセスでWord文書を変換する（Ctrl+Cで未処理のファイルをキャンセルする）")
+        return
+
+    jobs = None
+    files = []
+    for arg in sys.argv[1:]:
+        if arg.startswith("--jobs="):
+            jobs = int(arg.split("=")[1])
+        else:
+            files.append(arg)
+
+    def on_result(file_path, output_path, error, log, details):
+        if details.get('cancelled'):
+            print(f"キャンセル: {file_path}")
+        elif error is not None or not output_path:
+            print(f"変換失敗: {file_path} {error or ''}")
+        else:
+            print(f"変換完了: {output_path} ({details.get('method')})")
+
+    start = time.perf_counter()
+    with ConversionPool(jobs) as pool:
+        print(f"{pool.jobs} プロセスで変換します")
+        try:
+            skipped = pool.run(files, {}, on_result)
+        except KeyboardInterrupt:
+            pool.cancel_all()
+            skipped = []
+    if skipped:
+        print(f"キャンセルにより変換しなかったファイル: {len(skipped)}")
+    print(f"合計: {len(files)}ファイル ({time.perf_counter() - start:.2f}秒)")
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ import os
 import sys
 import re
 from pathlib import Path
+from text_stats import japanese_stats
 
 def convert_doc_to_utf8(doc_path, output_path=None):
     """
@@ -25,10 +26,9 @@ def convert_doc_to_utf8(doc_path, output_path=None):
         text = content.decode('utf-8', errors='ignore')
         
         # 日本語文字が含まれているか確認
-        jp_chars = re.findall(r'[ぁ-んァ-ヶ一-龠々〆〜]', text)
-        jp_ratio = len(jp_chars) / max(len(text), 1)
+        jp_count, jp_ratio = japanese_stats(text)
         
-        print(f"UTF-8デコード: テキスト長={len(text)}, 日本語文字数={len(jp_chars)}, 比率={jp_ratio:.2%}")
+        print(f"UTF-8デコード: テキスト長={len(text)}, 日本語文字数={jp_count}, 比率={jp_ratio:.2%}")
         
         # 不要なバイナリデータやノイズを除去
         text = re.sub(r'[^\x20-\x7E\u3000-\u30FF\u4E00-\u9FFF\u3040-\u309F\uFF00-\uFF9F\u2000-\u206F\n]+', '', text)
@@ -0,0 +1,212 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+import sys
+import time
+import shutil
+from optional_backends import is_backend_available, disabled_backends
+
+# 実測した処理時間を推定コストに反映する割合（指数移動平均の重み）
+COST_SMOOTHING = 0.3
+
+class Backend:
+    """
+    変換方法（ファイルのパスを受け取り、抽出したテキストを返す関数）と、その対応形式・利用条件・推定コスト
+    """
+
+    def __init__(self, name, extract, formats, cost, platforms=None, modules=(), commands=(), check=None, fallback=False, options=(),
+                 tier=0):
+        """
+        Args:
+            name (str): 変換方法の名前（ログや変換結果の記録に使う）
+            extract (callable): ファイルのパスを受け取り、テキストを返す関数（失敗時は例外を送出するかNoneを返す）
+            formats (tuple): 対応する拡張子（例: ('.doc',)）
+            cost (float): 1ファイルあたりの処理時間の初期推定値（秒）。テキストを抽出できた実行の実測値で更新する
+            platforms (tuple, optional): 利用できるプラットフォーム（sys.platformの値、例: ('win32',)）。Noneはすべて
+            modules (tuple): 必要なモジュール（optional_backends.import_backendで読み込むもの）
+            commands (tuple): 必要な外部コマンド
+            check (callable, optional): 上記以外の利用条件。利用できない場合は理由の文字列を返す関数
+            fallback (bool): Trueの場合はコストに関係なく、他の変換方法の後に試す（結果の質を判定できない最終手段）
+            options (tuple): extractがキーワード引数として受け取る、変換の処理から渡される値の名前（例: ('session',)）
+            tier (int): 結果の質による優先順位（小さいほど先に試す）。推定コストは同じ優先順位の中での順序だけを決める
+        """
+        self.name = name
+        self.extract = extract
+        self.formats = tuple(fmt.lower() for fmt in formats)
+        self.cost = cost
+        self.platforms = platforms
+        self.modules = tuple(modules)
+        self.commands = tuple(commands)
+        self.check = check
+        self.fallback = fallback
+        self.options = tuple(options)
+        self.tier = tier
+        self.runs = 0
+        self._reason = None
+        self._checked = False
+
+    def supports(self, file_format):
+        """拡張子（例: '.doc'）に対応しているか判定する"""
+        return file_format.lower() in self.formats
+
+    def unavailable_reason(self):
+        """
+        この環境で利用できない場合はその理由を、利用できる場合はNoneを返す（結果は記録して再利用する）
+
+        プラットフォームを最初に確認するため、対応していないプラットフォームではモジュールの読み込みも試さない
+        """
+        if not self._checked:
+            self._reason = self._find_unavailable_reason()
+            self._checked = True
+        return self._reason
+
+    def _find_unavailable_reason(self):
+        if self.platforms is not None and not sys.platform.startswith(self.platforms):
+            return f"{sys.platform}では利用できません"
+        for command in self.commands:
+            if shutil.which(command) is None:
+                return f"{command}コマンドがインストールされていません"
+        for module_name in self.modules:
+            if not is_backend_available(module_name):
+                return disabled_backends().get(module_name, f"{module_name}を読み込めません")
+        if self.check is not None:
+            return self.check()
+        return None
+
+    def is_available(self):
+        return self.unavailable_reason() is None
+
+    def sort_key(self):
+        """試す順序（最終手段かどうか、優先順位、推定コストの順に比較する）"""
+        return (self.fallback, self.tier, self.cost)
+    
+    def record(self, seconds):
+        """実測した処理時間で推定コストを更新する（指数移動平均）"""
+        self.cost += COST_SMOOTHING * (seconds - self.cost)
+        self.runs += 1
+
+class BackendRegistry:
+    """
+    変換方法の一覧
+
+    変換の処理は対応形式と利用条件を満たす変換方法を優先順位（同じ優先順位の中では推定コストの小さい順）に
+    試すだけなので、新しい変換方法は登録するだけで、変換の処理を変更せずに使われる
+    """
+
+    def __init__(self):
+        # 名前 → Backend（登録順）
+        self.backends = {}
+
+    def __iter__(self):
+        return iter(self.backends.values())
+
+    def __len__(self):
+        return len(self.backends)
+
+    def add(self, name, extract, formats, cost, **conditions):
+        """
+        変換方法を登録する（同じ名前の変換方法は置き換える）
+
+        Args:
+            name (str): 変換方法の名前
+            extract (callable): ファイルのパスを受け取り、テキストを返す関数
+            formats (tuple): 対応する拡張子
+            cost (float): 処理時間の初期推定値（秒）
+            **conditions: Backendのplatforms / modules / commands / check / fallback / options / tier
+
+        Returns:
+            Backend: 登録した変換方法
+        """
+        backend = Backend(name, extract, formats, cost, **conditions)
+        self.backends[name] = backend
+        return backend
+
+    def register(self, name, formats, cost, **conditions):
+        """
+        関数に付けて変換方法を登録するデコレータ（関数はそのまま返す）
+        """
+        def decorator(extract):
+            self.add(name, extract, formats, cost, **conditions)
+            return extract
+        return decorator
+
+    def candidates(self, file_format):
+        """
+        拡張子に対応し、この環境で利用できる変換方法を試す順に返す
+        優先順位が異なる変換方法の順序は実行時の処理時間によって変わらないため、どの変換方法の結果が採用されるかは
+        それまでに変換したファイルに左右されない（推定コストは同じ優先順位の中での順序だけを決める）
+
+        Args:
+            file_format (str): 拡張子（例: '.doc'）
+
+        Returns:
+            list: Backendのリスト（最終手段の変換方法は最後、優先順位とコストが同じ場合は登録順）
+        """
+        backends = [backend for backend in self.backends.values()
+                    if backend.supports(file_format) and backend.is_available()]
+        return sorted(backends, key=Backend.sort_key)
+
+    def skipped(self, file_format):
+        """
+        拡張子に対応しているが、この環境で利用できない変換方法と理由のリストを返す
+        """
+        return [(backend, backend.unavailable_reason()) for backend in self.backends.values()
+                if backend.supports(file_format) and not backend.is_available()]
+
+    def run(self, backend, file_path, **options):
+        """
+        変換方法を実行し、テキストを抽出できた場合はかかった時間で推定コストを更新する
+        （すぐに失敗する変換方法のコストが下がって先に試されないよう、失敗した場合の時間は反映しない）
+
+        Args:
+            backend (Backend): 実行する変換方法
+            file_path (str): 変換するファイルのパス
+            **options: 変換方法に渡す値（変換方法がoptionsで受け取ると宣言したものだけを渡す）
+
+        Returns:
+            str: 抽出したテキスト（変換方法がNoneを返した場合はNone）
+        """
+        start = time.perf_counter()
+        text = backend.extract(file_path, **{name: value for name, value in options.items() if name in backend.options})
+        if text:
+            backend.record(time.perf_counter() - start)
+        return text
+
+    def costs(self):
+        """変換方法の名前 → 現在の推定コスト（秒）"""
+        return {name: backend.cost for name, backend in self.backends.items()}
+
+def print_registry(registry):
+    """
+    変換方法ごとの対応形式・推定コスト・利用可否を表示する
+    """
+    print(f"Python: {sys.version.split()[0]} ({sys.platform})")
+    for backend in sorted(registry, key=Backend.sort_key):
+        reason = backend.unavailable_reason()
+        status = "利用可能" if reason is None else f"利用不可 - {reason}"
+        fallback = "（最終手段）" if backend.fallback else ""
+        print(f"  {backend.name}{fallback} [{', '.join(backend.formats)}] 優先順位 {backend.tier}, "
+              f"推定コスト {backend.cost:.3f}秒: {status}")
+
+def main():
+    # word_to_text_converterの変換方法の一覧を表示する（読み込みが重いため、表示する場合だけ読み込む）
+    from word_to_text_converter import DOC_BACKENDS
+    print_registry(DOC_BACKENDS)
+    if len(sys.argv) > 1:
+        # 指定したファイルで利用できる変換方法を実行し、実測した時間を表示する
+        file_path = sys.argv[1]
+        if not os.path.exists(file_path):
+            print(f"エラー: 指定されたファイル '{file_path}' が存在しません。")
+            return
+        for backend in DOC_BACKENDS.candidates(os.path.splitext(file_path)[1]):
+            start = time.perf_counter()
+            try:
+                text = DOC_BACKENDS.run(backend, file_path)
+                result = f"{len(text or '')}文字"
+            except Exception as e:
+                result = f"失敗 - {str(e)}"
+            print(f"  {backend.name}: {result} ({time.perf_counter() - start:.3f}秒)")
+
+if __name__ == "__main__":
+    main()
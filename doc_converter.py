@@ -3,11 +3,10 @@
 
 import os
 import sys
-import win32com.client
 import tempfile
 import shutil
-import docx2txt
 from pathlib import Path
+from optional_backends import import_backend
 
 def convert_doc_file(doc_path, output_path=None, encoding='utf-8'):
     """
@@ -27,7 +26,7 @@ def convert_doc_file(doc_path, output_path=None, encoding='utf-8'):
         
         try:
             # Word COMを使用して.docを.docxに変換
-            word = win32com.client.Dispatch("Word.Application")
+            word = import_backend('win32com.client').Dispatch("Word.Application")
             word.Visible = False
             
             try:
@@ -37,7 +36,7 @@ def convert_doc_file(doc_path, output_path=None, encoding='utf-8'):
                 doc.Close(SaveChanges=False)
                 
                 print("docxからテキストを抽出中...")
-                text = docx2txt.process(temp_docx)
+                text = import_backend('docx2txt').process(temp_docx)
                 
                 with open(output_path, 'w', encoding=encoding) as f:
                     f.write(text)
@@ -8,10 +8,16 @@ import glob
 from pathlib import Path
 import docx2txt
 import docx
-import platform
 import tempfile
 import shutil
 import re
+import io
+import contextlib
+from text_stats import count_ranges, WIDE_JAPANESE_RANGES
+from docx_stream import write_docx_text
+from text_stream import open_replacing
+from optional_backends import import_backend
+from converter_backends import BackendRegistry
 
 def convert_docx_to_text(docx_path, output_path=None):
     """
@@ -22,15 +28,15 @@ def convert_docx_to_text(docx_path, output_path=None):
         if output_path is None:
             output_path = str(Path(docx_path).with_suffix('.txt'))
         
-        # docx2txtを使用してテキスト抽出を試みる
+        # document.xmlなどを先頭から順に読み込み、メモリに保持せずに書き込む（docx2txtと同じ結果）
+        # 途中で失敗した場合に書きかけの.txtを残さないよう、一時ファイルに書き込んでから置き換える
         try:
-            text = docx2txt.process(docx_path)
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(text)
+            with open_replacing(output_path) as f:
+                write_docx_text(docx_path, f)
             print(f"変換完了: {output_path}")
             return output_path
         except Exception as e1:
-            print(f"docx2txtでの変換に失敗しました（{docx_path}）: {str(e1)}")
+            print(f"XMLストリーム解析での変換に失敗しました（{docx_path}）: {str(e1)}")
             print("python-docxでの変換を試みます...")
         
         # python-docxを使用して抽出を試みる
@@ -61,118 +67,110 @@ def convert_docx_to_text(docx_path, output_path=None):
         print(f"変換エラー（{docx_path}）: {str(e)}")
         return None
 
+# .docの変換方法の一覧（利用できるものを推定コストの小さい順に試す）
+DOC_BACKENDS = BackendRegistry()
+
+@DOC_BACKENDS.register("Word COM", ('.doc',), cost=3.0, platforms=('win32',), modules=('win32com.client',))
+def get_text_with_word_com(doc_path):
+    """
+    Word COMで.docを.docxに変換し、docx2txtでテキストを抽出する
+    """
+    # 一時ファイルの作成
+    temp_dir = tempfile.mkdtemp()
+    temp_docx = os.path.join(temp_dir, "temp.docx")
+    
+    try:
+        # Word COMを使用して.docを.docxに変換
+        print(f"Word COMを使用して変換中: {doc_path}")
+        word = import_backend('win32com.client').Dispatch("Word.Application")
+        word.Visible = False
+        doc = word.Documents.Open(os.path.abspath(doc_path))
+        doc.SaveAs2(os.path.abspath(temp_docx), FileFormat=16)  # 16 = .docx
+        doc.Close()
+        word.Quit()
+        
+        # 変換した.docxからテキストを抽出
+        print(f".docxからテキストを抽出中...")
+        return docx2txt.process(temp_docx)
+    finally:
+        # 一時ディレクトリの削除
+        try:
+            shutil.rmtree(temp_dir)
+        except:
+            pass
+
+@DOC_BACKENDS.register("docx2txt", ('.doc',), cost=0.1)
+def get_text_with_docx2txt(doc_path):
+    """
+    docx2txtを使ってdocファイルから直接テキストを抽出してみる
+    """
+    print(f"docx2txtでdocファイルを直接変換中: {doc_path}")
+    return docx2txt.process(doc_path)
+
+@DOC_BACKENDS.register("バイナリ解析", ('.doc',), cost=0.2, fallback=True)
+def get_text_with_binary_parsing(doc_path):
+    """
+    バイナリを複数のエンコーディングでデコードし、日本語文字の割合が最も高いものを返す（有効なテキストがなければNone）
+    """
+    print(f"バイナリ解析での変換を試みます: {doc_path}")
+    
+    # バイナリモードでファイルを開く
+    with open(doc_path, 'rb') as f:
+        content = f.read()
+    
+    # 複数のエンコーディングで試す
+    encodings = ['utf-8', 'shift_jis', 'cp932', 'euc_jp']
+    best_text = None
+    best_jp_ratio = 0
+    
+    for enc in encodings:
+        try:
+            # デコードを試みる
+            text = content.decode(enc, errors='ignore')
+            
+            # 日本語文字の割合を計算
+            jp_chars = count_ranges(text, WIDE_JAPANESE_RANGES)
+            jp_ratio = jp_chars / max(len(text), 1)
+            
+            if jp_ratio > best_jp_ratio:
+                best_text = text
+                best_jp_ratio = jp_ratio
+        except:
+            continue
+    
+    if best_text and best_jp_ratio > 0.01:  # 1%以上の日本語文字があれば有効とする
+        # 不要なバイナリノイズを除去
+        return re.sub(r'[^\x20-\x7E\u3000-\u30FF\u4E00-\u9FFF\u3040-\u309F\uFF00-\uFF9F\u2000-\u206F\n]+', '', best_text)
+    
+    print("有効なテキストが抽出できませんでした")
+    return None
+
 def convert_doc_to_text(doc_path, output_path=None, encoding='utf-8'):
     """
     .docファイルをテキストファイルに変換する
-    Windowsの場合はCOMを使用して.docxに変換してから処理
+    DOC_BACKENDSのうち、この環境で利用できる変換方法を推定コストの小さい順に試す
+    （Windowsの場合はCOMを使用して.docxに変換してから処理する方法も含まれる）
     """
     try:
         # 出力パスが指定されていない場合は入力ファイルと同じ場所に.txtを作成
         if output_path is None:
             output_path = str(Path(doc_path).with_suffix('.txt'))
         
-        # Windows環境の場合はWordのCOMを使用
-        if platform.system() == 'Windows':
+        for backend in DOC_BACKENDS.candidates('.doc'):
             try:
-                import win32com.client
-                
-                # 一時ファイルの作成
-                temp_dir = tempfile.mkdtemp()
-                temp_docx = os.path.join(temp_dir, "temp.docx")
-                
-                try:
-                    # Word COMを使用して.docを.docxに変換
-                    print(f"Word COMを使用して変換中: {doc_path}")
-                    word = win32com.client.Dispatch("Word.Application")
-                    word.Visible = False
-                    doc = word.Documents.Open(os.path.abspath(doc_path))
-                    doc.SaveAs2(os.path.abspath(temp_docx), FileFormat=16)  # 16 = .docx
-                    doc.Close()
-                    word.Quit()
-                    
-                    # 変換した.docxからテキストを抽出
-                    print(f".docxからテキストを抽出中...")
-                    try:
-                        text = docx2txt.process(temp_docx)
-                        
-                        # 指定されたエンコーディングで書き込み
-                        with open(output_path, 'w', encoding=encoding) as f:
-                            f.write(text)
-                        
-                        print(f"変換完了: {output_path}")
-                        return output_path
-                    except Exception as e:
-                        print(f"テキスト抽出に失敗: {str(e)}")
-                        raise
-                finally:
-                    # 一時ディレクトリの削除
-                    try:
-                        shutil.rmtree(temp_dir)
-                    except:
-                        pass
-            except ImportError:
-                print("win32com.clientが利用できません。Python-docxでの変換を試みます...")
-                
+                text = DOC_BACKENDS.run(backend, doc_path)
             except Exception as e:
-                print(f"Word COMでの変換に失敗: {str(e)}")
-                print("Python-docxでの変換を試みます...")
-        
-        # docx2txtを使ってdocファイルから直接テキストを抽出してみる
-        try:
-            print(f"docx2txtでdocファイルを直接変換中: {doc_path}")
-            text = docx2txt.process(doc_path)
+                print(f"{backend.name}での変換に失敗: {str(e)}")
+                continue
+            if text is None:
+                continue
             
             # 指定されたエンコーディングで書き込み
             with open(output_path, 'w', encoding=encoding) as f:
                 f.write(text)
             
-            print(f"変換完了: {output_path}")
+            print(f"{backend.name}による変換完了: {output_path}")
             return output_path
-        except Exception as e2:
-            print(f"docx2txtでの直接変換に失敗: {str(e2)}")
-        
-        # バイナリ解析での変換を試みる
-        try:
-            print(f"バイナリ解析での変換を試みます: {doc_path}")
-            
-            # バイナリモードでファイルを開く
-            with open(doc_path, 'rb') as f:
-                content = f.read()
-            
-            # 複数のエンコーディングで試す
-            encodings = ['utf-8', 'shift_jis', 'cp932', 'euc_jp']
-            best_text = None
-            best_jp_ratio = 0
-            
-            for enc in encodings:
-                try:
-                    # デコードを試みる
-                    text = content.decode(enc, errors='ignore')
-                    
-                    # 日本語文字の割合を計算
-                    jp_chars = len([c for c in text if '\u3040' <= c <= '\u30ff' or '\u4e00' <= c <= '\u9fff'])
-                    jp_ratio = jp_chars / max(len(text), 1)
-                    
-                    if jp_ratio > best_jp_ratio:
-                        best_text = text
-                        best_jp_ratio = jp_ratio
-                except:
-                    continue
-            
-            if best_text and best_jp_ratio > 0.01:  # 1%以上の日本語文字があれば有効とする
-                # 不要なバイナリノイズを除去
-                cleaned_text = re.sub(r'[^\x20-\x7E\u3000-\u30FF\u4E00-\u9FFF\u3040-\u309F\uFF00-\uFF9F\u2000-\u206F\n]+', '', best_text)
-                
-                # 指定されたエンコーディングで書き込み
-                with open(output_path, 'w', encoding=encoding) as f:
-                    f.write(cleaned_text)
-                
-                print(f"バイナリ解析による変換完了: {output_path}")
-                return output_path
-            else:
-                print("有効なテキストが抽出できませんでした")
-        except Exception as e3:
-            print(f"バイナリ解析での変換に失敗: {str(e3)}")
         
         print(f"すべての変換方法が失敗しました: {doc_path}")
         return None
@@ -181,9 +179,36 @@ def convert_doc_to_text(doc_path, output_path=None, encoding='utf-8'):
         print(f"変換エラー（{doc_path}）: {str(e)}")
         return None
 
-def process_directory(directory_path, recursive=True, encoding='utf-8'):
+def convert_word_file(file_path, encoding='utf-8'):
+    """
+    拡張子に応じて.docまたは.docxファイルをテキストファイルに変換する
+    """
+    if file_path.lower().endswith('.docx'):
+        return convert_docx_to_text(file_path)
+    return convert_doc_to_text(file_path, encoding=encoding)
+
+def convert_file_job(file_path, encoding='utf-8'):
+    """
+    プロセスプールのワーカーで1ファイルを変換する
+    並列実行時にファイルごとの出力が混ざらないよう、標準出力をまとめて返す
+    
+    Returns:
+        tuple: (ファイルパス, 出力パス, エラーメッセージ, 変換中の出力)
+    """
+    log = io.StringIO()
+    output_path = None
+    error = None
+    with contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+        try:
+            output_path = convert_word_file(file_path, encoding)
+        except Exception as e:
+            error = str(e)
+    return file_path, output_path, error, log.getvalue()
+
+def process_directory(directory_path, recursive=True, encoding='utf-8', jobs=1):
     """
     指定したディレクトリ内のすべてのWordファイルをテキストに変換する
+    jobsが2以上の場合は複数のプロセスで並列に変換する
     """
     # 絶対パスに変換
     directory_path = os.path.abspath(directory_path)
@@ -202,46 +227,60 @@ def process_directory(directory_path, recursive=True, encoding='utf-8'):
     
     print(f"発見したファイル: {len(docx_files)} DOCX ファイル, {len(doc_files)} DOC ファイル")
     
-    # .docxファイルを処理
-    for docx_file in docx_files:
-        docx_path = str(docx_file)
-        print(f"処理中: {docx_path}")
-        try:
-            output_path = convert_docx_to_text(docx_path)
-            if output_path:
-                success_files.append(docx_path)
-            else:
-                failed_files.append(docx_path)
-        except Exception as e:
-            print(f"変換エラー（{docx_path}）: {str(e)}")
-            failed_files.append(docx_path)
+    # .docxファイル、.docファイルの順に処理
+    word_files = [str(f) for f in docx_files] + [str(f) for f in doc_files]
     
-    # .docファイルを処理
-    for doc_file in doc_files:
-        doc_path = str(doc_file)
-        print(f"処理中: {doc_path}")
-        try:
-            output_path = convert_doc_to_text(doc_path, encoding=encoding)
-            if output_path:
-                success_files.append(doc_path)
-            else:
-                failed_files.append(doc_path)
-        except Exception as e:
-            print(f"変換エラー（{doc_path}）: {str(e)}")
-            failed_files.append(doc_path)
+    if jobs > 1 and len(word_files) > 1:
+        # 完了したファイルから順に、ファイル単位でまとめて出力する
+        print(f"{jobs} プロセスで並列に変換します")
+        # multiprocessingの読み込みは重いため、並列処理を行う場合だけ読み込む
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = {executor.submit(convert_file_job, f, encoding): f for f in word_files}
+            for future in as_completed(futures):
+                file_path = futures[future]
+                try:
+                    file_path, output_path, error, log = future.result()
+                except Exception as e:
+                    output_path, error, log = None, str(e), ""
+                
+                print(f"処理中: {file_path}")
+                if log:
+                    print(log, end='' if log.endswith('\n') else '\n')
+                if error is not None:
+                    print(f"変換エラー（{file_path}）: {error}")
+                    failed_files.append(file_path)
+                elif output_path:
+                    success_files.append(file_path)
+                else:
+                    failed_files.append(file_path)
+    else:
+        for file_path in word_files:
+            print(f"処理中: {file_path}")
+            try:
+                output_path = convert_word_file(file_path, encoding)
+                if output_path:
+                    success_files.append(file_path)
+                else:
+                    failed_files.append(file_path)
+            except Exception as e:
+                print(f"変換エラー（{file_path}）: {str(e)}")
+                failed_files.append(file_path)
     
     return success_files, failed_files
 
 def main():
     if len(sys.argv) < 2:
-        print("使用方法: python doc_to_txt.py <ファイル or ディレクトリ> [--no-recursive] [--encoding=ENCODING]")
+        print("使用方法: python doc_to_txt.py <ファイル or ディレクトリ> [--no-recursive] [--encoding=ENCODING] [--jobs=N]")
         print("  --no-recursive: サブディレクトリを再帰的に処理しない")
+        print("  --jobs=N: N個のプロセスで並列に変換する (デフォルト: 1)")
         print("  --encoding=ENCODING: 出力エンコーディング (デフォルト: utf-8, 例: --encoding=shift-jis)")
         return
     
     path = sys.argv[1]
     recursive = True
     encoding = 'utf-8'
+    jobs = 1
     
     # コマンドライン引数を解析
     for arg in sys.argv[2:]:
@@ -249,6 +288,8 @@ def main():
             recursive = False
         elif arg.startswith("--encoding="):
             encoding = arg.split("=")[1]
+        elif arg.startswith("--jobs="):
+            jobs = max(int(arg.split("=")[1]), 1)
     
     if not os.path.exists(path):
         print(f"エラー: 指定されたパス '{path}' が存在しません。")
@@ -259,8 +300,9 @@ def main():
         print(f"ディレクトリ '{path}' 内のWordファイルをテキストに変換します...")
         print(f"再帰的処理: {'有効' if recursive else '無効'}")
         print(f"出力エンコーディング: {encoding}")
+        print(f"並列プロセス数: {jobs}")
         
-        success_files, failed_files = process_directory(path, recursive, encoding)
+        success_files, failed_files = process_directory(path, recursive, encoding, jobs)
         
         print("\n変換処理が完了しました。")
         print(f"成功: {len(success_files)}ファイル")
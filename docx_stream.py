@@ -0,0 +1,435 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+import sys
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+
+# WordprocessingMLの名前空間
+W_NAMESPACE = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+
+def qn(tag):
+    """'w:p' のような接頭辞付きの名前を ElementTree のタグ名に変換する"""
+    prefix, name = tag.split(':')
+    return f'{{{W_NAMESPACE}}}{name}'
+
+W_P = qn('w:p')
+W_T = qn('w:t')
+W_TAB = qn('w:tab')
+W_BR = qn('w:br')
+W_CR = qn('w:cr')
+W_R = qn('w:r')
+W_HYPERLINK = qn('w:hyperlink')
+W_NO_BREAK_HYPHEN = qn('w:noBreakHyphen')
+W_PTAB = qn('w:ptab')
+W_BODY = qn('w:body')
+W_TBL = qn('w:tbl')
+W_TR = qn('w:tr')
+W_TC = qn('w:tc')
+W_TC_PR = qn('w:tcPr')
+W_GRID_SPAN = qn('w:gridSpan')
+W_V_MERGE = qn('w:vMerge')
+W_TYPE = qn('w:type')
+W_VAL = qn('w:val')
+W_TXBX_CONTENT = qn('w:txbxContent')
+
+# 互換性のためのマークアップ（mc:Fallbackには同じテキストボックスの旧形式の複製が入る）
+MC_NAMESPACE = 'http://schemas.openxmlformats.org/markup-compatibility/2006'
+MC_FALLBACK = f'{{{MC_NAMESPACE}}}Fallback'
+
+# docx2txtと同じ順序（ヘッダー、本文、フッター）で読み込むパート
+DOCUMENT_XML = 'word/document.xml'
+HEADER_XML_PATTERN = re.compile(r'word/header[0-9]*.xml')
+FOOTER_XML_PATTERN = re.compile(r'word/footer[0-9]*.xml')
+
+# 選択できるセクションと、出力する順序
+# textboxesはパートではなく、各パートの中のテキストボックス（w:txbxContent）を出力するかどうかを表す
+SECTIONS = ('header', 'body', 'footer', 'footnotes', 'endnotes', 'comments', 'textboxes')
+SECTION_PARTS = {
+    'header': HEADER_XML_PATTERN,
+    'body': DOCUMENT_XML,
+    'footer': FOOTER_XML_PATTERN,
+    'footnotes': 'word/footnotes.xml',
+    'endnotes': 'word/endnotes.xml',
+    'comments': 'word/comments.xml',
+}
+
+def parse_sections(value):
+    """
+    カンマ区切りのセクション指定（例: 'body,footnotes'、'all'）を解析する
+
+    Args:
+        value (str): セクションの指定
+
+    Returns:
+        tuple: 指定されたセクション（指定の順序に関係なくSECTIONSの順）
+
+    Raises:
+        Exception: 不明なセクションが指定された場合
+    """
+    names = [name.strip().lower() for name in value.split(',') if name.strip()]
+    if names == ['all']:
+        return SECTIONS
+    for name in names:
+        if name not in SECTIONS:
+            raise Exception(f"不明なセクションです: {name}（指定できるセクション: {', '.join(SECTIONS)}, all）")
+    if not names:
+        raise Exception("セクションが指定されていません")
+    return tuple(name for name in SECTIONS if name in names)
+
+def _part_number(name):
+    """header2.xml などのパート名の番号（番号がない場合は0）"""
+    digits = re.findall(r'[0-9]+', os.path.basename(name))
+    return int(digits[0]) if digits else 0
+
+def iter_xml_text(source, skip_tags=()):
+    """
+    WordprocessingMLのXMLを先頭から順に読み込み、テキストの断片を出力する
+
+    docx2txtと同じく、段落（w:p）の開始で空行を、w:tabでタブを、w:br/w:crで改行を出力する
+    表のセル（w:tc）の中も段落として同じ順序で出力される
+    読み終えた要素はその場で破棄するため、文書の大きさに関係なくメモリ使用量は一定に保たれる
+
+    Args:
+        source: XMLを読み込むファイルオブジェクト
+        skip_tags (tuple): 中身を出力しない要素のタグ
+
+    Yields:
+        str: テキストの断片
+    """
+    stack = []
+    # 出力しない要素の中にいる間は、その深さを数える
+    skip_depth = 0
+    for event, elem in ET.iterparse(source, events=('start', 'end')):
+        if event == 'start':
+            stack.append(elem)
+            tag = elem.tag
+            if skip_depth or tag in skip_tags:
+                skip_depth += 1
+            elif tag == W_P:
+                yield '\n\n'
+            elif tag == W_TAB:
+                yield '\t'
+            elif tag == W_BR or tag == W_CR:
+                yield '\n'
+            continue
+
+        stack.pop()
+        if skip_depth:
+            skip_depth -= 1
+        elif elem.tag == W_T and elem.text:
+            yield elem.text
+        # 読み終えた要素を親から切り離して破棄する
+        elem.clear()
+        if stack:
+            stack[-1].remove(elem)
+
+def run_text(run):
+    """
+    ラン（w:r）のテキストを返す（python-docxのRun.textと同じ規則）
+    """
+    parts = []
+    for child in run:
+        tag = child.tag
+        if tag == W_T:
+            parts.append(child.text or '')
+        elif tag == W_TAB or tag == W_PTAB:
+            parts.append('\t')
+        elif tag == W_BR:
+            # ページ区切りなどは改行として扱わない
+            if child.get(W_TYPE, 'textWrapping') == 'textWrapping':
+                parts.append('\n')
+        elif tag == W_CR:
+            parts.append('\n')
+        elif tag == W_NO_BREAK_HYPHEN:
+            parts.append('-')
+    return ''.join(parts)
+
+def paragraph_text(paragraph):
+    """
+    段落（w:p）のテキストを返す（python-docxのParagraph.textと同じく、直下のランとハイパーリンク内のランを連結）
+    """
+    parts = []
+    for child in paragraph:
+        if child.tag == W_R:
+            parts.append(run_text(child))
+        elif child.tag == W_HYPERLINK:
+            parts.extend(run_text(run) for run in child.iter(W_R))
+    return ''.join(parts)
+
+class DocxPackage:
+    """
+    .docxファイル（ZIPパッケージ）を一度だけ開き、テキスト抽出と段落・表の構造的な抽出の両方に使う
+
+    ZIPの中央ディレクトリは開いたときに一度だけ読み込み、本文のXMLは構造的な抽出で初めて必要になったときに
+    一度だけ解析して保持する。高速なテキスト抽出に失敗して構造的な抽出に切り替える場合も、ファイルを開き直さない
+    """
+
+    def __init__(self, docx_path):
+        """
+        Args:
+            docx_path (str): .docxファイルのパス（またはファイルオブジェクト）
+        """
+        self.path = docx_path
+        self.zipf = zipfile.ZipFile(docx_path)
+        self.names = self.zipf.namelist()
+        self._document = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+
+    def close(self):
+        """パッケージを閉じる"""
+        self.zipf.close()
+        self._document = None
+
+    def text_parts(self):
+        """docx2txtと同じ順序で、テキストを読み込むパートの名前を返す"""
+        parts = [name for name in self.names if HEADER_XML_PATTERN.match(name)]
+        parts.append(DOCUMENT_XML)
+        parts.extend(name for name in self.names if FOOTER_XML_PATTERN.match(name))
+        return parts
+
+    def section_parts(self, sections):
+        """
+        指定したセクションのパートの名前を、セクションの順（同じセクション内は番号順）で返す
+        パッケージに存在しないパートは含まない
+
+        Args:
+            sections (tuple): SECTIONSに含まれるセクション名
+
+        Returns:
+            list: パートの名前のリスト
+        """
+        names = set(self.names)
+        parts = []
+        for section in SECTIONS:
+            part = SECTION_PARTS.get(section)
+            if part is None or section not in sections:
+                continue
+            if isinstance(part, str):
+                if part in names:
+                    parts.append(part)
+            else:
+                parts.extend(sorted((name for name in self.names if part.match(name)),
+                                    key=lambda name: (_part_number(name), name)))
+        return parts
+
+    def iter_text(self, sections=None):
+        """
+        ヘッダー・本文・フッターなどのテキストを断片ごとに出力する
+
+        セクションを指定しない場合はdocx2txtと同じパートを同じ順序・同じ規則で出力する
+        セクションを指定した場合は、各パートをSECTIONSの順に一度ずつ読み込む。テキストボックスは
+        互換用の複製（mc:Fallback）を除いて一度だけ出力し、'textboxes'を指定しない場合は出力しない
+
+        Args:
+            sections (tuple, optional): 出力するセクション（parse_sectionsの結果）
+
+        Yields:
+            str: テキストの断片（前後の空白は除去していない）
+        """
+        if sections is None:
+            parts = self.text_parts()
+            skip_tags = ()
+        else:
+            parts = self.section_parts(sections)
+            skip_tags = (MC_FALLBACK,) if 'textboxes' in sections else (MC_FALLBACK, W_TXBX_CONTENT)
+        for name in parts:
+            with self.zipf.open(name) as source:
+                yield from iter_xml_text(source, skip_tags)
+
+    def document(self):
+        """本文（word/document.xml）を解析したルート要素を返す（解析は一度だけ行う）"""
+        if self._document is None:
+            with self.zipf.open(DOCUMENT_XML) as source:
+                self._document = ET.parse(source).getroot()
+        return self._document
+
+    def _body(self):
+        body = self.document().find(W_BODY)
+        if body is None:
+            raise Exception("本文（w:body）が見つかりません")
+        return body
+
+    def paragraphs(self):
+        """
+        本文直下の段落のテキストを返す（表の中の段落は含まない。python-docxのDocument.paragraphsに相当）
+        """
+        return [paragraph_text(p) for p in self._body().findall(W_P)]
+
+    def tables(self):
+        """
+        本文直下の表を返す（python-docxのDocument.tablesに相当）
+
+        横方向に結合されたセルは結合した列数だけ、縦方向に結合されたセルは結合元のセルを繰り返す
+
+        Returns:
+            list: 表ごとの、行ごとの、セルごとの段落テキストのリスト
+        """
+        tables = []
+        for tbl in self._body().findall(W_TBL):
+            rows = []
+            above = {}
+            for tr in tbl.findall(W_TR):
+                cells = []
+                current = {}
+                for tc in tr.findall(W_TC):
+                    tc_pr = tc.find(W_TC_PR)
+                    span = 1
+                    merge = None
+                    if tc_pr is not None:
+                        grid_span = tc_pr.find(W_GRID_SPAN)
+                        if grid_span is not None:
+                            span = max(int(grid_span.get(W_VAL, '1')), 1)
+                        v_merge = tc_pr.find(W_V_MERGE)
+                        if v_merge is not None:
+                            merge = v_merge.get(W_VAL, 'continue')
+                    column = len(cells)
+                    if merge == 'continue' and column in above:
+                        # 縦方向の結合の続きは、上のセルの内容を使う
+                        cell = above[column]
+                    else:
+                        cell = [paragraph_text(p) for p in tc.findall(W_P)]
+                    for offset in range(span):
+                        current[column + offset] = cell
+                        cells.append(cell)
+                rows.append(cells)
+                above = current
+            tables.append(rows)
+        return tables
+
+    def all_paragraphs(self):
+        """
+        本文直下の段落のテキストに続けて、表の各セル内の段落のテキストを返す
+        """
+        paragraphs = self.paragraphs()
+        for table in self.tables():
+            for row in table:
+                for cell in row:
+                    paragraphs.extend(cell)
+        return paragraphs
+
+    def structured_lines(self):
+        """
+        空でない段落と、表の各行（空でないセルをタブ区切り）を行のリストで返す
+        （従来python-docxで抽出していた形式）
+        """
+        lines = [text for text in self.paragraphs() if text.strip()]
+        for table in self.tables():
+            for row in table:
+                row_text = []
+                for cell in row:
+                    cell_text = '\n'.join(cell)
+                    if cell_text.strip():
+                        row_text.append(cell_text)
+                if row_text:
+                    lines.append('\t'.join(row_text))
+        return lines
+
+def iter_docx_text(docx_path, sections=None):
+    """
+    .docxファイルのヘッダー・本文・フッターなどのテキストを断片ごとに出力する
+
+    Args:
+        docx_path (str): .docxファイルのパス
+        sections (tuple, optional): 出力するセクション（指定がない場合はdocx2txtと同じ）
+
+    Yields:
+        str: テキストの断片（前後の空白は除去していない）
+    """
+    with DocxPackage(docx_path) as package:
+        yield from package.iter_text(sections)
+
+def _iter_fragments(source, sections=None):
+    """パスまたは開いているDocxPackageからテキストの断片を出力する"""
+    if isinstance(source, DocxPackage):
+        return source.iter_text(sections)
+    return iter_docx_text(source, sections)
+
+def extract_docx_text(source, sections=None):
+    """
+    .docxファイルからテキストを抽出する（セクションを指定しない場合はdocx2txt.processと同じ結果）
+
+    Args:
+        source (str or DocxPackage): .docxファイルのパス、または開いているパッケージ
+        sections (tuple, optional): 出力するセクション
+
+    Returns:
+        str: 抽出したテキスト
+    """
+    return ''.join(_iter_fragments(source, sections)).strip()
+
+def write_docx_text(source, out_file, sections=None):
+    """
+    .docxファイルのテキストを、全体をメモリに保持せずにファイルへ書き込む
+    extract_docx_textと同じく、前後の空白は出力しない
+
+    Args:
+        source (str or DocxPackage): .docxファイルのパス、または開いているパッケージ
+        out_file: 書き込み先のテキストファイルオブジェクト
+        sections (tuple, optional): 出力するセクション
+
+    Returns:
+        int: 書き込んだ文字数
+    """
+    written = 0
+    pending = []
+    for fragment in _iter_fragments(source, sections):
+        if not written:
+            # 先頭の空白は出力しない
+            fragment = fragment.lstrip()
+            if not fragment:
+                continue
+        body = fragment.rstrip()
+        if not body:
+            # 空白だけの断片は、後ろに文字が続く場合にだけ出力する
+            pending.append(fragment)
+            continue
+        if pending:
+            out_file.write(''.join(pending))
+            written += sum(len(p) for p in pending)
+            pending = []
+        out_file.write(body)
+        written += len(body)
+        if len(body) < len(fragment):
+            pending.append(fragment[len(body):])
+    return written
+
+def main():
+    if len(sys.argv) < 2:
+        print("使用方法: python docx_stream.py <docxファイル> [出力ファイル] [--sections=SECTIONS]")
+        print(f"  --sections=SECTIONS: 出力するセクションをカンマ区切りで指定する（{', '.join(SECTIONS)}, all）")
+        return
+
+    docx_path = sys.argv[1]
+    output_path = None
+    sections = None
+    for arg in sys.argv[2:]:
+        if arg.startswith("--sections="):
+            try:
+                sections = parse_sections(arg.split("=", 1)[1])
+            except Exception as e:
+                print(f"エラー: {str(e)}")
+                return
+        else:
+            output_path = arg
+
+    if not os.path.exists(docx_path):
+        print(f"エラー: 指定されたファイル '{docx_path}' が存在しません。")
+        return
+
+    if output_path:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            write_docx_text(docx_path, f, sections)
+        print(f"変換完了: {output_path}")
+    else:
+        print(extract_docx_text(docx_path, sections))
+
+if __name__ == "__main__":
+    main()
@@ -3,8 +3,29 @@
 
 import os
 import sys
-import re
 from pathlib import Path
+from line_classifier import keep_utf8_fix_line
+
+def remove_garbled_lines(content):
+    """
+    文字化けを含む行や意味のない行を除いたテキストを返す（ファイルの読み書きは行わない）
+    
+    Args:
+        content (str): 処理するテキスト
+    
+    Returns:
+        str: 意味のある行だけを改行で連結したテキスト
+    """
+    # 意味のある行のみを抽出
+    lines = content.splitlines()
+    cleaned_lines = []
+
+    for line in lines:
+        # 日本語文字か意味のある記号を含み、文字化けを含まない行のみを残す
+        if keep_utf8_fix_line(line):
+            cleaned_lines.append(line)
+
+    return '\n'.join(cleaned_lines)
 
 def fix_utf8_and_remove_garbled(txt_path, output_path=None):
     """
@@ -33,26 +54,8 @@ def fix_utf8_and_remove_garbled(txt_path, output_path=None):
             f.write(content)
         print(f"バックアップを作成しました: {backup_path}")
         
-        # 意味のある行のみを抽出
-        lines = content.splitlines()
-        cleaned_lines = []
-        
-        for line in lines:
-            # 日本語文字が含まれているか、または意味のある記号や英数字のみの行か確認
-            jp_chars = re.findall(r'[ぁ-んァ-ヶ一-龠々〆〜]', line)
-            meaningful_symbols = re.findall(r'[・。、：；「」『』（）［］【】◆■□◇※！？]', line)
-            
-            # 文字化けと思われる記号の連続を含む行を除外
-            has_garbled = bool(re.search(r'[龠〆〜耐脀砐源氈鰈璀丄溑蛝鯄瀠鮤]+', line))
-            
-            # 有意義な行であるかどうかを判断
-            if (jp_chars or meaningful_symbols) and len(line.strip()) > 2:
-                # 文字化けを含む行は除外
-                if not has_garbled:
-                    cleaned_lines.append(line)
-        
         # 整形された内容をUTF-8で書き込み
-        cleaned_content = '\n'.join(cleaned_lines)
+        cleaned_content = remove_garbled_lines(content)
         with open(output_path, 'w', encoding='utf-8') as f:
             f.write(cleaned_content)
         
@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+import sys
+import threading
+import time
+
+# キャッシュの既定の保存先と上限サイズ
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.word_to_text_cache.sqlite3')
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+class ExtractionCache:
+    """
+    入力ファイルのSHA-256をキーとして、最終的な抽出テキストを保存するキャッシュ
+    ファイル名が異なっても内容が同じ文書は、変換処理を行わずにキャッシュから結果を取得できる
+
+    同じ文書でも変換オプションによって結果が変わるため、キーにはオプションを表す文字列（variant）も含める
+    保存されたテキストの合計サイズが上限を超えた場合は、最後に使われた日時が古いものから削除する
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Args:
+            path (str): キャッシュファイル（SQLite）のパス
+            max_bytes (int): 保存するテキストの合計サイズの上限（バイト）
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        # GUIのワーカースレッドからも使えるように、接続はロックで保護して共有する
+        self.lock = threading.Lock()
+        # sqlite3はキャッシュを使う場合だけ読み込む（起動時間の短縮）
+        import sqlite3
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS entries (
+                digest TEXT NOT NULL,
+                variant TEXT NOT NULL,
+                text TEXT NOT NULL,
+                method TEXT,
+                jp_ratio REAL,
+                encoding TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (digest, variant)
+            )"""
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)")
+        self.conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+
+    def close(self):
+        """キャッシュを閉じる"""
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+    def get(self, digest, variant):
+        """
+        キャッシュされた抽出結果を取得する
+
+        Args:
+            digest (str): 入力ファイルのSHA-256
+            variant (str): 変換オプションを表す文字列
+
+        Returns:
+            dict: テキスト（'text'）、変換方法（'method'）、日本語比率（'jp_ratio'）、
+                  出力エンコーディング（'encoding'）。キャッシュにない場合はNone
+        """
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT text, method, jp_ratio, encoding FROM entries WHERE digest = ? AND variant = ?",
+                (digest, variant)
+            ).fetchone()
+            if row is None:
+                return None
+            self.conn.execute(
+                "UPDATE entries SET last_used = ? WHERE digest = ? AND variant = ?",
+                (time.time(), digest, variant)
+            )
+            self.conn.commit()
+
+        text, method, jp_ratio, encoding = row
+        return {'text': text, 'method': method, 'jp_ratio': jp_ratio, 'encoding': encoding}
+
+    def put(self, digest, variant, text, method=None, jp_ratio=None, encoding='utf-8'):
+        """
+        抽出結果をキャッシュに保存し、上限を超えた分を古いものから削除する
+
+        Args:
+            digest (str): 入力ファイルのSHA-256
+            variant (str): 変換オプションを表す文字列
+            text (str): 最終的な抽出テキスト
+            method (str, optional): 採用された変換方法
+            jp_ratio (float, optional): 日本語文字の比率
+            encoding (str): 出力ファイルのエンコーディング
+        """
+        size = len(text.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (digest, variant, text, method, jp_ratio, encoding, size, time.time())
+            )
+            self._evict()
+            self.conn.commit()
+
+    def _evict(self):
+        """合計サイズが上限以下になるまで、最後に使われた日時が古いエントリを削除する"""
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self.conn.execute("SELECT digest, variant, size FROM entries ORDER BY last_used").fetchall()
+        for digest, variant, size in rows:
+            if total <= self.max_bytes:
+                break
+            self.conn.execute("DELETE FROM entries WHERE digest = ? AND variant = ?", (digest, variant))
+            total -= size
+
+    def stats(self):
+        """
+        キャッシュの件数と合計サイズを返す
+        """
+        with self.lock:
+            count, total = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return count, total
+
+    def clear(self):
+        """
+        キャッシュをすべて削除する
+        """
+        with self.lock:
+            self.conn.execute("DELETE FROM entries")
+            self.conn.commit()
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] in ("-h", "--help"):
+        print("使用方法: python extraction_cache.py [キャッシュファイル] [--clear]")
+        return
+
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    path = args[0] if args else DEFAULT_CACHE_PATH
+    if not os.path.exists(path):
+        print(f"エラー: キャッシュファイル '{path}' が存在しません。")
+        return
+
+    with ExtractionCache(path) as cache:
+        if "--clear" in sys.argv:
+            cache.clear()
+            print(f"キャッシュを削除しました: {path}")
+            return
+        count, total = cache.stats()
+        print(f"キャッシュ: {path}")
+        print(f"  件数: {count}, 合計サイズ: {total / (1024 * 1024):.1f} MB")
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,7 @@
 #!/usr/bin/env python
 # coding: utf-8
 
-import re
-import os
+from line_classifier import keep_final_cleanup_line
 
 def clean_file(input_path, output_path):
     print(f"ファイルを処理中: {input_path}")
@@ -25,16 +24,8 @@ def clean_file(input_path, output_path):
             cleaned_lines.append('')  # 空行を保存
             continue
         
-        # 文字化けの可能性が高い行は除外
-        if re.search(r'[龠〆〜耐脀砐源氈鰈璀丄溑蛝鯄瀠鮤]{3,}', line) or \
-           re.search(r'[^ぁ-んァ-ン一-龥a-zA-Z0-9 \t.,;:!?()（）「」『』［］【】・。、：；！？… 　]+', line):
-            continue  # 文字化けのある行はスキップ
-        
-        # 日本語が含まれるか、意味のある英数字や記号が含まれる行のみ保持
-        has_japanese = bool(re.search(r'[ぁ-んァ-ヶ一-龠々〆〜]', line))
-        has_meaningful_text = bool(re.search(r'[a-zA-Z0-9]{2,}|[・。、：；「」『』（）［］【】◆■□◇※！？]', line))
-        
-        if (has_japanese or has_meaningful_text) and len(line) > 1:
+        # 文字化けの可能性が高い行は除外し、日本語か意味のある英数字や記号が含まれる行のみ保持
+        if keep_final_cleanup_line(line):
             # 残すべき行
             current_paragraph.append(line)
     
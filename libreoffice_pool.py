@@ -0,0 +1,530 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+import sys
+import hmac
+import json
+import time
+import queue
+import secrets
+import shutil
+import socket
+import tempfile
+import threading
+import subprocess
+import atexit
+import signal
+from pathlib import Path
+from concurrent.futures import Future
+from optional_backends import import_backend, is_backend_available
+
+# 常駐させるLibreOfficeのプロセス数と、変換を待機できる数（超えると投入側が空くまで待つ）
+DEFAULT_POOL_SIZE = 1
+DEFAULT_QUEUE_SIZE = 8
+
+# LibreOfficeの起動を待つ時間、1ファイルの変換を待つ時間（超えた場合は応答なしとして再起動する）
+START_TIMEOUT = 60.0
+CONVERT_TIMEOUT = 120.0
+
+# この秒数以上使われていないワーカーは、次の変換の前に応答を確認する
+HEALTH_CHECK_INTERVAL = 30.0
+PING_TIMEOUT = 5.0
+
+# .docxとして保存するときのLibreOfficeのフィルタ名
+DOCX_FILTER = "MS Word 2007 XML"
+
+# ワーカーに要求の認証用のトークンを渡す環境変数
+# （コマンドライン引数は他のユーザーからも見えるため使わない。環境変数は同じユーザーからしか読めない）
+TOKEN_ENV = 'LIBREOFFICE_POOL_TOKEN'
+
+def find_soffice():
+    """
+    LibreOfficeの実行ファイル（soffice）のパスを探す（見つからない場合はNone）
+    """
+    # 環境変数で指定されたディレクトリ
+    program_dir = os.environ.get('LIBREOFFICE_PROGRAM_PATH')
+    if program_dir:
+        for name in ('soffice.exe', 'soffice'):
+            path = os.path.join(program_dir, name)
+            if os.path.exists(path):
+                return path
+
+    for name in ('soffice', 'libreoffice'):
+        path = shutil.which(name)
+        if path:
+            return path
+
+    # 一般的なインストール場所（Windows / macOS）
+    common_paths = [
+        'C:\\Program Files\\LibreOffice\\program\\soffice.exe',
+        'C:\\Program Files (x86)\\LibreOffice\\program\\soffice.exe',
+        '/Applications/LibreOffice.app/Contents/MacOS/soffice',
+    ]
+    for path in common_paths:
+        if os.path.exists(path):
+            return path
+    return None
+
+def pool_unavailable_reason():
+    """
+    標準のワーカー（LibreOfficeをUNOで操作するプロセス）が利用できない場合はその理由を返す
+    """
+    if find_soffice() is None:
+        return "LibreOfficeがインストールされていません"
+    if not is_backend_available('uno'):
+        return "UNOのPythonモジュール（uno）を読み込めません"
+    return None
+
+def _free_port():
+    """ローカルで空いているTCPポートの番号を返す"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def _kill_tree(process):
+    """
+    ワーカーを、ワーカーが起動したLibreOfficeのプロセスと一緒に強制終了する
+    """
+    if sys.platform == 'win32':
+        subprocess.run(['taskkill', '/F', '/T', '/PID', str(process.pid)],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    else:
+        # ワーカーは専用のプロセスグループで起動している
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except OSError:
+            pass
+    process.kill()
+
+def default_worker_command(port, profile_dir):
+    """
+    標準のワーカーの起動コマンド（このスクリプトを --serve で起動し、LibreOfficeとUNOで接続させる）
+    """
+    return [sys.executable, os.path.abspath(__file__), '--serve', str(port), profile_dir]
+
+class LibreOfficeWorker:
+    """
+    常駐するLibreOfficeのワーカープロセス一つ
+
+    ワーカーはローカルのTCPソケットで待ち受け、1行に1つのJSONで要求を受け取り、1行のJSONで応答する
+      {"command": "ping"}                                  → {"ok": true}
+      {"command": "convert", "source": ..., "target": ...} → {"ok": true, "path": target} / {"ok": false, "error": ...}
+      {"command": "quit"}                                  → {"ok": true}（応答後に終了する）
+    ポートには同じコンピュータの他のユーザーも接続できるため、すべての要求に起動時に環境変数TOKEN_ENVで渡した
+    ワーカーごとのトークン（"token"）を付け、ワーカーはトークンが一致しない要求を拒否して接続を閉じる
+    同じ手順で応答するプロセスであれば、LibreOfficeの代わりに使うことができる（commandで起動方法を指定する）
+    """
+
+    def __init__(self, command=None, start_timeout=START_TIMEOUT):
+        """
+        Args:
+            command (callable, optional): (ポート番号, プロファイルのディレクトリ)を受け取り、起動するコマンドのリストを返す関数
+            start_timeout (float): 起動して応答するまで待つ秒数
+        """
+        self.command = command or default_worker_command
+        self.start_timeout = start_timeout
+        self.process = None
+        self.sock = None
+        self.reader = None
+        self.port = None
+        self.token = None
+        self.profile_dir = None
+        self.last_used = 0.0
+        self.conversions = 0
+
+    def start(self):
+        """
+        ワーカーを起動し、要求を受け付けるまで待つ
+
+        Raises:
+            Exception: 起動に失敗した場合、または時間内に応答しなかった場合
+        """
+        # LibreOfficeは同じプロファイルを複数のプロセスで使えないため、ワーカーごとに専用のディレクトリを作る
+        self.profile_dir = tempfile.mkdtemp(prefix='lo_profile_')
+        self.port = _free_port()
+        # 要求の認証用のトークンは起動するたびに作り直す
+        self.token = secrets.token_hex(32)
+        # 応答しなくなった場合にLibreOfficeごと終了できるよう、ワーカーは専用のプロセスグループで起動する
+        if sys.platform == 'win32':
+            group = {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+        else:
+            group = {'start_new_session': True}
+        self.process = subprocess.Popen(self.command(self.port, self.profile_dir),
+                                        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                                        env=dict(os.environ, **{TOKEN_ENV: self.token}), **group)
+
+        deadline = time.monotonic() + self.start_timeout
+        while True:
+            if self.process.poll() is not None:
+                code = self.process.returncode
+                self.stop()
+                raise Exception(f"LibreOfficeのワーカーが起動直後に終了しました（終了コード: {code}）")
+            try:
+                self.sock = socket.create_connection(('127.0.0.1', self.port), timeout=1.0)
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    self.stop()
+                    raise Exception(f"LibreOfficeのワーカーが{self.start_timeout}秒以内に起動しませんでした")
+                time.sleep(0.2)
+
+        self.reader = self.sock.makefile('rb')
+        self.last_used = time.monotonic()
+        self.conversions = 0
+
+    def is_running(self):
+        """ワーカーのプロセスが動作中で、接続済みであるか"""
+        return self.process is not None and self.process.poll() is None and self.sock is not None
+
+    def request(self, message, timeout):
+        """
+        要求を送り、応答を待つ
+
+        Raises:
+            socket.timeout: timeout秒以内に応答がない場合（ワーカーは応答なしとみなして再起動する）
+            Exception: 接続が切れた場合、またはワーカーがエラーを返した場合
+        """
+        self.sock.settimeout(timeout)
+        message = dict(message, token=self.token)
+        self.sock.sendall(json.dumps(message, ensure_ascii=False).encode('utf-8') + b'\n')
+        line = self.reader.readline()
+        if not line:
+            raise Exception("LibreOfficeのワーカーとの接続が切れました")
+        response = json.loads(line)
+        if not response.get('ok'):
+            raise Exception(response.get('error') or "LibreOfficeのワーカーがエラーを返しました")
+        return response
+
+    def ping(self, timeout=PING_TIMEOUT):
+        """ワーカーが応答するか確認する"""
+        if not self.is_running():
+            return False
+        try:
+            self.request({'command': 'ping'}, timeout)
+            return True
+        except Exception:
+            return False
+
+    def convert(self, source, target, timeout=CONVERT_TIMEOUT):
+        """
+        sourceの文書を.docxに変換してtargetに保存する
+
+        Returns:
+            str: 保存したファイルのパス
+        """
+        try:
+            response = self.request({'command': 'convert',
+                                     'source': os.path.abspath(source),
+                                     'target': os.path.abspath(target)}, timeout)
+        finally:
+            self.last_used = time.monotonic()
+        self.conversions += 1
+        return response.get('path', target)
+
+    def stop(self, kill=False):
+        """
+        ワーカーを終了し、プロファイルのディレクトリを削除する（応答しない場合は強制終了する）
+
+        Args:
+            kill (bool): Trueの場合は終了を要求せずに強制終了する（応答しなくなったワーカー）
+        """
+        if self.process is not None and kill:
+            _kill_tree(self.process)
+        if self.sock is not None:
+            if self.process is not None and self.process.poll() is None:
+                try:
+                    self.request({'command': 'quit'}, PING_TIMEOUT)
+                except Exception:
+                    pass
+            try:
+                self.reader.close()
+                self.sock.close()
+            except Exception:
+                pass
+            self.sock = None
+            self.reader = None
+
+        if self.process is not None:
+            try:
+                self.process.wait(timeout=PING_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                _kill_tree(self.process)
+                self.process.wait()
+            self.process = None
+
+        if self.profile_dir is not None:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+            self.profile_dir = None
+
+    def restart(self):
+        self.stop()
+        self.start()
+
+class LibreOfficePool:
+    """
+    常駐するLibreOfficeのワーカーに、.docから.docxへの変換を振り分ける
+
+    起動は最初の一回だけで、以降の変換は文書の処理時間だけで済む
+    応答しなくなったワーカーは再起動し、しばらく使われていないワーカーは変換の前に応答を確認する
+    """
+
+    def __init__(self, size=DEFAULT_POOL_SIZE, queue_size=DEFAULT_QUEUE_SIZE, command=None,
+                 start_timeout=START_TIMEOUT, convert_timeout=CONVERT_TIMEOUT):
+        """
+        Args:
+            size (int): ワーカーの数
+            queue_size (int): 変換を待機できる数（超えるとsubmitが空くまで待つ）
+            command (callable, optional): ワーカーの起動コマンド（LibreOfficeWorkerを参照）
+            start_timeout (float): ワーカーの起動を待つ秒数
+            convert_timeout (float): 1ファイルの変換を待つ秒数
+        """
+        self.convert_timeout = convert_timeout
+        self.jobs = queue.Queue(maxsize=max(queue_size, 1))
+        self.workers = [LibreOfficeWorker(command, start_timeout) for _ in range(max(size, 1))]
+        self.closed = False
+        # ワーカーごとのスレッドが待機中の変換を取り出して処理する（起動もスレッドで並行して行う）
+        self.threads = [threading.Thread(target=self._serve, args=(worker,), daemon=True) for worker in self.workers]
+        for thread in self.threads:
+            thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def submit(self, source, target, timeout=None):
+        """
+        変換を待機列に追加する（待機列が満杯の場合は空くまで待つ）
+
+        Args:
+            source (str): 変換する文書のパス
+            target (str): 保存する.docxのパス
+            timeout (float, optional): 待機列が空くまで待つ秒数（Noneは無制限）
+
+        Returns:
+            Future: 変換が終わると保存したパスを返す
+
+        Raises:
+            Exception: プールが閉じられている場合、またはtimeout秒以内に待機列が空かなかった場合
+        """
+        if self.closed:
+            raise Exception("LibreOfficeのワーカープールは終了しています")
+        future = Future()
+        try:
+            self.jobs.put((source, target, future), timeout=timeout)
+        except queue.Full:
+            raise Exception(f"LibreOfficeの変換待ちが上限（{self.jobs.maxsize}件）に達しています")
+        return future
+
+    def convert(self, source, target):
+        """
+        sourceを.docxに変換してtargetに保存し、そのパスを返す（変換が終わるまで待つ）
+        """
+        return self.submit(source, target).result()
+
+    def _prepare(self, worker):
+        """変換の前に、停止しているワーカーを起動し、しばらく使われていないワーカーの応答を確認する"""
+        if not worker.is_running():
+            worker.restart()
+        elif time.monotonic() - worker.last_used > HEALTH_CHECK_INTERVAL and not worker.ping():
+            print("LibreOfficeのワーカーが応答しないため再起動します")
+            worker.restart()
+
+    def _serve(self, worker):
+        try:
+            worker.start()
+        except Exception as e:
+            # 起動に失敗した場合は、最初の変換の前に再度起動を試みる
+            print(f"LibreOfficeのワーカーの起動に失敗しました: {str(e)}")
+
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+            source, target, future = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                self._prepare(worker)
+                future.set_result(worker.convert(source, target, self.convert_timeout))
+            except socket.timeout:
+                # 変換中に応答しなくなったワーカーは停止し、次の変換の前に起動し直す
+                print(f"LibreOfficeの変換が{self.convert_timeout}秒以内に終わらないため、ワーカーを再起動します: {source}")
+                worker.stop(kill=True)
+                future.set_exception(Exception(f"LibreOfficeでの変換がタイムアウトしました（{self.convert_timeout}秒）"))
+            except Exception as e:
+                if not worker.is_running():
+                    worker.stop()
+                future.set_exception(e)
+        worker.stop()
+
+    def close(self):
+        """
+        待機中の変換を処理してから、すべてのワーカーを終了する
+        """
+        if self.closed:
+            return
+        self.closed = True
+        for _ in self.threads:
+            self.jobs.put(None)
+        for thread in self.threads:
+            thread.join()
+
+# プロセス内で共有するプール（最初に使われた時点で起動し、終了時に停止する）
+_shared_pool = None
+_shared_pool_size = DEFAULT_POOL_SIZE
+_shared_lock = threading.Lock()
+
+def configure_shared_pool(size):
+    """
+    共有するプールのワーカー数を設定する（起動前に呼び出す）
+    """
+    global _shared_pool_size
+    _shared_pool_size = max(int(size), 1)
+
+def get_shared_pool():
+    """
+    プロセス内で共有するLibreOfficeのワーカープールを返す（初めて呼び出した時点で起動する）
+    """
+    global _shared_pool
+    with _shared_lock:
+        if _shared_pool is None:
+            _shared_pool = LibreOfficePool(_shared_pool_size)
+            atexit.register(_shared_pool.close)
+        return _shared_pool
+
+def serve(port, profile_dir, soffice=None):
+    """
+    ワーカーとして動作する: LibreOfficeを起動してUNOで接続し、portで変換の要求を待ち受ける
+    環境変数TOKEN_ENVのトークンが付いていない要求は拒否し、その接続を閉じる
+
+    Args:
+        port (int): 要求を待ち受けるポート番号
+        profile_dir (str): LibreOfficeのプロファイル（ユーザー設定）のディレクトリ
+        soffice (str, optional): LibreOfficeの実行ファイルのパス
+    """
+    # トークンはLibreOfficeのプロセスに引き継がないよう、読み込んだら環境変数から削除する
+    token = os.environ.pop(TOKEN_ENV, None)
+    if not token:
+        raise Exception(f"要求の認証用のトークン（環境変数{TOKEN_ENV}）が指定されていません")
+    uno = import_backend('uno')
+    soffice = soffice or find_soffice()
+    if soffice is None:
+        raise Exception("LibreOfficeがインストールされていません")
+
+    uno_url = f"socket,host=127.0.0.1,port={_free_port()};urp;StarOffice.ComponentContext"
+    office = subprocess.Popen([soffice, '--headless', '--invisible', '--nologo', '--norestore', '--nodefault',
+                               '--nolockcheck', f'-env:UserInstallation={Path(profile_dir).as_uri()}',
+                               f'--accept={uno_url}'],
+                              stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL)
+
+    def prop(name, value):
+        p = uno.createUnoStruct("com.sun.star.beans.PropertyValue")
+        p.Name = name
+        p.Value = value
+        return p
+
+    server = None
+    desktop = None
+    try:
+        # LibreOfficeがUNOの接続を受け付けるまで待つ
+        local_context = uno.getComponentContext()
+        resolver = local_context.ServiceManager.createInstanceWithContext("com.sun.star.bridge.UnoUrlResolver", local_context)
+        deadline = time.monotonic() + START_TIMEOUT
+        while True:
+            try:
+                context = resolver.resolve(f"uno:{uno_url}")
+                break
+            except Exception:
+                if office.poll() is not None or time.monotonic() > deadline:
+                    raise Exception("LibreOfficeにUNOで接続できませんでした")
+                time.sleep(0.5)
+        desktop = context.ServiceManager.createInstanceWithContext("com.sun.star.frame.Desktop", context)
+
+        server = socket.create_server(('127.0.0.1', port))
+        while True:
+            conn, _ = server.accept()
+            with conn, conn.makefile('rb') as reader:
+                for line in reader:
+                    try:
+                        message = json.loads(line)
+                    except ValueError:
+                        message = {}
+                    if not hmac.compare_digest(str(message.get('token', '')).encode('utf-8'), token.encode('utf-8')):
+                        # トークンが一致しない接続からは、以降の要求も受け付けない
+                        conn.sendall(json.dumps({'ok': False, 'error': "認証に失敗しました"}).encode('utf-8') + b'\n')
+                        break
+                    command = message.get('command')
+                    response = {'ok': True}
+                    if command == 'ping':
+                        if office.poll() is not None:
+                            response = {'ok': False, 'error': "LibreOfficeが終了しています"}
+                    elif command == 'convert':
+                        try:
+                            document = desktop.loadComponentFromURL(Path(message['source']).as_uri(), "_blank", 0,
+                                                                    (prop("Hidden", True), prop("ReadOnly", True)))
+                            if document is None:
+                                raise Exception(f"文書を開けませんでした: {message['source']}")
+                            try:
+                                document.storeToURL(Path(message['target']).as_uri(),
+                                                    (prop("FilterName", DOCX_FILTER), prop("Overwrite", True)))
+                            finally:
+                                document.close(True)
+                            response['path'] = message['target']
+                        except Exception as e:
+                            response = {'ok': False, 'error': f"LibreOfficeでの変換に失敗: {str(e)}"}
+                    elif command != 'quit':
+                        response = {'ok': False, 'error': f"不明な要求です: {command}"}
+                    conn.sendall(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+                    if command == 'quit':
+                        return
+    finally:
+        if server is not None:
+            server.close()
+        if desktop is not None:
+            try:
+                desktop.terminate()
+            except Exception:
+                pass
+        try:
+            office.wait(timeout=PING_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            office.kill()
+
+def main():
+    if len(sys.argv) >= 4 and sys.argv[1] == '--serve':
+        serve(int(sys.argv[2]), sys.argv[3])
+        return
+
+    if len(sys.argv) < 2:
+        print("使用方法: python libreoffice_pool.py <.docファイル> [<.docファイル> ...] [--workers=N]")
+        print("  常駐させたLibreOfficeで各ファイルを同じ場所の.docxに変換し、ファイルごとの処理時間を表示する")
+        return
+
+    size = DEFAULT_POOL_SIZE
+    files = []
+    for arg in sys.argv[1:]:
+        if arg.startswith("--workers="):
+            size = max(int(arg.split("=")[1]), 1)
+        else:
+            files.append(arg)
+
+    reason = pool_unavailable_reason()
+    if reason is not None:
+        print(f"エラー: {reason}")
+        return
+
+    with LibreOfficePool(size) as pool:
+        start = time.perf_counter()
+        futures = [(path, time.perf_counter(), pool.submit(path, os.path.splitext(path)[0] + '.docx')) for path in files]
+        for path, submitted, future in futures:
+            try:
+                print(f"変換完了: {future.result()} ({time.perf_counter() - submitted:.2f}秒)")
+            except Exception as e:
+                print(f"変換失敗: {path}: {str(e)}")
+        print(f"合計: {len(files)}ファイル ({time.perf_counter() - start:.2f}秒)")
+
+if __name__ == "__main__":
+    main()
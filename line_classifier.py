@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+import sys
+import re
+import time
+
+# 各クリーニングスクリプトで使用している文字クラス
+GARBLED_CHARS = '龠〆〜耐脀砐源氈鰈璀丄溑蛝鯄瀠鮤'                  # 文字化けに特徴的な文字
+JAPANESE_CHARS = 'ぁ-んァ-ヶ一-龠々〆〜'                          # 日本語文字
+MEANINGFUL_SYMBOLS = '・。、：；「」『』（）［］【】◆■□◇※！？'      # 意味のある記号
+MARKUP_SYMBOLS = r'<>/\\{}[\]|@#$%^&*=+`~'                         # XMLや特殊記号
+ALLOWED_CHARS = 'ぁ-んァ-ン一-龥a-zA-Z0-9 \t.,;:!?()（）「」『』［］【】・。、：；！？…　'  # 文字化けでない文字
+
+# パターンは読み込み時に一度だけコンパイルし、同じ行に対する複数の検査は一つのパターンにまとめる
+# 文字化けの判定（super_cleanup）: 特徴的な文字が2文字以上、記号が4文字以上、許可されない文字が4文字以上連続
+GARBLED_PATTERN = re.compile(f'[{GARBLED_CHARS}]{{2,}}|[{MARKUP_SYMBOLS}]{{4,}}|[^{ALLOWED_CHARS}]{{4,}}')
+# 文字化けの判定（final_cleanup）: 特徴的な文字が3文字以上連続、または許可されない文字を含む
+STRICT_GARBLED_PATTERN = re.compile(f'[^{ALLOWED_CHARS}]|[{GARBLED_CHARS}]{{3,}}')
+# 特徴的な文字が2文字以上連続（fix_txt）
+GARBLED_RUN_PATTERN = re.compile(f'[{GARBLED_CHARS}]{{2,}}')
+# 特徴的な文字を含む（enhanced_utf8_fix）
+GARBLED_CHAR_PATTERN = re.compile(f'[{GARBLED_CHARS}]')
+# 日本語文字を含む
+JAPANESE_PATTERN = re.compile(f'[{JAPANESE_CHARS}]')
+# 日本語文字または意味のある記号を含む
+JAPANESE_OR_SYMBOL_PATTERN = re.compile(f'[{JAPANESE_CHARS}{MEANINGFUL_SYMBOLS}]')
+# 英数字が2文字以上連続するか、意味のある記号を含む
+MEANINGFUL_TEXT_PATTERN = re.compile(f'[a-zA-Z0-9]{{2,}}|[{MEANINGFUL_SYMBOLS}]')
+# 日本語文字、英数字の2文字以上の連続、意味のある記号のいずれかを含む
+CONTENT_PATTERN = re.compile(f'[{JAPANESE_CHARS}{MEANINGFUL_SYMBOLS}]|[a-zA-Z0-9]{{2,}}')
+# 日本語文字または英数字の3文字以上の連続を含む（cleanup_text）
+TEXT_CONTENT_PATTERN = re.compile(f'[{JAPANESE_CHARS}]|[a-zA-Z0-9]{{3,}}')
+
+def is_garbled(text):
+    """
+    文字化けと思われる文字や記号の連続を含むか判定する（super_cleanupの基準）
+    """
+    return GARBLED_PATTERN.search(text) is not None
+
+def has_japanese_content(text):
+    """
+    日本語文字を含むか、4文字以上で意味のある英数字や記号を含むか判定する（super_cleanupの基準）
+    """
+    if JAPANESE_PATTERN.search(text):
+        return True
+    return len(text) > 3 and MEANINGFUL_TEXT_PATTERN.search(text) is not None
+
+def keep_fix_txt_line(line):
+    """
+    fix_txt.fix_text_fileで残す行か判定する
+    """
+    if len(line.strip()) <= 2 or GARBLED_RUN_PATTERN.search(line):
+        return False
+    return JAPANESE_OR_SYMBOL_PATTERN.search(line) is not None
+
+def keep_final_cleanup_line(line):
+    """
+    final_cleanup.clean_fileで残す行か判定する（前後の空白を除いた空でない行を渡す）
+    """
+    if len(line) <= 1 or STRICT_GARBLED_PATTERN.search(line):
+        return False
+    return CONTENT_PATTERN.search(line) is not None
+
+def keep_utf8_fix_line(line):
+    """
+    enhanced_utf8_fix.remove_garbled_linesで残す行か判定する
+    """
+    if len(line.strip()) <= 2 or GARBLED_CHAR_PATTERN.search(line):
+        return False
+    return JAPANESE_OR_SYMBOL_PATTERN.search(line) is not None
+
+def has_text_content(line):
+    """
+    日本語文字または3文字以上の英数字を含むか判定する（cleanup_textの基準）
+    """
+    return TEXT_CONTENT_PATTERN.search(line) is not None
+
+# 名前ごとの行の判定（Trueの行を残す）
+LINE_FILTERS = {
+    'super_clean': lambda line: not is_garbled(line) and has_japanese_content(line),
+    'fix_txt': keep_fix_txt_line,
+    'final_cleanup': keep_final_cleanup_line,
+    'fix_utf8': keep_utf8_fix_line,
+}
+
+def main():
+    if len(sys.argv) < 2:
+        print("使用方法: python line_classifier.py <テキストファイル>")
+        print("  各クリーニングスクリプトの基準で残る行数と判定にかかった時間を表示する")
+        return
+
+    file_path = sys.argv[1]
+    if not os.path.exists(file_path):
+        print(f"エラー: 指定されたファイル '{file_path}' が存在しません。")
+        return
+
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        lines = f.read().splitlines()
+
+    print(f"ファイル: {file_path} (行数: {len(lines)})")
+    for name, keep in LINE_FILTERS.items():
+        start = time.perf_counter()
+        kept = sum(1 for line in lines if keep(line.strip() if name in ('super_clean', 'final_cleanup') else line))
+        elapsed = time.perf_counter() - start
+        print(f"  {name}: {kept}行を保持 ({elapsed:.3f}秒)")
+
+if __name__ == "__main__":
+    main()
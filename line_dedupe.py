@@ -0,0 +1,274 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+import sys
+import math
+import hashlib
+import tempfile
+
+# 重複チェックの方式
+#   exact: 行そのものを保持する（誤判定なし、メモリは行の合計の長さに比例）
+#   digest64 / digest128: 行の64/128ビットのハッシュだけを保持する（メモリは行数に比例）
+#   bloom: ブルームフィルタ（メモリは容量と誤判定率で固定）
+#   disk: 128ビットのハッシュをSQLiteファイルに保存する（メモリに収まらない行数でも重複を除去できる）
+#         データベースのパスを指定しない場合は実行ごとの一時ファイルを使い、終了時に削除する
+#         パスを指定した場合だけ記録を残し、複数回の実行にまたがって重複を除去する
+DEDUPE_MODES = ('exact', 'digest64', 'digest128', 'bloom', 'disk')
+
+# ブルームフィルタのデフォルトの容量（行数）と誤判定率
+DEFAULT_BLOOM_CAPACITY = 10 * 1000 * 1000
+DEFAULT_BLOOM_ERROR_RATE = 0.001
+
+# ディスクに保存する場合にまとめてコミットする行数
+DISK_COMMIT_INTERVAL = 10000
+
+def line_digest(line, size=16):
+    """
+    行のハッシュ（BLAKE2b、sizeバイト）を返す
+    """
+    return hashlib.blake2b(line.encode('utf-8', errors='surrogatepass'), digest_size=size).digest()
+
+class ExactLineSet:
+    """
+    行そのものを保持して重複を判定する（従来のclean_textと同じ）
+    """
+
+    def __init__(self):
+        self.seen = set()
+
+    def add_new(self, line):
+        """
+        初めて出現した行であれば記録してTrueを返す（既出の行はFalse）
+        """
+        if line in self.seen:
+            return False
+        self.seen.add(line)
+        return True
+
+    def __len__(self):
+        return len(self.seen)
+
+    def false_positive_bound(self):
+        """未出の行を既出と誤判定する確率の上限"""
+        return 0.0
+
+    def close(self):
+        self.seen = set()
+
+class DigestLineSet:
+    """
+    行の固定長のハッシュだけを保持して重複を判定する
+
+    異なる行のハッシュが一致した場合だけ、未出の行を既出と誤判定する
+    n行を記録したときに誤判定が一度でも起きる確率は n(n-1)/2^(bits+1) 以下
+    """
+
+    def __init__(self, bits=64):
+        """
+        Args:
+            bits (int): ハッシュのビット数（64または128）
+        """
+        if bits not in (64, 128):
+            raise Exception(f"ハッシュのビット数は64または128を指定してください: {bits}")
+        self.bits = bits
+        self.size = bits // 8
+        self.seen = set()
+
+    def add_new(self, line):
+        """
+        初めて出現した行であれば記録してTrueを返す（既出の行はFalse）
+        """
+        # 整数にすると同じビット数のbytesより小さく保持できる
+        digest = int.from_bytes(line_digest(line, self.size), 'little')
+        if digest in self.seen:
+            return False
+        self.seen.add(digest)
+        return True
+
+    def __len__(self):
+        return len(self.seen)
+
+    def false_positive_bound(self):
+        """記録した行の間でハッシュの衝突が一度でも起きる確率の上限（誕生日問題の上界）"""
+        n = len(self.seen)
+        return min(1.0, n * (n - 1) / 2 ** (self.bits + 1))
+
+    def close(self):
+        self.seen = set()
+
+class BloomLineSet:
+    """
+    ブルームフィルタで重複を判定する（メモリ使用量は容量と誤判定率だけで決まる）
+
+    既出の行を未出と判定することはなく、未出の行を既出と誤判定する確率は
+    n行を記録した時点で (1 - e^(-kn/m))^k（m: ビット数、k: ハッシュ関数の数）
+    """
+
+    def __init__(self, capacity=DEFAULT_BLOOM_CAPACITY, error_rate=DEFAULT_BLOOM_ERROR_RATE):
+        """
+        Args:
+            capacity (int): 想定する一意な行の数
+            error_rate (float): 容量まで記録したときの誤判定率
+        """
+        if capacity < 1 or not 0 < error_rate < 1:
+            raise Exception(f"ブルームフィルタの容量または誤判定率が正しくありません: {capacity}, {error_rate}")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))), 8)
+        self.num_hashes = max(int(round(self.num_bits / capacity * math.log(2))), 1)
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, line):
+        """128ビットのハッシュを2つに分け、ダブルハッシュ法でk個のビット位置を求める"""
+        digest = line_digest(line, 16)
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        m = self.num_bits
+        return [(h1 + i * h2) % m for i in range(self.num_hashes)]
+
+    def add_new(self, line):
+        """
+        初めて出現した行であれば記録してTrueを返す（既出と判定した行はFalse）
+        """
+        bits = self.bits
+        new = False
+        for position in self._positions(line):
+            mask = 1 << (position & 7)
+            byte = bits[position >> 3]
+            if not byte & mask:
+                bits[position >> 3] = byte | mask
+                new = True
+        if new:
+            self.count += 1
+        return new
+
+    def __len__(self):
+        return self.count
+
+    def false_positive_bound(self):
+        """現在の状態で未出の行を既出と誤判定する確率（記録が増えるほど大きくなる）"""
+        k = self.num_hashes
+        return (1.0 - math.exp(-k * self.count / self.num_bits)) ** k
+
+    def close(self):
+        self.bits = bytearray()
+
+class DiskLineSet:
+    """
+    行の128ビットのハッシュをSQLiteファイルに保存して重複を判定する
+    メモリに行を保持しないため、メモリに収まらないアーカイブ全体でも重複を除去できる
+
+    pathを指定しない場合は一時ファイルを作成し、closeで削除する（前回の実行の行を既出と判定しない）
+    pathを指定した場合は記録を残すため、同じパスを指定した次の実行では今回の行を既出と判定する
+    """
+
+    def __init__(self, path=None):
+        """
+        Args:
+            path (str, optional): データベースファイルのパス（Noneの場合は実行ごとの一時ファイル）
+        """
+        self.temporary = path is None
+        if self.temporary:
+            fd, path = tempfile.mkstemp(prefix='clean_text_lines_', suffix='.sqlite3')
+            os.close(fd)
+        self.path = path
+        # sqlite3はディスクに保存する場合だけ読み込む（起動時間の短縮）
+        import sqlite3
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS lines (digest BLOB PRIMARY KEY) WITHOUT ROWID")
+        self.conn.commit()
+        self.count = self.conn.execute("SELECT COUNT(*) FROM lines").fetchone()[0]
+        # 以前の実行で記録された行の数（これらの行は最初から既出と判定する）
+        self.preexisting = self.count
+        self.pending = 0
+
+    def add_new(self, line):
+        """
+        初めて出現した行であれば記録してTrueを返す（既出の行はFalse）
+        """
+        cursor = self.conn.execute("INSERT OR IGNORE INTO lines VALUES (?)", (line_digest(line, 16),))
+        if cursor.rowcount != 1:
+            return False
+        self.count += 1
+        self.pending += 1
+        if self.pending >= DISK_COMMIT_INTERVAL:
+            self.conn.commit()
+            self.pending = 0
+        return True
+
+    def __len__(self):
+        return self.count
+
+    def false_positive_bound(self):
+        """記録した行の間でハッシュの衝突が一度でも起きる確率の上限（誕生日問題の上界）"""
+        n = self.count
+        return min(1.0, n * (n - 1) / 2 ** 129)
+
+    def close(self):
+        """記録をコミットしてデータベースを閉じる（一時ファイルの場合は削除する）"""
+        if self.conn is not None:
+            self.conn.commit()
+            self.conn.close()
+            self.conn = None
+            if self.temporary:
+                try:
+                    os.remove(self.path)
+                except OSError:
+                    pass
+
+def create_line_set(mode='exact', path=None, capacity=DEFAULT_BLOOM_CAPACITY, error_rate=DEFAULT_BLOOM_ERROR_RATE):
+    """
+    重複チェックの方式に応じた行の集合を作成する
+
+    Args:
+        mode (str): DEDUPE_MODESのいずれか
+        path (str, optional): diskの場合のデータベースファイルのパス（Noneの場合は実行ごとの一時ファイル）
+        capacity (int): bloomの場合の想定する一意な行の数
+        error_rate (float): bloomの場合の誤判定率
+
+    Returns:
+        add_new(line)で重複を判定するオブジェクト
+    """
+    if mode == 'exact':
+        return ExactLineSet()
+    if mode == 'digest64':
+        return DigestLineSet(64)
+    if mode == 'digest128':
+        return DigestLineSet(128)
+    if mode == 'bloom':
+        return BloomLineSet(capacity, error_rate)
+    if mode == 'disk':
+        return DiskLineSet(path)
+    raise Exception(f"不明な重複チェックの方式です: {mode}（指定できる方式: {', '.join(DEDUPE_MODES)}）")
+
+def main():
+    if len(sys.argv) < 2:
+        print("使用方法: python line_dedupe.py <テキストファイル> [--dedupe=MODE]")
+        print(f"  各行が初めて出現したかを判定し、一意な行数と誤判定率の上限を表示する（MODE: {', '.join(DEDUPE_MODES)}）")
+        return
+
+    file_path = sys.argv[1]
+    mode = 'exact'
+    for arg in sys.argv[2:]:
+        if arg.startswith("--dedupe="):
+            mode = arg.split("=", 1)[1]
+
+    if not os.path.exists(file_path):
+        print(f"エラー: 指定されたファイル '{file_path}' が存在しません。")
+        return
+
+    line_set = create_line_set(mode)
+    try:
+        total = 0
+        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            for line in f:
+                total += 1
+                line_set.add_new(line.rstrip('\n'))
+        print(f"行数: {total}, 一意な行数: {len(line_set)}, 誤判定率の上限: {line_set.false_positive_bound():.3g}")
+    finally:
+        line_set.close()
+
+if __name__ == "__main__":
+    main()
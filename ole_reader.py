@@ -0,0 +1,456 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+import sys
+import struct
+import mmap
+import threading
+import contextlib
+
+# OLE2（Compound File Binary）形式のシグネチャ
+OLE_SIGNATURE = b'\xD0\xCF\x11\xE0\xA1\xB1\x1A\xE1'
+
+# 特殊なセクタ番号
+MAXREGSECT = 0xFFFFFFFA
+DIFSECT = 0xFFFFFFFC
+FATSECT = 0xFFFFFFFD
+ENDOFCHAIN = 0xFFFFFFFE
+FREESECT = 0xFFFFFFFF
+NOSTREAM = 0xFFFFFFFF
+
+# ディレクトリエントリの種類
+STGTY_STORAGE = 1
+STGTY_STREAM = 2
+STGTY_ROOT = 5
+
+def is_ole_file(data):
+    """
+    データがOLE2（Compound File Binary）形式かどうかを判定する
+    """
+    return len(data) >= 512 and bytes(data[:8]) == OLE_SIGNATURE
+
+class OleCompoundFile:
+    """
+    OLE2（Compound File Binary）形式のファイルを読み込む純Python実装
+    ディレクトリとFAT/MiniFATのチェーンを解決し、必要なストリームだけを取り出す
+    """
+
+    def __init__(self, data):
+        """
+        Args:
+            data (bytes): ファイル全体のバイト列（bytes/mmap/memoryviewなど）
+        """
+        if not is_ole_file(data):
+            raise Exception("OLE2形式のファイルではありません")
+
+        self.data = memoryview(data)
+        self._parse_header()
+        self._load_fat()
+        self._load_directory()
+        self._load_minifat()
+
+    @classmethod
+    def from_path(cls, path):
+        """ファイルパスからOLE2ファイルを読み込む"""
+        with open(path, 'rb') as f:
+            return cls(f.read())
+
+    def _parse_header(self):
+        """ヘッダー（先頭512バイト）を解析する"""
+        header = bytes(self.data[:512])
+
+        byte_order = struct.unpack_from('<H', header, 0x1C)[0]
+        if byte_order != 0xFFFE:
+            raise Exception("OLE2ヘッダーのバイトオーダーが不正です")
+
+        sector_shift = struct.unpack_from('<H', header, 0x1E)[0]
+        mini_sector_shift = struct.unpack_from('<H', header, 0x20)[0]
+        if sector_shift not in (9, 12) or mini_sector_shift != 6:
+            raise Exception(f"サポートされていないセクタサイズです: {sector_shift}")
+
+        self.sector_size = 1 << sector_shift
+        self.mini_sector_size = 1 << mini_sector_shift
+        (self.num_fat_sectors, self.first_dir_sector, _, self.mini_stream_cutoff,
+         self.first_minifat_sector, self.num_minifat_sectors,
+         self.first_difat_sector, self.num_difat_sectors) = struct.unpack_from('<8I', header, 0x2C)
+        self.header_difat = struct.unpack_from('<109I', header, 0x4C)
+
+        # ファイル末尾の端数セクタも含めた総セクタ数（チェーンの循環検出に使用）
+        self.max_sectors = (len(self.data) + self.sector_size - 1) // self.sector_size
+
+    def _sector(self, sector_id):
+        """指定したセクタのデータ（memoryview）を返す"""
+        offset = (sector_id + 1) * self.sector_size
+        if offset >= len(self.data):
+            raise Exception(f"セクタ番号がファイルの範囲外です: {sector_id}")
+        return self.data[offset:offset + self.sector_size]
+
+    def _load_fat(self):
+        """DIFATをたどってFAT（セクタ割り当て表）を構築する"""
+        fat_sector_ids = [s for s in self.header_difat if s <= MAXREGSECT]
+
+        # 109個を超えるFATセクタはDIFATセクタのチェーンに記録されている
+        entries_per_sector = self.sector_size // 4
+        difat_sector = self.first_difat_sector
+        for _ in range(self.num_difat_sectors):
+            if difat_sector > MAXREGSECT:
+                break
+            values = struct.unpack(f'<{entries_per_sector}I', self._sector(difat_sector))
+            fat_sector_ids.extend(s for s in values[:-1] if s <= MAXREGSECT)
+            difat_sector = values[-1]
+
+        fat_sector_ids = fat_sector_ids[:self.num_fat_sectors]
+        fat_bytes = b''.join(self._sector(s) for s in fat_sector_ids)
+        self.fat = struct.unpack(f'<{len(fat_bytes) // 4}I', fat_bytes)
+
+    def _chain(self, start_sector, table, limit):
+        """セクタ割り当て表をたどってセクタ番号のリストを返す"""
+        chain = []
+        sector = start_sector
+        while sector <= MAXREGSECT:
+            if sector >= len(table) or len(chain) > limit:
+                raise Exception("セクタチェーンが壊れています")
+            chain.append(sector)
+            sector = table[sector]
+        return chain
+
+    def _read_chain(self, start_sector, size=None):
+        """FATのチェーンをたどって通常セクタのデータを読み込む"""
+        chain = self._chain(start_sector, self.fat, self.max_sectors)
+        data = b''.join(self._sector(s) for s in chain)
+        return data if size is None else data[:size]
+
+    def _read_chain_view(self, start_sector, size):
+        """
+        FATのチェーンをたどって通常セクタのデータを返す
+        セクタが連続している場合（通常のWord文書の大部分）は、コピーせずにファイルのデータの範囲を返す
+        """
+        chain = self._chain(start_sector, self.fat, self.max_sectors)
+        if not chain:
+            return memoryview(b'')
+        first = chain[0]
+        if (chain[-1] + 1) * self.sector_size >= len(self.data):
+            raise Exception(f"セクタ番号がファイルの範囲外です: {chain[-1]}")
+        if chain[-1] - first == len(chain) - 1 and all(s == first + i for i, s in enumerate(chain)):
+            offset = (first + 1) * self.sector_size
+            end = min(offset + len(chain) * self.sector_size, len(self.data))
+            return self.data[offset:end][:size]
+        return memoryview(self._read_chain(start_sector, size))
+
+    def _load_directory(self):
+        """ディレクトリストリームを読み込み、エントリの一覧を作成する"""
+        dir_data = self._read_chain(self.first_dir_sector)
+        self.entries = []
+        for offset in range(0, len(dir_data) - 127, 128):
+            name_length = struct.unpack_from('<H', dir_data, offset + 0x40)[0]
+            name = dir_data[offset:offset + max(name_length - 2, 0)].decode('utf-16le', errors='ignore')
+            entry_type = dir_data[offset + 0x42]
+            left, right, child = struct.unpack_from('<3I', dir_data, offset + 0x44)
+            start_sector = struct.unpack_from('<I', dir_data, offset + 0x74)[0]
+            size = struct.unpack_from('<Q', dir_data, offset + 0x78)[0]
+            # バージョン3のファイルではサイズの上位32ビットは未使用
+            if self.sector_size == 512:
+                size &= 0xFFFFFFFF
+            self.entries.append({
+                'name': name,
+                'type': entry_type,
+                'left': left,
+                'right': right,
+                'child': child,
+                'start': start_sector,
+                'size': size,
+            })
+
+        if not self.entries or self.entries[0]['type'] != STGTY_ROOT:
+            raise Exception("ルートエントリが見つかりません")
+        self.root = self.entries[0]
+
+    def _load_minifat(self):
+        """MiniFATとミニストリーム（ルートエントリのストリーム）を読み込む"""
+        self.minifat = ()
+        self.mini_stream = b''
+        if self.num_minifat_sectors == 0 or self.first_minifat_sector > MAXREGSECT:
+            return
+        minifat_bytes = self._read_chain(self.first_minifat_sector)
+        self.minifat = struct.unpack(f'<{len(minifat_bytes) // 4}I', minifat_bytes)
+        self.mini_stream = self._read_chain(self.root['start'], self.root['size'])
+
+    def _children(self, storage):
+        """ストレージ直下のエントリを赤黒木をたどって列挙する"""
+        children = []
+        stack = [storage['child']]
+        visited = set()
+        while stack:
+            index = stack.pop()
+            if index == NOSTREAM or index >= len(self.entries) or index in visited:
+                continue
+            visited.add(index)
+            entry = self.entries[index]
+            children.append(entry)
+            stack.append(entry['left'])
+            stack.append(entry['right'])
+        return children
+
+    def _find_entry(self, name):
+        """ルート直下から名前（大文字小文字を区別しない）でストリームを探す"""
+        for entry in self._children(self.root):
+            if entry['type'] == STGTY_STREAM and entry['name'].lower() == name.lower():
+                return entry
+        return None
+
+    def list_streams(self):
+        """ルート直下のストリーム名の一覧を返す"""
+        return sorted(e['name'] for e in self._children(self.root) if e['type'] == STGTY_STREAM)
+
+    def exists(self, name):
+        """ルート直下に指定した名前のストリームが存在するか確認する"""
+        return self._find_entry(name) is not None
+
+    def read_stream(self, name):
+        """
+        ルート直下のストリームを読み込む
+
+        Args:
+            name (str): ストリーム名（例: 'WordDocument', '1Table'）
+
+        Returns:
+            bytes: ストリームの内容
+        """
+        return bytes(self.read_stream_view(name))
+
+    def read_stream_view(self, name):
+        """
+        ルート直下のストリームをmemoryviewで返す（セクタが連続していればファイルのデータをコピーしない）
+
+        Args:
+            name (str): ストリーム名（例: 'WordDocument', '1Table'）
+
+        Returns:
+            memoryview: ストリームの内容
+        """
+        entry = self._find_entry(name)
+        if entry is None:
+            raise Exception(f"ストリームが見つかりません: {name}")
+
+        size = entry['size']
+        if size < self.mini_stream_cutoff:
+            # 小さいストリームはミニストリーム内に64バイト単位で格納されている
+            limit = len(self.mini_stream) // self.mini_sector_size
+            chain = self._chain(entry['start'], self.minifat, limit)
+            mini = memoryview(self.mini_stream)
+            data = b''.join(mini[s * self.mini_sector_size:(s + 1) * self.mini_sector_size] for s in chain)
+            return memoryview(data[:size])
+        return self._read_chain_view(entry['start'], size)
+
+class DocumentHandle:
+    """
+    .docファイルをメモリマップで一度だけ開き、複数の抽出方法で共有するためのハンドル
+
+    ファイルの内容はコピーせずにmemoryviewで参照し、OLE2構造の解析とストリームの取り出しは
+    最初に必要になったときに一度だけ行う。各抽出方法はここから得たmemoryviewのうち必要な範囲だけをデコードする
+    """
+
+    def __init__(self, doc_path):
+        """
+        Args:
+            doc_path (str): .docファイルのパス
+        """
+        self.path = doc_path
+        self._file = open(doc_path, 'rb')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.data = memoryview(self._mmap)
+        except ValueError:
+            # 空のファイルはメモリマップできない
+            self._mmap = None
+            self.data = memoryview(b'')
+        self._ole = None
+        self._ole_checked = False
+        self._text_bytes = None
+        self._word_streams = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+
+    def close(self):
+        """メモリマップとファイルを閉じる"""
+        self._ole = None
+        self._text_bytes = None
+        self._word_streams = None
+        self.data = memoryview(b'')
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # 呼び出し元がまだmemoryviewを保持している場合は、参照がなくなった時点で解放される
+                pass
+            self._mmap = None
+        self._file.close()
+
+    def ole(self):
+        """
+        OLE2構造を解析した結果を返す（OLE2形式でない場合はNone。解析は一度だけ行う）
+
+        Raises:
+            Exception: OLE2形式だが構造が壊れている場合
+        """
+        if not self._ole_checked:
+            self._ole_checked = True
+            if is_ole_file(self.data):
+                self._ole = OleCompoundFile(self.data)
+        return self._ole
+
+    def text_bytes(self):
+        """
+        バイナリ解析用に、テキストを含むバイト列（WordDocumentストリーム）を返す
+        OLE2形式でない場合やWordDocumentストリームがない場合はファイル全体を返す（read_doc_text_bytesと同じ）
+
+        Returns:
+            memoryview: WordDocumentストリーム（またはファイル全体）
+        """
+        if self._text_bytes is None:
+            self._text_bytes = self.data
+            try:
+                ole = self.ole()
+                if ole is not None and ole.exists('WordDocument'):
+                    self._text_bytes = ole.read_stream_view('WordDocument')
+            except Exception as e:
+                print(f"OLE2ストリームの読み込みに失敗しました。ファイル全体を解析します: {str(e)}")
+        return self._text_bytes
+
+    def word_streams(self):
+        """
+        WordDocumentストリームとテーブルストリーム（0Table/1Table）を返す（read_word_streamsと同じ）
+
+        Returns:
+            tuple: (WordDocumentストリーム, テーブルストリーム)
+        """
+        if self._word_streams is None:
+            ole = self.ole()
+            if ole is None:
+                raise Exception("OLE2形式のファイルではありません")
+            word_document = ole.read_stream_view('WordDocument')
+
+            # FIBのfWhichTblStmビットで使用するテーブルストリームを判定
+            flags = struct.unpack_from('<H', word_document, 0x0A)[0]
+            table_name = '1Table' if flags & 0x0200 else '0Table'
+            table_stream = ole.read_stream_view(table_name) if ole.exists(table_name) else b''
+            self._word_streams = (word_document, table_stream)
+        return self._word_streams
+
+# 変換中のファイルで共有しているハンドル（絶対パス → [ハンドル, 使用中の数]）
+_shared_documents = {}
+_shared_lock = threading.Lock()
+
+@contextlib.contextmanager
+def shared_document(doc_path):
+    """
+    この中で呼び出したread_doc_text_bytes/read_word_streamsが、同じファイルについて
+    一つのメモリマップを共有するようにする（複数の抽出方法を順に試す場合に、ファイルを何度も読み込まない）
+
+    Args:
+        doc_path (str): .docファイルのパス
+
+    Yields:
+        DocumentHandle: 共有するハンドル
+    """
+    key = os.path.abspath(doc_path)
+    with _shared_lock:
+        entry = _shared_documents.get(key)
+        if entry is None:
+            entry = _shared_documents[key] = [DocumentHandle(doc_path), 0]
+        entry[1] += 1
+    try:
+        yield entry[0]
+    finally:
+        with _shared_lock:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del _shared_documents[key]
+                entry[0].close()
+
+def _shared_handle(doc_path):
+    """共有中のハンドルがあれば返す"""
+    if not _shared_documents:
+        return None
+    entry = _shared_documents.get(os.path.abspath(doc_path))
+    return entry[0] if entry is not None else None
+
+def read_word_streams(doc_path):
+    """
+    .docファイルからWordDocumentストリームとテーブルストリーム（0Table/1Table）を取り出す
+
+    Args:
+        doc_path (str): .docファイルのパス
+
+    Returns:
+        tuple: (WordDocumentストリーム, テーブルストリーム)
+        shared_documentの中で呼び出した場合は、共有しているファイルのmemoryview
+    """
+    handle = _shared_handle(doc_path)
+    if handle is not None:
+        return handle.word_streams()
+
+    ole = OleCompoundFile.from_path(doc_path)
+    word_document = ole.read_stream('WordDocument')
+
+    # FIBのfWhichTblStmビットで使用するテーブルストリームを判定
+    flags = struct.unpack_from('<H', word_document, 0x0A)[0]
+    table_name = '1Table' if flags & 0x0200 else '0Table'
+    table_stream = ole.read_stream(table_name) if ole.exists(table_name) else b''
+
+    return word_document, table_stream
+
+def read_doc_text_bytes(doc_path):
+    """
+    バイナリ解析用に、.docファイルからテキストを含むバイト列だけを読み込む
+    OLE2形式でない場合やWordDocumentストリームがない場合はファイル全体を返す
+
+    Args:
+        doc_path (str): .docファイルのパス
+
+    Returns:
+        bytes: WordDocumentストリーム（またはファイル全体）のバイト列
+        shared_documentの中で呼び出した場合は、共有しているファイルのmemoryview
+    """
+    handle = _shared_handle(doc_path)
+    if handle is not None:
+        return handle.text_bytes()
+
+    with open(doc_path, 'rb') as f:
+        content = f.read()
+
+    if not is_ole_file(content):
+        return content
+
+    try:
+        ole = OleCompoundFile(content)
+        if ole.exists('WordDocument'):
+            return ole.read_stream('WordDocument')
+    except Exception as e:
+        print(f"OLE2ストリームの読み込みに失敗しました。ファイル全体を解析します: {str(e)}")
+
+    return content
+
+def main():
+    if len(sys.argv) < 2:
+        print("使用方法: python ole_reader.py <docファイル>")
+        return
+
+    doc_path = sys.argv[1]
+    if not os.path.exists(doc_path):
+        print(f"エラー: 指定されたファイル '{doc_path}' が存在しません。")
+        return
+
+    ole = OleCompoundFile.from_path(doc_path)
+    print(f"ファイル: {doc_path} (セクタサイズ: {ole.sector_size})")
+    for name in ole.list_streams():
+        entry = ole._find_entry(name)
+        print(f"  {name}: {entry['size']} バイト")
+
+if __name__ == "__main__":
+    main()
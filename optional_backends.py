@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import sys
+import importlib
+
+# 変換方法ごとに必要になるモジュール（インストールされていない環境でも起動できるように、使う時点で読み込む）
+BACKEND_MODULES = {
+    'win32com.client': "Word COM（Windows + pywin32）",
+    'comtypes.client': "LibreOffice COM（Windows + comtypes）",
+    'docx': "python-docx",
+    'docx2txt': "docx2txt",
+    'pypandoc': "pypandoc",
+    'uno': "LibreOffice UNO（python3-uno）",
+}
+
+# 読み込みに成功したモジュールと、利用できないと判明したモジュール（理由付き）
+_loaded_backends = {}
+_disabled_backends = {}
+
+def import_backend(module_name):
+    """
+    変換方法で使用するモジュールを、初めて必要になった時点で読み込む
+
+    一度読み込みに失敗したモジュールは利用不可として記録し、以降は読み込みを試さずに同じ例外を送出する
+
+    Args:
+        module_name (str): モジュール名（例: 'win32com.client', 'docx'）
+
+    Returns:
+        module: 読み込んだモジュール
+
+    Raises:
+        ImportError: モジュールが利用できない場合
+    """
+    module = _loaded_backends.get(module_name)
+    if module is not None:
+        return module
+
+    reason = _disabled_backends.get(module_name)
+    if reason is None:
+        try:
+            module = importlib.import_module(module_name)
+        except Exception as e:
+            # COMのモジュールはWindows以外ではImportError以外の例外を送出することもある
+            reason = f"{type(e).__name__}: {e}"
+            _disabled_backends[module_name] = reason
+        else:
+            _loaded_backends[module_name] = module
+            return module
+
+    label = BACKEND_MODULES.get(module_name, module_name)
+    raise ImportError(f"{label}は利用できません（{reason}）")
+
+def is_backend_available(module_name):
+    """
+    モジュールが利用できるか確認する（必要であればこの時点で読み込む）
+    """
+    try:
+        import_backend(module_name)
+        return True
+    except ImportError:
+        return False
+
+def disabled_backends():
+    """
+    利用できないと判明したモジュールと理由の一覧を返す
+    """
+    return dict(_disabled_backends)
+
+def main():
+    print(f"Python: {sys.version.split()[0]} ({sys.platform})")
+    for module_name, label in BACKEND_MODULES.items():
+        status = "利用可能" if is_backend_available(module_name) else f"利用不可 - {_disabled_backends[module_name]}"
+        print(f"  {label} [{module_name}]: {status}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+import sys
+from cleanup_text import clean_text_content
+from super_cleanup import super_clean_text
+from enhanced_utf8_fix import remove_garbled_lines
+
+# 変換後のテキストに適用できる後処理（名前 → テキストを受け取りテキストを返す関数）
+# それぞれ cleanup_text.py / super_cleanup.py / enhanced_utf8_fix.py と同じ処理をメモリ上で行う
+POSTPROCESS_STAGES = {
+    'clean_text': clean_text_content,
+    'super_clean': super_clean_text,
+    'fix_utf8': remove_garbled_lines,
+}
+
+def parse_stages(value):
+    """
+    カンマ区切りの後処理の指定（例: 'clean_text,super_clean'）を解析する
+
+    Args:
+        value (str): 後処理の名前をカンマ区切りで並べた文字列（指定した順に適用する）
+
+    Returns:
+        tuple: 後処理の名前のタプル
+
+    Raises:
+        Exception: 不明な後処理が指定された場合
+    """
+    stages = tuple(name.strip() for name in value.split(',') if name.strip())
+    for name in stages:
+        if name not in POSTPROCESS_STAGES:
+            raise Exception(f"不明な後処理です: {name}（指定できる後処理: {', '.join(POSTPROCESS_STAGES)}）")
+    return stages
+
+def stages_key(stages):
+    """
+    キャッシュのキーなどに使う、後処理の組み合わせを表す文字列を返す（後処理がない場合は空文字列）
+    """
+    return '+'.join(stages or ())
+
+def apply_postprocess(text, stages):
+    """
+    テキストに後処理を指定した順に適用する
+
+    Args:
+        text (str): 変換したテキスト
+        stages (tuple): 後処理の名前のタプル（Noneまたは空の場合は何もしない）
+
+    Returns:
+        str: 後処理を適用したテキスト
+    """
+    for name in stages or ():
+        text = POSTPROCESS_STAGES[name](text)
+    return text
+
+def main():
+    if len(sys.argv) < 3:
+        print("使用方法: python postprocess.py <テキストファイル> <後処理（カンマ区切り）> [出力ファイル]")
+        print(f"  指定できる後処理: {', '.join(POSTPROCESS_STAGES)}")
+        return
+
+    input_path = sys.argv[1]
+    output_path = sys.argv[3] if len(sys.argv) > 3 else input_path
+    try:
+        stages = parse_stages(sys.argv[2])
+    except Exception as e:
+        print(f"エラー: {str(e)}")
+        return
+
+    if not os.path.exists(input_path):
+        print(f"エラー: 指定されたファイル '{input_path}' が存在しません。")
+        return
+
+    with open(input_path, 'r', encoding='utf-8', errors='ignore') as f:
+        text = f.read()
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(apply_postprocess(text, stages))
+    print(f"後処理完了（{stages_key(stages)}）: {output_path}")
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,44 @@
 
 import os
 import sys
-import docx2txt
-import docx
 from pathlib import Path
-import win32com.client
 import tempfile
 import shutil
+from optional_backends import import_backend
+from docx_stream import DocxPackage, extract_docx_text
+from converter_backends import BackendRegistry
+
+# .docの変換方法の一覧
+DOC_BACKENDS = BackendRegistry()
+
+@DOC_BACKENDS.register("Word COM + XMLストリーム解析", ('.doc',), cost=3.0, platforms=('win32',), modules=('win32com.client',))
+def get_text_with_word_com(file_path):
+    """
+    Word COMで.docを.docxに変換し、XMLストリーム解析でテキストを抽出する
+    """
+    temp_dir = tempfile.mkdtemp()
+    temp_docx = os.path.join(temp_dir, "temp.docx")
+    
+    try:
+        # Word COMを使用
+        word = import_backend('win32com.client').Dispatch("Word.Application")
+        word.Visible = False
+        
+        try:
+            print(f"Word COMでdocxに変換中...")
+            doc = word.Documents.Open(file_path)
+            doc.SaveAs2(os.path.abspath(temp_docx), FileFormat=16)  # 16 = docx形式
+            doc.Close(SaveChanges=False)
+            
+            # 変換したdocxを処理
+            return extract_docx_text(temp_docx)
+        finally:
+            word.Quit()
+    finally:
+        try:
+            shutil.rmtree(temp_dir)
+        except:
+            pass
 
 def convert_file(file_path, encoding='shift-jis'):
     """
@@ -24,82 +56,54 @@ def convert_file(file_path, encoding='shift-jis'):
     ext = os.path.splitext(file_path)[1].lower()
     
     if ext == '.docx':
-        # .docxファイルの処理
+        # .docxファイルの処理（パッケージは一度だけ開き、構造的な抽出にもそのまま使う）
         try:
-            text = docx2txt.process(file_path)
-            with open(output_path, 'w', encoding=encoding) as f:
-                f.write(text)
-            print(f"docx2txtで変換成功")
-            return True
+            package = DocxPackage(file_path)
         except Exception as e:
-            print(f"docx2txtでの変換に失敗: {str(e)}")
-            
+            print(f"docxファイルを開けませんでした: {str(e)}")
+            return False
+
+        with package:
             try:
-                # python-docxを使用
-                doc = docx.Document(file_path)
-                full_text = []
-                for para in doc.paragraphs:
-                    if para.text.strip():
-                        full_text.append(para.text)
-                
-                for table in doc.tables:
-                    for row in table.rows:
-                        row_text = []
-                        for cell in row.cells:
-                            if cell.text.strip():
-                                row_text.append(cell.text)
-                        if row_text:
-                            full_text.append('\t'.join(row_text))
-                
+                text = extract_docx_text(package)
                 with open(output_path, 'w', encoding=encoding) as f:
-                    f.write('\n'.join(full_text))
-                
-                print(f"python-docxで変換成功")
+                    f.write(text)
+                print(f"XMLストリーム解析で変換成功")
                 return True
-            except Exception as e2:
-                print(f"python-docxでの変換に失敗: {str(e2)}")
-                return False
+            except Exception as e:
+                print(f"XMLストリーム解析での変換に失敗: {str(e)}")
+
+                try:
+                    # 段落と表の構造から抽出
+                    full_text = package.structured_lines()
+
+                    with open(output_path, 'w', encoding=encoding) as f:
+                        f.write('\n'.join(full_text))
+
+                    print(f"段落・表の構造解析で変換成功")
+                    return True
+                except Exception as e2:
+                    print(f"段落・表の構造解析での変換に失敗: {str(e2)}")
+                    return False
                 
     elif ext == '.doc':
-        # .docファイルの処理
-        temp_dir = tempfile.mkdtemp()
-        temp_docx = os.path.join(temp_dir, "temp.docx")
+        # .docファイルの処理（利用できる変換方法を推定コストの小さい順に試す）
+        for backend, reason in DOC_BACKENDS.skipped(ext):
+            print(f"{backend.name}は利用できません（{reason}）")
         
-        try:
-            # Word COMを使用
-            word = win32com.client.Dispatch("Word.Application")
-            word.Visible = False
-            
+        for backend in DOC_BACKENDS.candidates(ext):
             try:
-                print(f"Word COMでdocxに変換中...")
-                doc = word.Documents.Open(file_path)
-                doc.SaveAs2(os.path.abspath(temp_docx), FileFormat=16)  # 16 = docx形式
-                doc.Close(SaveChanges=False)
-                
-                # 変換したdocxを処理
-                text = docx2txt.process(temp_docx)
-                
-                with open(output_path, 'w', encoding=encoding) as f:
-                    f.write(text)
-                
-                print(f"Word COM + docx2txtで変換成功")
-                return True
+                text = DOC_BACKENDS.run(backend, file_path)
             except Exception as e:
-                print(f"Word COMでの変換に失敗: {str(e)}")
-                return False
-            finally:
-                word.Quit()
-                try:
-                    shutil.rmtree(temp_dir)
-                except:
-                    pass
-        except Exception as e:
-            print(f"Word COMの初期化に失敗: {str(e)}")
-            try:
-                shutil.rmtree(temp_dir)
-            except:
-                pass
-            return False
+                print(f"{backend.name}での変換に失敗: {str(e)}")
+                continue
+            
+            with open(output_path, 'w', encoding=encoding) as f:
+                f.write(text)
+            
+            print(f"{backend.name}で変換成功")
+            return True
+        return False
     else:
         print(f"サポートされていないファイル形式: {ext}")
         return False
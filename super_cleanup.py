@@ -1,46 +1,29 @@
 #!/usr/bin/env python
 # coding: utf-8
 
-import re
-import os
+# 文字化けチェックと日本語らしさチェックは、コンパイル済みのパターンを共有する
+from line_classifier import is_garbled, has_japanese_content
+from text_stream import iter_file_lines, write_joined
 
-def super_clean_file(input_path, output_path):
-    print(f"高度なクリーニングを実行中: {input_path}")
-    
-    # ファイルを読み込む
-    with open(input_path, 'r', encoding='utf-8', errors='ignore') as f:
-        content = f.read()
-    
+def iter_super_clean_paragraphs(lines, stats=None):
+    """
+    文字化けがなく日本語コンテンツがある段落だけを順に出力する
+    保持するのは処理中の段落の行だけで、テキスト全体はメモリに保持しない
+
+    Args:
+        lines: 行のイテラブル（str.splitlines()と同じく改行文字を含まない行）
+        stats (dict, optional): 指定した場合は元の行数（'lines'）を格納する
+
+    Yields:
+        str: 段落のテキスト
+    """
     # 段落単位で処理
-    paragraphs = []
     current_para = []
-    
-    # 文字化けチェック関数
-    def is_garbled(text):
-        # 文字化けの特徴的なパターン
-        if re.search(r'[龠〆〜耐脀砐源氈鰈璀丄溑蛝鯄瀠鮤]{2,}', text):
-            return True
-        # XMLや特殊記号の連続パターン
-        if re.search(r'[<>/\\{}[\]|@#$%^&*=+`~]{4,}', text):
-            return True
-        # 意味不明な文字の連続
-        if re.search(r'[^ぁ-んァ-ン一-龥a-zA-Z0-9 \t.,;:!?()（）「」『』［］【】・。、：；！？…　]{4,}', text):
-            return True
-        return False
-    
-    # 日本語らしさチェック関数
-    def has_japanese_content(text):
-        # 日本語文字が含まれているか
-        if re.search(r'[ぁ-んァ-ヶ一-龠々〆〜]', text):
-            return True
-        # 意味のある記号や数字だけでも有効とする
-        if re.search(r'[a-zA-Z0-9]{2,}|[・。、：；「」『』（）［］【】◆■□◇※！？]', text) and len(text) > 3:
-            return True
-        return False
+    line_count = 0
     
     # 行ごとに処理
-    lines = content.splitlines()
     for line in lines:
+        line_count += 1
         line = line.strip()
         
         # 空行処理
@@ -49,7 +32,7 @@ def super_clean_file(input_path, output_path):
                 paragraph_text = ' '.join(current_para)
                 # 文字化けがなく、日本語コンテンツがある段落のみ保持
                 if not is_garbled(paragraph_text) and has_japanese_content(paragraph_text):
-                    paragraphs.append(paragraph_text)
+                    yield paragraph_text
                 current_para = []
             continue
         
@@ -61,14 +44,26 @@ def super_clean_file(input_path, output_path):
     if current_para:
         paragraph_text = ' '.join(current_para)
         if not is_garbled(paragraph_text) and has_japanese_content(paragraph_text):
-            paragraphs.append(paragraph_text)
+            yield paragraph_text
+    
+    if stats is not None:
+        stats['lines'] = line_count
+
+def super_clean_text(content):
+    """
+    テキストに高度なクリーニングを行った結果を返す（ファイルの読み書きは行わない）
+    """
+    return '\n\n'.join(iter_super_clean_paragraphs(content.splitlines()))
+
+def super_clean_file(input_path, output_path):
+    print(f"高度なクリーニングを実行中: {input_path}")
     
-    # 結果をファイルに書き込む
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write('\n\n'.join(paragraphs))
+    # 一行ずつ読み込み、段落ごとに書き込む（ファイル全体をメモリに読み込まない）
+    stats = {}
+    paragraph_count = write_joined(output_path, iter_super_clean_paragraphs(iter_file_lines(input_path), stats), '\n\n')
     
     print(f"クリーニング完了: {output_path}")
-    print(f"元のファイル行数: {len(lines)}, クリーニング後の段落数: {len(paragraphs)}")
+    print(f"元のファイル行数: {stats['lines']}, クリーニング後の段落数: {paragraph_count}")
 
 if __name__ == "__main__":
     input_file = "201908給付金補助資料（手順書）11支払・不払件数の計上方法 (1).txt"
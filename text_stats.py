@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+import sys
+import re
+
+# 文字クラスごとのコードポイント範囲（各クラスの範囲は互いに重ならない）
+# 日本語文字（hiragana/katakana/kanji/marks）は従来の [ぁ-んァ-ヶ一-龠々〆〜] と同じ範囲
+CHAR_CLASSES = {
+    'hiragana': ((0x3041, 0x3093),),                 # ぁ-ん
+    'katakana': ((0x30A1, 0x30F6),),                 # ァ-ヶ
+    'kanji': ((0x4E00, 0x9FA0),),                    # 一-龠
+    'marks': ((0x3005, 0x3006), (0x301C, 0x301C)),   # 々〆〜
+    'ascii': ((0x20, 0x7E),),                        # 印字可能なASCII
+    'control': ((0x00, 0x08), (0x0B, 0x0C), (0x0E, 0x1F), (0x7F, 0x7F)),  # タブ・改行以外の制御文字
+    'private_use': ((0xE000, 0xF8FF),),              # 私用領域（外字・記号フォントなど）
+}
+
+# 日本語文字として数えるクラス
+JAPANESE_CLASSES = ('hiragana', 'katakana', 'kanji', 'marks')
+
+# 一部のスクリプトで使用している広めの日本語の範囲（かな全体とCJK統合漢字）
+WIDE_JAPANESE_RANGES = ((0x3040, 0x30FF), (0x4E00, 0x9FFF))
+
+# この文字数以上のテキストは、NumPyが使える場合にコードポイントの配列としてまとめて集計する
+VECTORIZE_MIN_LENGTH = 256 * 1024
+
+# NumPyは大きなテキストを集計するときに初めて読み込む（Noneは未確認、Falseは利用不可）
+_numpy = None
+
+def _load_numpy():
+    """NumPyを必要になった時点で読み込む（インストールされていない場合はNone）"""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+    return _numpy or None
+
+def _ranges_to_class(ranges):
+    """コードポイント範囲を正規表現の文字クラスの中身に変換する"""
+    parts = []
+    for low, high in ranges:
+        if low == high:
+            parts.append(f'\\U{low:08X}')
+        else:
+            parts.append(f'\\U{low:08X}-\\U{high:08X}')
+    return ''.join(parts)
+
+# 各クラス以外の文字の並びにマッチするパターン（削除した残りの長さがクラスの文字数になる）
+_COMPLEMENT_PATTERNS = {}
+
+def _complement_pattern(ranges):
+    """指定した範囲以外の文字の並びにマッチするパターンを返す"""
+    pattern = _COMPLEMENT_PATTERNS.get(ranges)
+    if pattern is None:
+        pattern = re.compile(f'[^{_ranges_to_class(ranges)}]+')
+        _COMPLEMENT_PATTERNS[ranges] = pattern
+    return pattern
+
+def _code_points(text, numpy):
+    """テキストをコードポイントの配列に変換する"""
+    return numpy.frombuffer(text.encode('utf-32-le', errors='surrogatepass'), dtype='<u4')
+
+def _count_ranges_vectorized(code_points, ranges, numpy):
+    """コードポイントの配列から、指定した範囲に含まれる文字数を数える"""
+    count = 0
+    for low, high in ranges:
+        count += int(numpy.count_nonzero((code_points >= low) & (code_points <= high)))
+    return count
+
+def count_ranges(text, ranges):
+    """
+    指定したコードポイント範囲に含まれる文字の数を数える
+    マッチした文字のリストは作成しない
+
+    Args:
+        text (str): 集計するテキスト
+        ranges (tuple): (開始, 終了) のコードポイント範囲のタプル
+
+    Returns:
+        int: 範囲に含まれる文字の数
+    """
+    ranges = tuple(ranges)
+    if len(text) >= VECTORIZE_MIN_LENGTH:
+        numpy = _load_numpy()
+        if numpy is not None:
+            return _count_ranges_vectorized(_code_points(text, numpy), ranges, numpy)
+    return len(_complement_pattern(ranges).sub('', text))
+
+def char_class_counts(text):
+    """
+    文字クラス（ひらがな・カタカナ・漢字・記号・ASCII・制御文字・私用領域）ごとの文字数を集計する
+
+    Args:
+        text (str): 集計するテキスト
+
+    Returns:
+        dict: クラス名ごとの文字数と、日本語文字の合計（'japanese'）、その他（'other'）、全体（'total'）
+    """
+    counts = {}
+    numpy = _load_numpy() if len(text) >= VECTORIZE_MIN_LENGTH else None
+    if numpy is not None:
+        # コードポイントの配列に一度だけ変換し、範囲の境界で振り分けてすべてのクラスをまとめて数える
+        code_points = _code_points(text, numpy)
+        bounds = []
+        owners = []
+        for name, ranges in CHAR_CLASSES.items():
+            for low, high in ranges:
+                bounds.append((low, high, name))
+        bounds.sort()
+        edges = []
+        for low, high, name in bounds:
+            edges.extend((low, high + 1))
+            owners.append(name)
+        bins = numpy.bincount(numpy.searchsorted(numpy.array(edges, dtype='<u4'), code_points, side='right'),
+                              minlength=len(edges) + 1)
+        for name in CHAR_CLASSES:
+            counts[name] = 0
+        for i, name in enumerate(owners):
+            # 境界の配列で奇数番目の区間が各範囲の内側にあたる
+            counts[name] += int(bins[2 * i + 1])
+    else:
+        for name, ranges in CHAR_CLASSES.items():
+            counts[name] = len(_complement_pattern(ranges).sub('', text))
+
+    counts['japanese'] = sum(counts[name] for name in JAPANESE_CLASSES)
+    counts['total'] = len(text)
+    counts['other'] = counts['total'] - sum(counts[name] for name in CHAR_CLASSES)
+    return counts
+
+# 日本語文字全体のコードポイント範囲
+JAPANESE_RANGES = tuple(r for name in JAPANESE_CLASSES for r in CHAR_CLASSES[name])
+
+def japanese_char_count(text):
+    """
+    日本語文字（[ぁ-んァ-ヶ一-龠々〆〜]）の数を数える
+    """
+    return count_ranges(text, JAPANESE_RANGES)
+
+def japanese_stats(text):
+    """
+    日本語文字の数と、テキスト全体に対する比率を返す
+
+    Args:
+        text (str): 評価するテキスト
+
+    Returns:
+        tuple: (日本語文字数, 日本語比率)
+    """
+    count = japanese_char_count(text)
+    return count, count / max(len(text), 1)
+
+def main():
+    if len(sys.argv) < 2:
+        print("使用方法: python text_stats.py <テキストファイル> [--encoding=ENCODING]")
+        return
+
+    file_path = sys.argv[1]
+    encoding = 'utf-8'
+    for arg in sys.argv[2:]:
+        if arg.startswith("--encoding="):
+            encoding = arg.split("=")[1]
+
+    if not os.path.exists(file_path):
+        print(f"エラー: 指定されたファイル '{file_path}' が存在しません。")
+        return
+
+    with open(file_path, 'r', encoding=encoding, errors='ignore') as f:
+        text = f.read()
+
+    counts = char_class_counts(text)
+    total = max(counts['total'], 1)
+    print(f"ファイル: {file_path} (文字数: {counts['total']})")
+    for name in list(CHAR_CLASSES) + ['japanese', 'other']:
+        print(f"  {name}: {counts[name]} ({counts[name] / total:.2%})")
+
+if __name__ == "__main__":
+    main()
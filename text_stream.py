@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+import contextlib
+
+# 読み込み・書き込みのバッファサイズ
+STREAM_BUFFER_SIZE = 1024 * 1024
+
+def iter_file_lines(path, encoding='utf-8', errors='ignore'):
+    """
+    テキストファイルを先頭から一行ずつ読み込む（ファイル全体をメモリに読み込まない）
+
+    str.splitlines()と同じ規則で行を分割するため、content.splitlines()と同じ行が得られる
+
+    Args:
+        path (str): テキストファイルのパス
+        encoding (str): 入力ファイルのエンコーディング
+        errors (str): デコードエラーの扱い
+
+    Yields:
+        str: 改行文字を含まない行
+    """
+    with open(path, 'r', encoding=encoding, errors=errors, buffering=STREAM_BUFFER_SIZE) as f:
+        for line in f:
+            # 改行（\n）以外の区切り文字（\x0c や   など）でも分割する
+            yield from line.splitlines()
+
+def iter_file_blocks(path, encoding='utf-8', errors='ignore', size=STREAM_BUFFER_SIZE):
+    """
+    テキストファイルを一定の文字数ごとの断片として読み込む（断片の境界は行の途中になることがある）
+    """
+    with open(path, 'r', encoding=encoding, errors=errors) as f:
+        for block in iter(lambda: f.read(size), ''):
+            yield block
+
+@contextlib.contextmanager
+def open_replacing(path, encoding='utf-8'):
+    """
+    書き込み用に一時ファイル（path.tmp）を開き、ブロックが正常に終わった場合だけpathに置き換える
+    途中で例外が発生した場合は一時ファイルを削除し、pathには書きかけの内容を残さない
+
+    Args:
+        path (str): 出力先のパス
+        encoding (str): 出力エンコーディング
+
+    Yields:
+        書き込み用のファイルオブジェクト
+    """
+    temp_path = f"{path}.tmp"
+    try:
+        with open(temp_path, 'w', encoding=encoding, buffering=STREAM_BUFFER_SIZE) as f:
+            yield f
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+def write_joined(path, items, separator='\n', encoding='utf-8'):
+    """
+    文字列を区切り文字で連結しながらファイルに書き込む（separator.join(items)と同じ内容）
+    一時ファイルに書き込んでから置き換えるため、入力と同じファイルを出力先に指定できる
+
+    Args:
+        path (str): 出力先のパス
+        items: 書き込む文字列のイテラブル
+        separator (str): 区切り文字
+        encoding (str): 出力エンコーディング
+
+    Returns:
+        int: 書き込んだ要素の数
+    """
+    count = 0
+    with open_replacing(path, encoding) as f:
+        for item in items:
+            if count:
+                f.write(separator)
+            f.write(item)
+            count += 1
+    return count
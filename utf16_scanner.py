@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import re
+from functools import lru_cache
+
+# 日本語テキスト抽出（強化版）で日本語とみなすUTF-16コード単位
+JAPANESE_UNITS = (
+    '\u3040-\u309F'  # ひらがな
+    '\u30A0-\u30FF'  # カタカナ
+    '\u4E00-\u9FFF'  # 漢字
+    '\u3000\u3001\u3002\uFF01\uFF0C\uFF0E\uFF1A\uFF1F'
+    '\u2025\u2026\u301C\u303B\u30FB'  # 句読点など
+    '\uFF10-\uFF19'  # 全角数字
+    '\uFF21-\uFF3A'  # 全角英大文字
+    '\uFF41-\uFF5A'  # 全角英小文字
+)
+
+# 日本語の文章の繋がりとして取り込む記号・英数字
+CONNECTING_UNITS = (
+    '\u0020\u0009\u000A\u000D\u3000\u00A0\u0026'  # スペース、タブ、改行など
+    '0-9A-Za-z'  # 英数字
+    '.,:;()\\[\\]{}%/\u2019\u2026'  # 記号
+)
+
+# バイナリ直接抽出で取り込むUTF-16コード単位
+DIRECT_UNITS = (
+    '\u3040-\u309F'  # ひらがな
+    '\u30A0-\u30FF'  # カタカナ
+    '\u4E00-\u9FFF'  # 漢字
+    '\u3000\u3001\u3002\uFF01\uFF0C\uFF0E\uFF1A\uFF1F'  # 句読点など
+    '\u0020\u0009\u000A\u000D'  # スペース、タブ、改行
+)
+
+# チャンクに含まれている必要がある日本語文字
+JAPANESE_CHARS = 'ぁ-んァ-ヶ一-龠々〆〜'
+
+@lru_cache(maxsize=None)
+def run_pattern(units, min_length=1):
+    """
+    対象文字がmin_length文字以上連続する並び（ラン）を一度にまとめて検出するパターンを返す
+    漢字の範囲を含む文字クラスのコンパイルは重いため、初めて使う時点でコンパイルする
+    """
+    return re.compile(f'[{units}]{{{min_length},}}')
+
+def decode_utf16_units(content, unit_count):
+    """
+    バイト列の先頭から指定数のUTF-16LEコード単位を一括でデコードする
+    サロゲートは対象文字の範囲外なので、ペアが1文字にまとめられてもランの区切りは変わらない
+    """
+    return bytes(content[:unit_count * 2]).decode('utf-16le', errors='surrogatepass')
+
+def scan_japanese_chunks(content, min_length=16):
+    """
+    UTF-16LEとして格納された日本語テキストのチャンクを抽出する（強化版日本語特化処理用）
+
+    日本語文字・接続記号が連続する区間のうち、min_length文字以上で
+    日本語文字を含むものを出現順に返す
+
+    Args:
+        content (bytes): 解析するバイト列
+        min_length (int): チャンクとみなす最小文字数
+
+    Returns:
+        list: 抽出したチャンク文字列のリスト
+    """
+    # 従来の2バイト単位の走査と同じく、末尾のコード単位は対象外とする
+    text = decode_utf16_units(content, max((len(content) - 1) // 2, 0))
+    pattern = run_pattern(JAPANESE_UNITS + CONNECTING_UNITS, min_length)
+
+    return [chunk for chunk in pattern.findall(text) if run_pattern(JAPANESE_CHARS).search(chunk)]
+
+def scan_direct_chunks(content, min_length=11):
+    """
+    UTF-16LEの日本語文字と空白類をバイナリから直接抽出する（バイナリ解析用）
+
+    対象外の文字は読み飛ばして対象文字を蓄積し、蓄積した文字数が
+    min_length以上になった後で対象外の文字が現れた時点でチャンクとして区切る
+
+    Args:
+        content (bytes): 解析するバイト列
+        min_length (int): チャンクとして区切る最小文字数
+
+    Returns:
+        list: 抽出したチャンク文字列のリスト
+    """
+    text = decode_utf16_units(content, len(content) // 2)
+
+    chunks = []
+    current = []
+    current_length = 0
+    for match in run_pattern(DIRECT_UNITS).finditer(text):
+        run = match.group()
+        current.append(run)
+        current_length += len(run)
+        # ランの直後に対象外の文字があり、十分な長さが溜まっていれば区切る
+        if current_length >= min_length and match.end() < len(text):
+            chunks.append(''.join(current))
+            current = []
+            current_length = 0
+
+    if current_length >= min_length:
+        chunks.append(''.join(current))
+    return chunks
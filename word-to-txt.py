@@ -1,9 +1,8 @@
-import pypandoc
 import os
 import sys
-from docx import Document # python-docx
 import subprocess # subprocessモジュールをインポート
-import comtypes.client # comtypesを追加
+from optional_backends import import_backend # python-docxとcomtypesは使用する時点で読み込む
+from libreoffice_pool import find_soffice, pool_unavailable_reason, get_shared_pool
 # import comtypes.os_specific # LO_PATHの解決に使う可能性
 
 # LibreOfficeの実行ファイルパス (環境に合わせて調整が必要な場合がある)
@@ -54,8 +53,9 @@ def convert_doc_to_docx_comtypes(input_doc_path, output_docx_path):
             os.makedirs(output_dir)
 
         # LibreOfficeのCOMオブジェクトを取得/起動
+        comtypes_client = import_backend('comtypes.client')
         try:
-            desktop = comtypes.client.CreateObject("com.sun.star.frame.Desktop")
+            desktop = comtypes_client.CreateObject("com.sun.star.frame.Desktop")
         except OSError as e:
             print(f"エラー: LibreOfficeのCOMオブジェクトの作成に失敗しました。LibreOfficeが正しくインストールされ、COMコンポーネントが登録されているか確認してください。", file=sys.stderr)
             print(f"詳細: {e}", file=sys.stderr)
@@ -67,7 +67,7 @@ def convert_doc_to_docx_comtypes(input_doc_path, output_docx_path):
             #     import time
             #     time.sleep(10) # 起動待機（時間は調整が必要）
             #     try:
-            #         desktop = comtypes.client.CreateObject("com.sun.star.frame.Desktop")
+            #         desktop = comtypes_client.CreateObject("com.sun.star.frame.Desktop")
             #     except Exception as e2:
             #         print(f"エラー: LibreOffice起動後のCOMオブジェクト作成にも失敗しました: {e2}", file=sys.stderr)
             #         return False
@@ -81,8 +81,8 @@ def convert_doc_to_docx_comtypes(input_doc_path, output_docx_path):
         input_url = uno_path(abs_input_doc_path)
         # 読み込み専用、非表示で開く
         props = (
-            comtypes.client.PropertyValue(Name="ReadOnly", Value=True),
-            comtypes.client.PropertyValue(Name="Hidden", Value=True)
+            comtypes_client.PropertyValue(Name="ReadOnly", Value=True),
+            comtypes_client.PropertyValue(Name="Hidden", Value=True)
         )
         
         doc = desktop.loadComponentFromURL(input_url, "_blank", 0, props)
@@ -93,10 +93,10 @@ def convert_doc_to_docx_comtypes(input_doc_path, output_docx_path):
         # 保存するためのプロパティ
         output_url = uno_path(abs_output_docx_path)
         save_props = (
-            comtypes.client.PropertyValue(Name="FilterName", Value="Office Open XML Text"), # MS Word 2007-2013 XML (*.docx)
+            comtypes_client.PropertyValue(Name="FilterName", Value="Office Open XML Text"), # MS Word 2007-2013 XML (*.docx)
             # または "MS Word 2007 XML" など、LibreOfficeのバージョンや設定によって名前が違う可能性あり。
             # 正確なフィルター名は、LibreOfficeのマクロで確認するか、ドキュメントを参照。
-            comtypes.client.PropertyValue(Name="Overwrite", Value=True)
+            comtypes_client.PropertyValue(Name="Overwrite", Value=True)
         )
 
         doc.storeToURL(output_url, save_props)
@@ -157,8 +157,14 @@ def convert_doc_to_docx_libreoffice(input_doc_path, output_docx_path):
         if final_output_dir and not os.path.exists(final_output_dir):
             os.makedirs(final_output_dir)
 
+        # UNOが使える場合は常駐させたLibreOfficeで変換する（起動にかかる時間は最初の一回だけ）
+        if pool_unavailable_reason() is None:
+            get_shared_pool().convert(abs_input_doc_path, abs_output_docx_path)
+            print(f"DOCからDOCXへの変換成功(LibreOfficeワーカー): {abs_input_doc_path} -> {abs_output_docx_path}")
+            return True
+
         command = [
-            'C:\\\\Program Files\\\\LibreOffice\\\\program\\\\soffice.exe', # フルパス指定 (.exe)
+            find_soffice() or get_libreoffice_path() or 'soffice', # 環境変数・PATH・一般的なインストール場所から探す
             '--headless',
             '--invisible',
             '--convert-to', 'docx',
@@ -224,7 +230,7 @@ def convert_docx_to_txt(input_docx_path, output_txt_path):
             print(f"エラー: python-docxの入力ファイルが見つかりません: {abs_input_docx_path}", file=sys.stderr)
             return False
 
-        doc = Document(abs_input_docx_path)
+        doc = import_backend('docx').Document(abs_input_docx_path)
         full_text = []
         for para in doc.paragraphs:
             full_text.append(para.text)
@@ -8,14 +8,16 @@ import docx2txt
 import docx
 from pathlib import Path
 import re
+from ole_reader import read_doc_text_bytes
+from text_stats import count_ranges, WIDE_JAPANESE_RANGES
+from converter_backends import BackendRegistry
 
 def extract_text_from_binary(file_path, encoding='utf-8'):
     """
     バイナリファイルから直接テキストを抽出する
     """
-    # バイナリモードでファイルを開く
-    with open(file_path, 'rb') as f:
-        content = f.read()
+    # OLE2構造を解析し、テキストを含むWordDocumentストリームだけを読み込む
+    content = read_doc_text_bytes(file_path)
     
     # 複数のエンコーディングで試す
     encodings = ['utf-8', 'shift_jis', 'euc_jp', 'cp932']
@@ -27,7 +29,7 @@ def extract_text_from_binary(file_path, encoding='utf-8'):
             text = content.decode(enc, errors='ignore')
             
             # 日本語文字の割合を計算
-            jp_chars = len([c for c in text if '\u3040' <= c <= '\u30ff' or '\u4e00' <= c <= '\u9fff'])
+            jp_chars = count_ranges(text, WIDE_JAPANESE_RANGES)
             if len(text) > 0:
                 jp_ratio = jp_chars / len(text)
             else:
@@ -49,6 +51,33 @@ def extract_text_from_binary(file_path, encoding='utf-8'):
     
     return None
 
+def extract_text_with_python_docx(file_path):
+    """
+    python-docxで段落と表のセルのテキストを抽出する
+    """
+    doc = docx.Document(file_path)
+    full_text = []
+    for para in doc.paragraphs:
+        if para.text.strip():
+            full_text.append(para.text)
+    
+    for table in doc.tables:
+        for row in table.rows:
+            row_text = []
+            for cell in row.cells:
+                if cell.text.strip():
+                    row_text.append(cell.text)
+            if row_text:
+                full_text.append('\t'.join(row_text))
+    
+    return '\n'.join(full_text)
+
+# 変換方法の一覧（拡張子に対応し利用できるものを推定コストの小さい順に試し、バイナリ解析は最後に試す）
+BACKENDS = BackendRegistry()
+BACKENDS.add("docx2txt", docx2txt.process, ('.docx',), cost=0.05)
+BACKENDS.add("python-docx", extract_text_with_python_docx, ('.docx',), cost=0.2)
+BACKENDS.add("バイナリ解析", extract_text_from_binary, ('.doc', '.docx'), cost=0.2, fallback=True)
+
 def convert_doc_or_docx(file_path, output_path=None, encoding='utf-8'):
     """
     .doc/.docxファイルをテキストに変換する
@@ -61,56 +90,22 @@ def convert_doc_or_docx(file_path, output_path=None, encoding='utf-8'):
         print(f"変換中: {file_path}")
         print(f"出力先: {output_path}")
         
-        # ファイル拡張子を確認
-        is_docx = file_path.lower().endswith('.docx')
-        
-        # ファイルの処理
-        if is_docx:
-            # .docxファイルの処理
+        # 拡張子に対応する変換方法を順に試す
+        for backend in BACKENDS.candidates(os.path.splitext(file_path)[1]):
+            if backend.fallback:
+                print(f"{backend.name}による変換を試みます...")
             try:
-                text = docx2txt.process(file_path)
+                text = BACKENDS.run(backend, file_path)
+            except Exception as e:
+                print(f"{backend.name}での変換に失敗: {str(e)}")
+                continue
+            
+            if text is not None:
                 with open(output_path, 'w', encoding=encoding) as f:
                     f.write(text)
-                print("docx2txtで変換成功")
+                print(f"{backend.name}で変換成功")
                 return True
-            except Exception as e:
-                print(f"docx2txtでの変換に失敗: {str(e)}")
-                
-                try:
-                    doc = docx.Document(file_path)
-                    full_text = []
-                    for para in doc.paragraphs:
-                        if para.text.strip():
-                            full_text.append(para.text)
-                    
-                    for table in doc.tables:
-                        for row in table.rows:
-                            row_text = []
-                            for cell in row.cells:
-                                if cell.text.strip():
-                                    row_text.append(cell.text)
-                            if row_text:
-                                full_text.append('\t'.join(row_text))
-                    
-                    with open(output_path, 'w', encoding=encoding) as f:
-                        f.write('\n'.join(full_text))
-                    
-                    print("python-docxで変換成功")
-                    return True
-                except Exception as e2:
-                    print(f"python-docxでの変換に失敗: {str(e2)}")
-        
-        # .docファイルまたは.docxの処理が失敗した場合、バイナリからの直接抽出を試みる
-        print("バイナリ解析による変換を試みます...")
-        text = extract_text_from_binary(file_path)
-        
-        if text:
-            with open(output_path, 'w', encoding=encoding) as f:
-                f.write(text)
-            print("バイナリ解析による変換成功")
-            return True
-        else:
-            print("バイナリ解析でも有効なテキストが抽出できませんでした")
+            print(f"{backend.name}で有効なテキストが抽出できませんでした")
         
         return False
     
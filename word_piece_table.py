@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+import sys
+import re
+import struct
+from ole_reader import read_word_streams
+
+# FIBの識別子（Word 97以降）
+FIB_IDENT = 0xA5EC
+NFIB_WORD97 = 0xC1
+
+# CLX内のエントリ種別
+CLX_PRC = 0x01
+CLX_PCDT = 0x02
+
+# FibRgFcLcb97内でのfcClx/lcbClxの位置（8バイト単位の番号）
+FCLCB_CLX_INDEX = 33
+
+# 圧縮テキスト（8ビット）の0x80～0x9FはWindows-1252として解釈する
+CP1252_HIGH_TABLE = {}
+for _code in range(0x80, 0xA0):
+    try:
+        CP1252_HIGH_TABLE[_code] = bytes([_code]).decode('cp1252')
+    except UnicodeDecodeError:
+        pass
+
+# 段落記号やセル記号などWord固有の制御文字の置換表
+SPECIAL_CHAR_TABLE = {
+    0x0D: '\n',    # 段落記号
+    0x0B: '\n',    # 行区切り（Shift+Enter）
+    0x0C: '\n',    # ページ・セクション区切り
+    0x0E: '\n',    # 段区切り
+    0x07: '\n',    # セル・行の終了記号
+    0x1E: '-',     # 改行しないハイフン
+    0x1F: None,    # 任意指定のハイフン
+}
+# 上記以外の制御文字（図や脚注の参照記号など）は削除する
+for _code in range(0x20):
+    if _code not in SPECIAL_CHAR_TABLE and _code not in (0x09, 0x13, 0x14, 0x15):
+        SPECIAL_CHAR_TABLE[_code] = None
+
+def parse_fib(word_document):
+    """
+    WordDocumentストリームの先頭にあるFIBを解析する
+
+    Args:
+        word_document (bytes): WordDocumentストリーム
+
+    Returns:
+        dict: 本文の文字数（ccpText）とCLXの位置（fcClx, lcbClx）
+    """
+    if len(word_document) < 0x22:
+        raise Exception("WordDocumentストリームが短すぎます")
+
+    ident, nfib = struct.unpack_from('<HH', word_document, 0)
+    if ident != FIB_IDENT:
+        raise Exception("Word文書のFIBが見つかりません")
+    if nfib < NFIB_WORD97:
+        raise Exception(f"Word 97より古い形式はサポートしていません（nFib={nfib}）")
+
+    flags = struct.unpack_from('<H', word_document, 0x0A)[0]
+    if flags & 0x0100:
+        raise Exception("暗号化された文書です")
+
+    # FibBase(32バイト)の後ろに可変長のfibRgW, fibRgLw, fibRgFcLcbBlobが続く
+    offset = 32
+    csw = struct.unpack_from('<H', word_document, offset)[0]
+    offset += 2 + csw * 2
+    cslw = struct.unpack_from('<H', word_document, offset)[0]
+    rg_lw_offset = offset + 2
+    offset = rg_lw_offset + cslw * 4
+    cb_rg_fc_lcb = struct.unpack_from('<H', word_document, offset)[0]
+    rg_fc_lcb_offset = offset + 2
+
+    if cslw < 4 or cb_rg_fc_lcb <= FCLCB_CLX_INDEX:
+        raise Exception("FIBの構造が不正です")
+
+    ccp_text = struct.unpack_from('<i', word_document, rg_lw_offset + 3 * 4)[0]
+    fc_clx, lcb_clx = struct.unpack_from('<II', word_document, rg_fc_lcb_offset + FCLCB_CLX_INDEX * 8)
+
+    return {
+        'nfib': nfib,
+        'ccp_text': ccp_text,
+        'fc_clx': fc_clx,
+        'lcb_clx': lcb_clx,
+    }
+
+def parse_piece_table(table_stream, fc_clx, lcb_clx):
+    """
+    テーブルストリーム内のCLXからピーステーブル（PlcPcd）を取り出す
+
+    Returns:
+        list: (開始CP, 終了CP, ファイル位置, 圧縮フラグ) のリスト
+    """
+    clx = table_stream[fc_clx:fc_clx + lcb_clx]
+    if len(clx) != lcb_clx or lcb_clx == 0:
+        raise Exception("CLXがテーブルストリームの範囲外です")
+
+    # 先頭のPrc（書式情報）を読み飛ばしてPcdtを探す
+    pos = 0
+    while pos < len(clx) and clx[pos] == CLX_PRC:
+        cb_grpprl = struct.unpack_from('<h', clx, pos + 1)[0]
+        pos += 3 + cb_grpprl
+    if pos >= len(clx) or clx[pos] != CLX_PCDT:
+        raise Exception("ピーステーブル（Pcdt）が見つかりません")
+
+    lcb = struct.unpack_from('<I', clx, pos + 1)[0]
+    plc = clx[pos + 5:pos + 5 + lcb]
+    if len(plc) != lcb or (lcb - 4) % 12 != 0:
+        raise Exception("ピーステーブルのサイズが不正です")
+
+    # PlcPcdは (n+1)個のCPと n個の8バイトのPCDで構成される
+    count = (lcb - 4) // 12
+    cps = struct.unpack_from(f'<{count + 1}I', plc, 0)
+    pieces = []
+    for i in range(count):
+        fc_value = struct.unpack_from('<I', plc, (count + 1) * 4 + i * 8 + 2)[0]
+        compressed = bool(fc_value & 0x40000000)
+        fc = fc_value & 0x3FFFFFFF
+        if compressed:
+            fc //= 2
+        pieces.append((cps[i], cps[i + 1], fc, compressed))
+    return pieces
+
+def read_piece_text(word_document, pieces, cp_limit):
+    """
+    ピーステーブルに従って、WordDocumentストリームから本文の文字列を読み込む
+    （WordDocumentストリームはbytesまたはmemoryview。各ピースの範囲だけをデコードする）
+    """
+    parts = []
+    for cp_start, cp_end, fc, compressed in pieces:
+        if cp_start >= cp_limit:
+            break
+        length = min(cp_end, cp_limit) - cp_start
+        if length <= 0:
+            continue
+        if compressed:
+            data = word_document[fc:fc + length]
+            parts.append(str(data, 'latin-1').translate(CP1252_HIGH_TABLE))
+        else:
+            data = word_document[fc:fc + length * 2]
+            parts.append(str(data, 'utf-16le', 'ignore'))
+    return ''.join(parts)
+
+def remove_field_codes(text):
+    """
+    フィールド（0x13 命令 0x14 結果 0x15）から命令部分を取り除き、結果だけを残す
+    """
+    if '\x13' not in text:
+        return text
+
+    result = []
+    # 各フィールドについて「命令部分の途中かどうか」をスタックで管理する
+    stack = []
+    for segment in re.split(r'([\x13\x14\x15])', text):
+        if segment == '\x13':
+            stack.append(True)
+        elif segment == '\x14':
+            if stack:
+                stack[-1] = False
+        elif segment == '\x15':
+            if stack:
+                stack.pop()
+        elif not any(stack):
+            result.append(segment)
+    return ''.join(result)
+
+def extract_text_from_piece_table(doc_path):
+    """
+    FIBとCLX（ピーステーブル）を解析して、.docファイルの本文テキストを抽出する
+    エンコーディングの推測を行わず、各ピースを圧縮cp1252またはUTF-16LEとして正確な位置から読み込む
+
+    Args:
+        doc_path (str): .docファイルのパス
+
+    Returns:
+        str: 抽出した本文テキスト
+    """
+    word_document, table_stream = read_word_streams(doc_path)
+    if not table_stream:
+        raise Exception("テーブルストリーム（0Table/1Table）が見つかりません")
+
+    fib = parse_fib(word_document)
+    pieces = parse_piece_table(table_stream, fib['fc_clx'], fib['lcb_clx'])
+    text = read_piece_text(word_document, pieces, fib['ccp_text'])
+
+    text = remove_field_codes(text)
+    text = text.translate(SPECIAL_CHAR_TABLE)
+    # 行末の空白と連続した空行を整理
+    text = re.sub(r'[ \t　]+\n', '\n', text)
+    text = re.sub(r'\n{3,}', '\n\n', text)
+    return text.strip()
+
+def main():
+    if len(sys.argv) < 2:
+        print("使用方法: python word_piece_table.py <docファイル> [出力ファイル]")
+        return
+
+    doc_path = sys.argv[1]
+    if not os.path.exists(doc_path):
+        print(f"エラー: 指定されたファイル '{doc_path}' が存在しません。")
+        return
+
+    text = extract_text_from_piece_table(doc_path)
+    if len(sys.argv) > 2:
+        with open(sys.argv[2], 'w', encoding='utf-8') as f:
+            f.write(text)
+        print(f"変換完了: {sys.argv[2]}")
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
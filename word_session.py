@@ -0,0 +1,231 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+import os
+import sys
+import zipfile
+import contextlib
+from optional_backends import import_backend
+
+# この数の文書を開いたらWordを起動し直す（長時間の使用によるメモリ使用量の増加や不安定化を避ける）
+DEFAULT_RECYCLE_AFTER = 50
+
+# SaveAs2で.docx形式を指定する値（wdFormatXMLDocument）
+WD_FORMAT_DOCX = 16
+
+class WordSession:
+    """
+    Word.Applicationを一つ保持し、複数の文書で使い回す
+
+    Wordは最初に文書を開く時点で起動し、recycle_after個の文書を開いた後と、文書の処理中にエラーが発生した後に
+    終了する（次の文書を開く時点で起動し直す）。変換するプロセス（またはスレッド）ごとに一つ作成して使う
+    """
+
+    def __init__(self, recycle_after=DEFAULT_RECYCLE_AFTER):
+        """
+        Args:
+            recycle_after (int): Wordを起動し直すまでに開く文書の数
+        """
+        self.recycle_after = max(recycle_after, 1)
+        self.app = None
+        # 現在のWordで開いた文書の数と、Wordを起動した回数
+        self.documents = 0
+        self.launches = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _launch(self):
+        """Word.Applicationを起動する（FakeWordSessionで置き換える）"""
+        app = import_backend('win32com.client').DispatchEx("Word.Application")
+        app.Visible = False
+        app.DisplayAlerts = False
+        return app
+
+    def application(self):
+        """
+        Word.Applicationを返す（起動していない場合は起動する）
+        """
+        if self.app is None:
+            self.app = self._launch()
+            self.launches += 1
+            self.documents = 0
+        return self.app
+
+    @contextlib.contextmanager
+    def open_document(self, path, read_only=True):
+        """
+        文書を開き、処理が終わったら保存せずに閉じる
+
+        Args:
+            path (str): 文書のパス
+            read_only (bool): 読み取り専用で開くかどうか
+
+        Yields:
+            Wordの文書オブジェクト
+        """
+        app = self.application()
+        doc = None
+        failed = False
+        try:
+            doc = app.Documents.Open(os.path.abspath(path), ReadOnly=read_only)
+            self.documents += 1
+            yield doc
+        except Exception:
+            failed = True
+            raise
+        finally:
+            if doc is not None:
+                try:
+                    doc.Close(SaveChanges=False)
+                except Exception:
+                    failed = True
+            # エラーが発生した場合と、開いた文書の数が上限に達した場合は、次の文書の前にWordを起動し直す
+            if failed or self.documents >= self.recycle_after:
+                self.recycle()
+
+    def get_text(self, path):
+        """
+        文書の本文のテキストを返す（段落の区切りは\\r）
+        """
+        with self.open_document(path) as doc:
+            return doc.Content.Text
+
+    def save_as_docx(self, path, docx_path):
+        """
+        文書を.docx形式でdocx_pathに保存する
+        """
+        with self.open_document(path) as doc:
+            doc.SaveAs2(os.path.abspath(docx_path), FileFormat=WD_FORMAT_DOCX)
+        return docx_path
+
+    def recycle(self):
+        """
+        Wordを終了する（次に文書を開く時点で起動し直す）
+        """
+        if self.app is not None:
+            try:
+                self.app.Quit()
+            except Exception:
+                pass
+            self.app = None
+
+    def close(self):
+        self.recycle()
+
+@contextlib.contextmanager
+def session_scope(session=None):
+    """
+    sessionを使う（Noneの場合は一時的なセッションを作成し、終わったらWordを終了する）
+    """
+    if session is not None:
+        yield session
+        return
+    session = WordSession()
+    try:
+        yield session
+    finally:
+        session.close()
+
+# プロセスプールのワーカーで使うセッション（ワーカーごとに一つ）
+_worker_session = None
+
+def worker_session():
+    """
+    このプロセスで使い回すセッションを返す（プロセスの終了時にWordを終了する）
+    """
+    global _worker_session
+    if _worker_session is None:
+        _worker_session = WordSession()
+        # ProcessPoolExecutorのワーカーはatexitを実行せずに終了するため、multiprocessingの終了処理に登録する
+        from multiprocessing import util
+        util.Finalize(None, _worker_session.close, exitpriority=10)
+    return _worker_session
+
+class _FakeDocument:
+    def __init__(self, session, path, text):
+        self.session = session
+        self.path = path
+        self.Content = type('Content', (), {'Text': text})()
+
+    def SaveAs2(self, path, FileFormat=WD_FORMAT_DOCX):
+        # 段落ごとにw:pを持つ最小限の.docxを書き込む
+        # （xml.sax.saxutilsはurllibなどを読み込み起動が遅くなるため、使う時点で読み込む）
+        from xml.sax.saxutils import escape
+        paragraphs = ''.join(f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>'
+                             for line in self.Content.Text.split('\r') if line)
+        with zipfile.ZipFile(path, 'w') as package:
+            package.writestr('word/document.xml',
+                             '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                             '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                             f'<w:body>{paragraphs}</w:body></w:document>')
+        self.session.saved.append(path)
+
+    def Close(self, SaveChanges=False):
+        pass
+
+class _FakeApplication:
+    def __init__(self, session):
+        self.session = session
+        self.Documents = self
+
+    def Open(self, path, ReadOnly=True):
+        self.session.opened.append(path)
+        text = self.session.texts.get(path)
+        if text is None:
+            raise Exception(f"文書を開けませんでした: {path}")
+        return _FakeDocument(self.session, path, text)
+
+    def Quit(self):
+        self.session.quits += 1
+
+class FakeWordSession(WordSession):
+    """
+    Wordを起動せずにWordSessionと同じ操作を行うセッション（Word COMのない環境での動作確認用）
+
+    textsに登録したパスの文書だけを開くことができ、それ以外のパスはWordのエラーと同じく例外を送出する
+    """
+
+    def __init__(self, texts=None, recycle_after=DEFAULT_RECYCLE_AFTER):
+        """
+        Args:
+            texts (dict): 文書の絶対パス → Content.Textとして返すテキスト（段落の区切りは\\r）
+            recycle_after (int): 起動し直すまでに開く文書の数
+        """
+        super().__init__(recycle_after)
+        self.texts = {os.path.abspath(path): text for path, text in (texts or {}).items()}
+        # 開いた文書・保存したファイルのパスと、終了した回数
+        self.opened = []
+        self.saved = []
+        self.quits = 0
+
+    def _launch(self):
+        return _FakeApplication(self)
+
+def main():
+    if len(sys.argv) < 2:
+        print("使用方法: python word_session.py <Word文書> [<Word文書> ...] [--recycle=N]")
+        print("  一つのWordで各文書を開き、テキストの文字数と起動した回数を表示する")
+        return
+
+    recycle_after = DEFAULT_RECYCLE_AFTER
+    files = []
+    for arg in sys.argv[1:]:
+        if arg.startswith("--recycle="):
+            recycle_after = int(arg.split("=")[1])
+        else:
+            files.append(arg)
+
+    with WordSession(recycle_after) as session:
+        for path in files:
+            try:
+                print(f"{path}: {len(session.get_text(path))}文字")
+            except Exception as e:
+                print(f"{path}: 失敗 - {str(e)}")
+        print(f"Wordの起動回数: {session.launches}")
+
+if __name__ == "__main__":
+    main()
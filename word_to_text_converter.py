@@ -4,8 +4,6 @@
 import os
 import sys
 import glob
-import docx
-import win32com.client
 import tempfile
 import shutil
 import subprocess
@@ -14,73 +12,138 @@ import platform
 import re
 from pathlib import Path
 import codecs
-import docx2txt
-import struct
 import binascii
 import traceback
+import io
+import contextlib
+import zipfile
+import importlib.util
+from optional_backends import import_backend, is_backend_available, disabled_backends
+from converter_backends import BackendRegistry
+from word_session import WordSession, session_scope, worker_session
+from ole_reader import read_doc_text_bytes, shared_document
+from word_piece_table import extract_text_from_piece_table
+from utf16_scanner import scan_japanese_chunks, scan_direct_chunks
+from chunk_index import unique_chunks
+from text_stats import japanese_stats
+from postprocess import apply_postprocess, parse_stages, stages_key, POSTPROCESS_STAGES
+from text_stream import open_replacing
+from docx_stream import DocxPackage, extract_docx_text, write_docx_text, parse_sections, SECTIONS
+from conversion_manifest import ConversionManifest, file_sha256
+from extraction_cache import ExtractionCache, DEFAULT_CACHE_PATH, DEFAULT_MAX_BYTES
 
-def convert_docx_to_text(docx_path, output_path=None):
+# .docの変換方法の結果を採用する基準（この基準を満たした時点で以降の方法は試さない）
+ACCEPT_JP_RATIO = 0.05    # 日本語文字の最小比率
+ACCEPT_MIN_LENGTH = 100   # 最小文字数
+
+# .docの変換方法の一覧（各変換方法に付けたデコレータで登録する）
+# 変換時は利用できる方法だけを優先順位の順に試し、同じ優先順位の中では推定コスト（処理時間の実測値の移動平均）の小さい順に試す
+# 優先順位: 0 = 文書の構造の解析、1 = Word自身による抽出、2 = 外部ツールによる抽出
+# バイト列から文字らしい部分を拾うだけの方法は、結果の質を判定できないため最終手段として最後に試す
+DOC_BACKENDS = BackendRegistry()
+
+def write_text_file(output_path, text, encoding='utf-8'):
+    """
+    抽出したテキストをファイルに書き込む
+    
+    Args:
+        output_path (str): 出力先のパス
+        text (str): 書き込むテキスト
+        encoding (str): 出力エンコーディング
+    
+    Returns:
+        str: 書き込んだファイルのパス
+    """
+    with open(output_path, 'w', encoding=encoding, errors='ignore') as f:
+        f.write(text)
+    return output_path
+
+def convert_docx_to_text(docx_path, output_path=None, details=None, cache=None, sections=None, postprocess=None):
     """
     .docxファイルをテキストファイルに変換する
     
     Args:
         docx_path (str): 変換するdocxファイルのパス
         output_path (str, optional): 出力先のパス。指定がない場合は同じ場所に.txtファイルを作成
+        details (dict, optional): 指定した場合は採用した変換方法（'method'）を格納する
+        cache (ExtractionCache, optional): 指定した場合は同じ内容のファイルの抽出結果を再利用する
+        sections (tuple, optional): 抽出するセクション（ヘッダー・本文・脚注など）。指定がない場合はヘッダー・本文・フッター
+        postprocess (tuple, optional): 書き込む前にメモリ上で適用する後処理の名前（postprocess.POSTPROCESS_STAGES）
     
     Returns:
         str: 作成されたテキストファイルのパス
     """
+    if details is None:
+        details = {}
+    variant = 'docx' if sections is None else f"docx:{','.join(sections)}"
+    if postprocess:
+        # 後処理を適用した結果をキャッシュするため、後処理ごとにキャッシュを分ける
+        variant += f"|{stages_key(postprocess)}"
+    
     try:
         # 出力パスが指定されていない場合は入力ファイルと同じ場所に.txtを作成
         if output_path is None:
             output_path = str(Path(docx_path).with_suffix('.txt'))
         
-        # docx2txtを使用してテキスト抽出を試みる
-        try:
-            text = docx2txt.process(docx_path)
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(text)
-            return output_path
-        except Exception as e1:
-            print(f"docx2txtでの変換に失敗しました（{docx_path}）: {str(e1)}")
-            print("python-docxでの変換を試みます...")
-        
-        # python-docxを使用して抽出を試みる
-        doc = docx.Document(docx_path)
+        # 同じ内容のファイルを変換済みであれば、キャッシュの結果を書き込む
+        digest = None
+        if cache is not None:
+            digest = file_sha256(docx_path)
+            cached = cache.get(digest, variant)
+            if cached is not None:
+                write_text_file(output_path, cached['text'], cached['encoding'])
+                details.update(method=cached['method'], cached=True)
+                print(f"キャッシュから変換結果を取得しました（{cached['method']}）: {docx_path}")
+                return output_path
         
-        # テキストを抽出
-        full_text = []
-        for para in doc.paragraphs:
-            if para.text.strip():  # 空の段落を無視
-                full_text.append(para.text)
+        # ZIPパッケージは一度だけ開き、テキスト抽出と段落・表の抽出で共有する
+        try:
+            package = DocxPackage(docx_path)
+        except (zipfile.BadZipFile, FileNotFoundError):
+            print(f"変換エラー（{docx_path}）: ファイルが見つからないか、正しいWord文書形式ではありません。")
+            return None
         
-        # テーブルからもテキストを抽出
-        for table in doc.tables:
-            for row in table.rows:
-                row_text = []
-                for cell in row.cells:
-                    if cell.text.strip():  # 空のセルを無視
-                        row_text.append(cell.text)
-                if row_text:  # 空の行を無視
-                    full_text.append('\t'.join(row_text))
+        with package:
+            # 指定したセクションのパートを一度ずつ先頭から読み込んでテキストを抽出する
+            try:
+                details['method'] = "XMLストリーム解析"
+                if cache is None and not postprocess:
+                    # 文書全体をメモリに保持せずにファイルへ書き込む
+                    # （途中で失敗した場合に書きかけの.txtを残さないよう、一時ファイルに書き込んでから置き換える）
+                    with open_replacing(output_path) as f:
+                        write_docx_text(package, f, sections)
+                else:
+                    text = apply_postprocess(extract_docx_text(package, sections), postprocess)
+                    write_text_file(output_path, text)
+                    if cache is not None:
+                        cache.put(digest, variant, text, details['method'])
+                return output_path
+            except Exception as e1:
+                print(f"XMLストリーム解析での変換に失敗しました（{docx_path}）: {str(e1)}")
+                print("段落と表の構造からの抽出を試みます...")
+            
+            # 段落と表のセル（空でないものをタブ区切り）を抽出
+            text = apply_postprocess('\n'.join(package.structured_lines()), postprocess)
         
         # テキストファイルに書き込む
         with open(output_path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(full_text))
+            f.write(text)
         
+        details['method'] = "段落・表の構造解析"
+        if cache is not None:
+            cache.put(digest, variant, text, details['method'])
         return output_path
     
     except PermissionError:
         print(f"変換エラー（{docx_path}）: ファイルにアクセスする権限がありません。ファイルが開かれていないか確認してください。")
         return None
-    except docx.opc.exceptions.PackageNotFoundError:
-        print(f"変換エラー（{docx_path}）: ファイルが見つからないか、正しいWord文書形式ではありません。")
-        return None
     except Exception as e:
         print(f"変換エラー（{docx_path}）: {str(e)}")
         return None
 
-def convert_doc_to_text(doc_path, output_path=None, force_utf8=False, use_sjis=False):
+def convert_doc_to_text(doc_path, output_path=None, force_utf8=False, use_sjis=False,
+                        exhaustive=False, accept_jp_ratio=ACCEPT_JP_RATIO, accept_min_length=ACCEPT_MIN_LENGTH,
+                        details=None, cache=None, postprocess=None, word_session=None, cancel=None, on_method=None):
     """
     古い形式の.docファイルをテキストファイルに変換する
     
@@ -89,32 +152,80 @@ def convert_doc_to_text(doc_path, output_path=None, force_utf8=False, use_sjis=F
         output_path (str, optional): 出力先のパス。指定がない場合は同じ場所に.txtファイルを作成
         force_utf8 (bool): UTF-8エンコーディングを優先的に使用するかどうか
         use_sjis (bool): Shift-JISエンコーディングを優先的に使用するかどうか
+        exhaustive (bool): Trueの場合はすべての変換方法を試し、結果を比較して最適なものを選ぶ
+        accept_jp_ratio (float): 結果を採用して以降の方法を打ち切る日本語文字の最小比率
+        accept_min_length (int): 結果を採用して以降の方法を打ち切る最小文字数
+        details (dict, optional): 指定した場合は採用した変換方法（'method'）と日本語比率（'jp_ratio'）、
+            試した変換方法ごとの処理時間と結果（'attempts'、{'method', 'seconds', 'result'}のリスト）を格納する
+        cache (ExtractionCache, optional): 指定した場合は同じ内容のファイルの抽出結果を再利用する
+        postprocess (tuple, optional): 書き込む前にメモリ上で適用する後処理の名前（postprocess.POSTPROCESS_STAGES）
+        word_session (WordSession, optional): Wordを使う変換方法で使い回すセッション（Noneの場合はこのファイルの間だけ作成する）
+        cancel (threading.Event など, optional): is_set()がTrueになると、実行中の変換方法が終わった時点で中断する
+        on_method (callable, optional): 変換方法を一つ試すたびに、detailsの'attempts'と同じ辞書を受け取る関数
     
     Returns:
-        str: 作成されたテキストファイルのパス
+        str: 作成されたテキストファイルのパス（キャンセルされた場合はNoneを返し、detailsの'cancelled'をTrueにする）
     """
+    if details is None:
+        details = {}
+    
+    # 変換方法ごとにファイルを読み込み直さないよう、メモリマップを一度だけ作成して共有する
+    document = contextlib.ExitStack()
     try:
         # 出力パスが指定されていない場合は入力ファイルと同じ場所に.txtを作成
         if output_path is None:
             output_path = str(Path(doc_path).with_suffix('.txt'))
         
+        # 変換オプションによって結果が変わるため、オプションごとにキャッシュを分ける
+        mode = 'sjis' if use_sjis else 'utf8' if force_utf8 else 'cascade'
+        threshold = 'exhaustive' if exhaustive else f"{accept_jp_ratio}:{accept_min_length}"
+        variant = f"doc:{mode}:{threshold}"
+        if postprocess:
+            variant += f"|{stages_key(postprocess)}"
+        digest = None
+        if cache is not None:
+            digest = file_sha256(doc_path)
+            cached = cache.get(digest, variant)
+            if cached is not None:
+                write_text_file(output_path, cached['text'], cached['encoding'])
+                details.update(method=cached['method'], jp_ratio=cached['jp_ratio'], cached=True)
+                print(f"キャッシュから変換結果を取得しました（{cached['method']}）: {doc_path}")
+                return output_path
+        
+        try:
+            document.enter_context(shared_document(doc_path))
+        except OSError as e:
+            print(f"ファイルのメモリマップに失敗しました。変換方法ごとに読み込みます: {str(e)}")
+        
+        # Wordを使う変換方法が一つのWordを使い回すよう、セッションの指定がなければこのファイルの間だけ作成する
+        # （Wordは最初に使われた時点で起動する）
+        session = word_session
+        if session is None:
+            session = document.enter_context(WordSession())
+        
+        def save_result(text, method, jp_ratio, encoding='utf-8'):
+            """最終テキストに後処理を適用して一度だけ出力し、結果をキャッシュに保存する"""
+            text = apply_postprocess(text, postprocess)
+            write_text_file(output_path, text, encoding)
+            details.update(method=method, jp_ratio=jp_ratio)
+            if cache is not None:
+                cache.put(digest, variant, text, method, jp_ratio, encoding)
+        
         # Shift-JIS優先モードの場合
         if use_sjis:
             print(f"Shift-JIS優先モードで変換を試みます（{doc_path}）...")
             try:
-                # バイナリモードでファイルを開く
-                with open(doc_path, 'rb') as f:
-                    content = f.read()
+                # OLE2構造を解析し、テキストを含むWordDocumentストリームだけを読み込む
+                content = read_doc_text_bytes(doc_path)
                 
                 # Shift-JISでデコードを試みる
                 try:
-                    text = content.decode('shift_jis', errors='ignore')
+                    text = str(content, 'shift_jis', 'ignore')
                     
                     # 日本語文字が含まれているか確認
-                    jp_chars = re.findall(r'[ぁ-んァ-ヶ一-龠々〆〜]', text)
-                    jp_ratio = len(jp_chars) / max(len(text), 1)
+                    jp_count, jp_ratio = japanese_stats(text)
                     
-                    print(f"  Shift-JISデコード: テキスト長={len(text)}, 日本語文字数={len(jp_chars)}, 比率={jp_ratio:.2%}")
+                    print(f"  Shift-JISデコード: テキスト長={len(text)}, 日本語文字数={jp_count}, 比率={jp_ratio:.2%}")
                     
                     # 不要なバイナリデータやノイズを除去
                     text = re.sub(r'[^\x20-\x7E\u3000-\u30FF\u4E00-\u9FFF\u3040-\u309F\uFF00-\uFF9F\u2000-\u206F\n]+', '', text)
@@ -124,8 +235,7 @@ def convert_doc_to_text(doc_path, output_path=None, force_utf8=False, use_sjis=F
                     text = re.sub(r'<[^>]+>', '', text)
                     
                     # テキストファイルに書き込む
-                    with open(output_path, 'w', encoding='shift_jis', errors='ignore') as out_file:
-                        out_file.write(text)
+                    save_result(text, "Shift-JIS", jp_ratio, 'shift_jis')
                     
                     print(f"Shift-JISによる変換完了: {output_path}")
                     return output_path
@@ -134,13 +244,12 @@ def convert_doc_to_text(doc_path, output_path=None, force_utf8=False, use_sjis=F
                 
                 # cp932（Windows版Shift-JIS）での処理
                 try:
-                    text = content.decode('cp932', errors='ignore')
+                    text = str(content, 'cp932', 'ignore')
                     
                     # 日本語文字が含まれているか確認
-                    jp_chars = re.findall(r'[ぁ-んァ-ヶ一-龠々〆〜]', text)
-                    jp_ratio = len(jp_chars) / max(len(text), 1)
+                    jp_count, jp_ratio = japanese_stats(text)
                     
-                    print(f"  CP932デコード: テキスト長={len(text)}, 日本語文字数={len(jp_chars)}, 比率={jp_ratio:.2%}")
+                    print(f"  CP932デコード: テキスト長={len(text)}, 日本語文字数={jp_count}, 比率={jp_ratio:.2%}")
                     
                     # 不要なバイナリデータやノイズを除去
                     text = re.sub(r'[^\x20-\x7E\u3000-\u30FF\u4E00-\u9FFF\u3040-\u309F\uFF00-\uFF9F\u2000-\u206F\n]+', '', text)
@@ -150,8 +259,7 @@ def convert_doc_to_text(doc_path, output_path=None, force_utf8=False, use_sjis=F
                     text = re.sub(r'<[^>]+>', '', text)
                     
                     # テキストファイルに書き込む
-                    with open(output_path, 'w', encoding='shift_jis', errors='ignore') as out_file:
-                        out_file.write(text)
+                    save_result(text, "CP932", jp_ratio, 'shift_jis')
                     
                     print(f"CP932による変換完了: {output_path}")
                     return output_path
@@ -167,18 +275,16 @@ def convert_doc_to_text(doc_path, output_path=None, force_utf8=False, use_sjis=F
         elif force_utf8:
             print(f"UTF-8優先モードで変換を試みます（{doc_path}）...")
             try:
-                # バイナリモードでファイルを開く
-                with open(doc_path, 'rb') as f:
-                    content = f.read()
+                # OLE2構造を解析し、テキストを含むWordDocumentストリームだけを読み込む
+                content = read_doc_text_bytes(doc_path)
                 
                 # UTF-8でデコードを試みる
-                text = content.decode('utf-8', errors='ignore')
+                text = str(content, 'utf-8', 'ignore')
                 
                 # 日本語文字が含まれているか確認
-                jp_chars = re.findall(r'[ぁ-んァ-ヶ一-龠々〆〜]', text)
-                jp_ratio = len(jp_chars) / max(len(text), 1)
+                jp_count, jp_ratio = japanese_stats(text)
                 
-                print(f"  UTF-8デコード: テキスト長={len(text)}, 日本語文字数={len(jp_chars)}, 比率={jp_ratio:.2%}")
+                print(f"  UTF-8デコード: テキスト長={len(text)}, 日本語文字数={jp_count}, 比率={jp_ratio:.2%}")
                 
                 # 不要なバイナリデータやノイズを除去
                 text = re.sub(r'[^\x20-\x7E\u3000-\u30FF\u4E00-\u9FFF\u3040-\u309F\uFF00-\uFF9F\u2000-\u206F\n]+', '', text)
@@ -188,8 +294,7 @@ def convert_doc_to_text(doc_path, output_path=None, force_utf8=False, use_sjis=F
                 text = re.sub(r'<[^>]+>', '', text)
                 
                 # テキストファイルに書き込む
-                with open(output_path, 'w', encoding='utf-8') as out_file:
-                    out_file.write(text)
+                save_result(text, "UTF-8", jp_ratio)
                 
                 print(f"UTF-8による変換完了: {output_path}")
                 return output_path
@@ -197,51 +302,70 @@ def convert_doc_to_text(doc_path, output_path=None, force_utf8=False, use_sjis=F
                 print(f"UTF-8での変換に失敗: {str(e)}")
                 print("通常の変換処理を続行します...")
         
-        # 複数の変換方法を順番に試す（優先度順）
-        methods = [
-            (extract_text_with_word_com_direct, "Word COMでの直接抽出"),
-            (extract_japanese_text_enhanced, "強化版日本語特化処理"),
-            (extract_text_doc_to_docx, "docからdocxへの変換を経由"),
-            (extract_text_with_antiword, "antiwordを使用"),
-            (extract_text_with_binary_parsing, "バイナリ解析")
-        ]
+        # 登録された変換方法のうち、この環境で利用できるものを優先順位（同じ優先順位の中では推定コスト）の順に試す
+        # 各関数は抽出したテキストを返し、一時ファイルは作成しない
+        for backend, reason in DOC_BACKENDS.skipped('.doc'):
+            print(f"{backend.name}は利用できないためスキップします（{reason}）")
         
         all_extracted_texts = []
-        for extract_func, method_name in methods:
+        attempts = details.setdefault('attempts', [])
+        for backend in DOC_BACKENDS.candidates('.doc'):
+            method_name = backend.name
+            if cancel is not None and cancel.is_set():
+                print(f"変換がキャンセルされました（{doc_path}）")
+                details.update(cancelled=True)
+                return None
+            # 変換方法ごとの処理時間と結果（'accepted' / 'candidate' / 'rejected' / 'empty' / 'error'）を記録する
+            start = time.perf_counter()
+            result = 'error'
             try:
                 print(f"{method_name}での変換を試みます（{doc_path}）...")
-                temp_output = f"{output_path}.temp_{method_name.replace(' ', '_')}.txt"
                 
-                # 抽出関数を実行
-                extract_func(doc_path, temp_output)
+                # 抽出関数を実行（処理時間を推定コストに反映する）
+                text = DOC_BACKENDS.run(backend, doc_path, session=session)
                 
                 # 結果を確認
-                if os.path.exists(temp_output):
-                    with open(temp_output, 'r', encoding='utf-8', errors='ignore') as f:
-                        text = f.read()
+                if text:
+                    # 改行コードを統一（Word COMなどは段落区切りに\rを返す）
+                    text = text.replace('\r\n', '\n').replace('\r', '\n')
                     
                     # 有効な日本語テキストかどうかをチェック
-                    jp_chars = re.findall(r'[ぁ-んァ-ヶ一-龠々〆〜]', text)
-                    jp_ratio = len(jp_chars) / max(len(text), 1)
+                    jp_count, jp_ratio = japanese_stats(text)
                     
-                    print(f"  {method_name}: テキスト長={len(text)}, 日本語文字数={len(jp_chars)}, 比率={jp_ratio:.2%}")
+                    print(f"  {method_name}: テキスト長={len(text)}, 日本語文字数={jp_count}, 比率={jp_ratio:.2%}")
+                    
+                    # 採用基準（--accept-ratio / --accept-length）は候補の基準とは別に判定する
+                    # （採用基準が候補の基準より緩い場合も、採用基準を満たした結果は候補にする）
+                    acceptable = len(text) >= accept_min_length and jp_ratio >= accept_jp_ratio
                     
                     # 十分な長さと日本語比率があれば保存
-                    if len(text) > 100 and jp_ratio > 0.05:
-                        all_extracted_texts.append((text, jp_ratio, method_name, temp_output))
+                    if acceptable or (len(text) > 100 and jp_ratio > 0.05):
+                        all_extracted_texts.append((text, jp_ratio, method_name))
+                        result = 'candidate'
+                        # 採用基準を満たしていれば、残りの（より重い）方法は試さない
+                        if acceptable and not exhaustive:
+                            result = 'accepted'
+                            print(f"  {method_name}: 採用基準を満たしたため、残りの変換方法をスキップします")
+                            break
                     else:
+                        result = 'rejected'
                         print(f"  {method_name}: 十分な日本語テキストが含まれていません")
-                        os.remove(temp_output)
                 else:
-                    print(f"  {method_name}: 出力ファイルが生成されませんでした")
+                    result = 'empty'
+                    print(f"  {method_name}: テキストが抽出されませんでした")
             except Exception as e:
                 print(f"  {method_name}での変換に失敗: {str(e)}")
+            finally:
+                attempt = {'method': method_name, 'seconds': time.perf_counter() - start, 'result': result}
+                attempts.append(attempt)
+                if on_method is not None:
+                    on_method(attempt)
         
         # 結果を評価して最適なものを選択
         if all_extracted_texts:
             # 日本語比率とテキスト長で並べ替え
             all_extracted_texts.sort(key=lambda x: (x[1], len(x[0])), reverse=True)
-            best_text, best_ratio, best_method, best_temp = all_extracted_texts[0]
+            best_text, best_ratio, best_method = all_extracted_texts[0]
             
             print(f"最適な変換結果: {best_method} (日本語比率: {best_ratio:.2%}, 文字数: {len(best_text)})")
             
@@ -255,39 +379,49 @@ def convert_doc_to_text(doc_path, output_path=None, force_utf8=False, use_sjis=F
             # 連続した空行を整理
             processed_text = re.sub(r'\n{3,}', '\n\n', processed_text)
             
-            # 最終テキストを出力
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(processed_text)
-            
-            # 一時ファイルを削除
-            for _, _, _, temp_file in all_extracted_texts:
-                try:
-                    if os.path.exists(temp_file):
-                        os.remove(temp_file)
-                except:
-                    pass
+            # 最終テキストだけを一度だけ出力
+            save_result(processed_text, best_method, best_ratio)
             
             print(f"変換完了: {output_path}")
             return output_path
+        elif cancel is not None and cancel.is_set():
+            print(f"変換がキャンセルされました（{doc_path}）")
+            details.update(cancelled=True)
+            return None
         else:
             # すべての方法が失敗した場合は最終手段としてバイナリデータから直接抽出
             print("すべての方法が失敗したため、バイナリデータから直接抽出します...")
-            return extract_japanese_text_enhanced(doc_path, output_path)
+            text = get_japanese_text_enhanced(doc_path, session)
+            save_result(text, "強化版日本語特化処理（最終手段）", None)
+            print(f"日本語テキスト抽出完了: {output_path}")
+            return output_path
     
     except Exception as e:
         print(f"変換エラー: {str(e)}")
         traceback.print_exc()
         raise
+    finally:
+        document.close()
 
-def extract_japanese_text_enhanced(doc_path, output_path):
+def extract_japanese_text_enhanced(doc_path, output_path, session=None):
     """
     日本語テキスト抽出に特化した強化版処理
     このメソッドは特にWordバイナリファイル内の日本語テキストの検出と抽出に焦点を当てています
     """
+    text = get_japanese_text_enhanced(doc_path, session)
+    write_text_file(output_path, text)
+    print(f"日本語テキスト抽出完了: {output_path}")
+    return output_path
+
+@DOC_BACKENDS.register("強化版日本語特化処理", ('.doc',), cost=0.1, fallback=True, options=('session',))
+def get_japanese_text_enhanced(doc_path, session=None):
+    """
+    強化版日本語特化処理でテキストを抽出し、ファイルに書き込まずに返す
+    Windowsではsession（WordSession）のWordも使う（Noneの場合はこの文書のためだけに起動する）
+    """
     try:
-        # バイナリモードでファイルを開く
-        with open(doc_path, 'rb') as f:
-            content = f.read()
+        # OLE2構造を解析し、テキストを含むWordDocumentストリームだけを読み込む
+        content = read_doc_text_bytes(doc_path)
         
         # 複数のエンコーディングで抽出を試み、最も多くのテキストを取得したものを採用
         all_extracted_texts = []
@@ -295,18 +429,12 @@ def extract_japanese_text_enhanced(doc_path, output_path):
         # 1. Win32 COMによる直接抽出を試みる（Windows環境のみ）
         if platform.system() == 'Windows':
             try:
-                import win32com.client
-                word_app = win32com.client.Dispatch("Word.Application")
-                word_app.Visible = False
-                doc = word_app.Documents.Open(os.path.abspath(doc_path), ReadOnly=True)
-                text = doc.Content.Text
-                doc.Close(SaveChanges=False)
-                word_app.Quit()
+                with session_scope(session) as word:
+                    text = word.get_text(doc_path)
                 
                 if text and len(text) > 100:  # 十分なテキストが取得できた場合
                     # 日本語文字の比率を計算
-                    jp_chars = re.findall(r'[ぁ-んァ-ヶ一-龠々〆〜]', text)
-                    jp_ratio = len(jp_chars) / len(text) if len(text) > 0 else 0
+                    jp_count, jp_ratio = japanese_stats(text)
                     
                     if jp_ratio > 0.05:  # 5%以上が日本語文字である場合
                         all_extracted_texts.append((text, jp_ratio, "win32com"))
@@ -315,15 +443,14 @@ def extract_japanese_text_enhanced(doc_path, output_path):
         
         # 2. Python-docxによる抽出（.docxファイル用）
         try:
-            import docx
+            docx = import_backend('docx')
             doc = docx.Document(doc_path)
             paragraphs = [p.text for p in doc.paragraphs if p.text.strip()]
             text = '\n'.join(paragraphs)
             
             if text and len(text) > 100:
                 # 日本語文字の比率を計算
-                jp_chars = re.findall(r'[ぁ-んァ-ヶ一-龠々〆〜]', text)
-                jp_ratio = len(jp_chars) / len(text) if len(text) > 0 else 0
+                jp_count, jp_ratio = japanese_stats(text)
                 
                 if jp_ratio > 0.05:
                     all_extracted_texts.append((text, jp_ratio, "python-docx"))
@@ -336,82 +463,18 @@ def extract_japanese_text_enhanced(doc_path, output_path):
             # バイナリデータから直接UTF-16LEの日本語テキストを抽出
             # Word文書ではテキストがUTF-16LEで格納されていることが多い
             utf16_text = ""
-            i = 0
-            text_chunks = []
-            current_chunk = []
-            
-            while i < len(content) - 2:
-                # 2バイト単位で読み取り
-                if i + 2 <= len(content):
-                    try:
-                        char_code = struct.unpack('<H', content[i:i+2])[0]
-                        
-                        # 以下の範囲は日本語文字の領域
-                        is_japanese = (
-                            (0x3040 <= char_code <= 0x309F) or  # ひらがな
-                            (0x30A0 <= char_code <= 0x30FF) or  # カタカナ
-                            (0x4E00 <= char_code <= 0x9FFF) or  # 漢字
-                            (char_code in [0x3000, 0x3001, 0x3002, 0xFF01, 0xFF0C, 0xFF0E, 0xFF1A, 0xFF1F, 
-                                         0x2025, 0x2026, 0x301C, 0x303B, 0x30FB]) or  # 句読点など
-                            (0xFF10 <= char_code <= 0xFF19) or  # 全角数字
-                            (0xFF21 <= char_code <= 0xFF3A) or  # 全角英大文字
-                            (0xFF41 <= char_code <= 0xFF5A)     # 全角英小文字
-                        )
-                        
-                        if is_japanese:
-                            try:
-                                char = content[i:i+2].decode('utf-16le', errors='ignore')
-                                current_chunk.append(char)
-                            except:
-                                pass
-                        else:
-                            # 特定の記号も取り込む（文章の繋がりに重要）
-                            is_valid_char = (
-                                char_code in [0x0020, 0x0009, 0x000A, 0x000D, 0x3000, 0x00A0, 0x0026] or  # スペース、タブ、改行など
-                                (0x0030 <= char_code <= 0x0039) or  # 数字
-                                (0x0041 <= char_code <= 0x005A) or  # 英大文字
-                                (0x0061 <= char_code <= 0x007A) or  # 英小文字
-                                (char_code in [0x002E, 0x002C, 0x003A, 0x003B, 0x0028, 0x0029, 0x005B, 0x005D, 
-                                            0x007B, 0x007D, 0x0025, 0x002F, 0x2019, 0x2026])  # 記号
-                            )
-                            
-                            if is_valid_char:
-                                try:
-                                    char = content[i:i+2].decode('utf-16le', errors='ignore')
-                                    current_chunk.append(char)
-                                except:
-                                    pass
-                            # 無関係な文字が一定数連続したら新しいチャンクとする
-                            elif len(current_chunk) > 15:  # 充分な長さのチャンクが溜まった
-                                chunk_text = ''.join(current_chunk)
-                                # 日本語テキストが含まれるチャンクのみ保存
-                                if re.search(r'[ぁ-んァ-ヶ一-龠々〆〜]', chunk_text):
-                                    text_chunks.append(chunk_text)
-                                current_chunk = []
-                            else:
-                                # チャンクが短すぎる場合はリセット
-                                current_chunk = []
-                    except:
-                        pass
-                i += 2
-            
-            # 最後のチャンクも追加
-            if current_chunk and len(current_chunk) > 15:
-                chunk_text = ''.join(current_chunk)
-                if re.search(r'[ぁ-んァ-ヶ一-龠々〆〜]', chunk_text):
-                    text_chunks.append(chunk_text)
+            # 日本語文字と接続記号が16文字以上連続する区間を一括で検出する
+            text_chunks = scan_japanese_chunks(content)
             
             # チャンク間の重複を除去して連結
             if text_chunks:
-                unique_chunks = []
-                for chunk in text_chunks:
-                    # 重複チェックを厳密化し、長すぎる部分は除外（HTMLや制御文字の可能性）
-                    if not any(chunk in uc for uc in unique_chunks) and len(chunk) < 2000:
-                        # バイナリノイズらしき文字列を除外
-                        if not re.search(r'[^\x20-\x7E\u3000-\u30FF\u4E00-\u9FFF\u3040-\u309F\uFF00-\uFF9F\u2000-\u206F\n]{10,}', chunk):
-                            unique_chunks.append(chunk)
+                # 既に採用したチャンクに含まれるものは除外し、長すぎる部分（HTMLや制御文字の可能性）と
+                # バイナリノイズらしき文字列も除外する（含まれるかどうかは索引でほぼ線形の時間で判定）
+                noise_pattern = re.compile(r'[^\x20-\x7E\u3000-\u30FF\u4E00-\u9FFF\u3040-\u309F\uFF00-\uFF9F\u2000-\u206F\n]{10,}')
+                kept_chunks = unique_chunks(text_chunks,
+                                            lambda chunk: len(chunk) < 2000 and not noise_pattern.search(chunk))
                 
-                utf16_text = '\n\n'.join(unique_chunks)
+                utf16_text = '\n\n'.join(kept_chunks)
                 
                 # 不要なバイナリデータやノイズを除去
                 utf16_text = re.sub(r'[^\x20-\x7E\u3000-\u30FF\u4E00-\u9FFF\u3040-\u309F\uFF00-\uFF9F\u2000-\u206F\n]+', '', utf16_text)
@@ -421,8 +484,7 @@ def extract_japanese_text_enhanced(doc_path, output_path):
                 utf16_text = re.sub(r'<[^>]+>', '', utf16_text)
                 
                 # 日本語比率を計算
-                jp_chars = re.findall(r'[ぁ-んァ-ヶ一-龠々〆〜]', utf16_text)
-                jp_ratio = len(jp_chars) / len(utf16_text) if len(utf16_text) > 0 else 0
+                jp_count, jp_ratio = japanese_stats(utf16_text)
                 
                 if len(utf16_text) > 100 and jp_ratio > 0.1:
                     all_extracted_texts.append((utf16_text, jp_ratio, "binary_utf16"))
@@ -435,11 +497,10 @@ def extract_japanese_text_enhanced(doc_path, output_path):
         
         for encoding in encodings:
             try:
-                decoded_text = content.decode(encoding, errors='ignore')
+                decoded_text = str(content, encoding, 'ignore')
                 
                 # 日本語文字が含まれているか確認
-                jp_chars = re.findall(r'[ぁ-んァ-ヶ一-龠々〆〜]', decoded_text)
-                jp_ratio = len(jp_chars) / len(decoded_text) if len(decoded_text) > 0 else 0
+                jp_count, jp_ratio = japanese_stats(decoded_text)
                 
                 if len(decoded_text) > 100 and jp_ratio > 0.05:
                     # 意味のある段落を抽出
@@ -458,8 +519,7 @@ def extract_japanese_text_enhanced(doc_path, output_path):
                     if meaningful_lines:
                         clean_text = '\n'.join(meaningful_lines)
                         # 再度日本語比率を確認
-                        jp_chars = re.findall(r'[ぁ-んァ-ヶ一-龠々〆〜]', clean_text)
-                        jp_ratio = len(jp_chars) / len(clean_text) if len(clean_text) > 0 else 0
+                        jp_count, jp_ratio = japanese_stats(clean_text)
                         
                         if len(clean_text) > 100 and jp_ratio > 0.1:
                             all_extracted_texts.append((clean_text, jp_ratio, f"encoding_{encoding}"))
@@ -506,12 +566,7 @@ def extract_japanese_text_enhanced(doc_path, output_path):
                 if start_idx >= 0:
                     consolidated_text = consolidated_text[start_idx:]
             
-            # テキストファイルに書き込む
-            with open(output_path, 'w', encoding='utf-8') as out_file:
-                out_file.write(consolidated_text)
-            
-            print(f"日本語テキスト抽出完了: {output_path}")
-            return output_path
+            return consolidated_text
         else:
             raise Exception("有効な日本語テキストが見つかりませんでした")
     
@@ -520,53 +575,56 @@ def extract_japanese_text_enhanced(doc_path, output_path):
         traceback.print_exc()
         raise
 
-def extract_text_with_word_com_direct(doc_path, output_path):
+def extract_text_with_piece_table(doc_path, output_path):
+    """
+    FIBとピーステーブル（CLX）を解析して本文テキストを抽出する
+    エンコーディングの推測を行わないため、Word 97-2003形式の文書では最も確実な方法
+    """
+    return write_text_file(output_path, get_text_with_piece_table(doc_path))
+
+@DOC_BACKENDS.register("ピーステーブル解析", ('.doc',), cost=0.01, tier=0)
+def get_text_with_piece_table(doc_path):
+    """
+    ピーステーブル解析でテキストを抽出し、ファイルに書き込まずに返す
+    """
+    try:
+        text = extract_text_from_piece_table(doc_path)
+        if not text:
+            raise Exception("抽出されたテキストが空です")
+        return text
+    except Exception as e:
+        print(f"ピーステーブル解析エラー（{doc_path}）: {str(e)}")
+        raise
+
+def extract_text_with_word_com_direct(doc_path, output_path, session=None):
     """
     Word COMを使用して直接テキストを抽出する
     """
+    output_path = os.path.abspath(output_path)
+    text = get_text_with_word_com_direct(doc_path, session)
+    
+    # テキストファイルに書き込む
+    print(f"テキストをファイルに書き込み中: {output_path}")
+    return write_text_file(output_path, text)
+
+@DOC_BACKENDS.register("Word COMでの直接抽出", ('.doc',), cost=3.0, tier=1, platforms=('win32',), modules=('win32com.client',),
+                       options=('session',))
+def get_text_with_word_com_direct(doc_path, session=None):
+    """
+    Word COMで直接テキストを抽出し、ファイルに書き込まずに返す
+    session（WordSession）を指定した場合は起動済みのWordを使い回す（Noneの場合はこの文書のためだけに起動する）
+    """
     # 絶対パスに変換
     doc_path = os.path.abspath(doc_path)
-    output_path = os.path.abspath(output_path)
     
     try:
-        # Wordアプリケーションの起動
-        word = win32com.client.DispatchEx("Word.Application")
-        word.Visible = False
-        word.DisplayAlerts = False
-        
-        try:
-            # docファイルを開く
+        with session_scope(session) as word:
+            # docファイルを開き、テキストを直接抽出
             print(f"Word COMでファイルを開いています: {doc_path}")
-            doc = word.Documents.Open(doc_path, ReadOnly=True)
-            
-            # テキストを直接抽出
-            print("ドキュメントからテキストを抽出中...")
-            text = doc.Content.Text
-            
-            # docファイルを閉じる
-            doc.Close(SaveChanges=False)
-            
-            # テキストファイルに書き込む
-            print(f"テキストをファイルに書き込み中: {output_path}")
-            with open(output_path, 'w', encoding='utf-8', errors='ignore') as f:
-                f.write(text)
-            
-            return output_path
-        
-        except Exception as e:
-            print(f"Word COM直接テキスト抽出エラー（{doc_path}）: {str(e)}")
-            traceback.print_exc()
-            raise e
-        
-        finally:
-            # Wordアプリケーションを終了
-            try:
-                word.Quit()
-            except:
-                pass
+            return word.get_text(doc_path)
     
     except Exception as e:
-        print(f"Word COM初期化エラー: {str(e)}")
+        print(f"Word COM直接テキスト抽出エラー（{doc_path}）: {str(e)}")
         traceback.print_exc()
         raise e
 
@@ -575,9 +633,8 @@ def extract_text_with_japanese_support(doc_path, output_path):
     日本語テキスト抽出に特化したカスタム処理
     """
     try:
-        # バイナリモードでファイルを開く
-        with open(doc_path, 'rb') as f:
-            content = f.read()
+        # OLE2構造を解析し、テキストを含むWordDocumentストリームだけを読み込む
+        content = read_doc_text_bytes(doc_path)
         
         # バイナリからの日本語テキスト抽出
         # 日本語のShift-JIS, EUC-JP, UTF-8で抽出を試みる
@@ -588,7 +645,7 @@ def extract_text_with_japanese_support(doc_path, output_path):
         for enc in encodings:
             try:
                 # バイナリをデコードしてみる
-                decoded = content.decode(enc, errors='ignore')
+                decoded = str(content, enc, 'ignore')
                 
                 # 日本語文字が含まれているかチェック
                 if re.search(r'[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FFF]', decoded):
@@ -611,7 +668,7 @@ def extract_text_with_japanese_support(doc_path, output_path):
                     try:
                         # 2バイト分取得してデコード
                         char_bytes = content[i:i+2]
-                        char = char_bytes.decode('shift_jis', errors='ignore')
+                        char = str(char_bytes, 'shift_jis', 'ignore')
                         if re.search(r'[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FFF]', char):
                             text_chunks.append(char)
                         i += 2
@@ -650,6 +707,23 @@ def extract_text_with_antiword(doc_path, output_path):
     """
     antiwordライブラリを使用してdocファイルからテキストを抽出する
     """
+    return write_text_file(output_path, get_text_with_antiword(doc_path))
+
+def antiword_unavailable():
+    """
+    antiwordが利用できない場合はその理由を返す（Windowsではコマンドの代わりにPythonライブラリも使える）
+    """
+    if shutil.which('antiword'):
+        return None
+    if platform.system() == 'Windows' and importlib.util.find_spec('antiword') is not None:
+        return None
+    return "antiwordがインストールされていません"
+
+@DOC_BACKENDS.register("antiwordを使用", ('.doc',), cost=0.5, tier=2, check=antiword_unavailable)
+def get_text_with_antiword(doc_path):
+    """
+    antiwordでテキストを抽出し、ファイルに書き込まずに返す
+    """
     try:
         # Windowsの場合はantiword.exeが必要
         if platform.system() == 'Windows':
@@ -665,10 +739,7 @@ def extract_text_with_antiword(doc_path, output_path):
                 # 代替としてのpythonコードを実行（antiwordライブラリを使用）
                 from antiword import process_file
                 # 日本語対応のために適切なエンコーディングを指定
-                text = process_file(doc_path)
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write(text)
-                return output_path
+                return process_file(doc_path)
         else:
             # Linux/Macの場合
             cmd = ['antiword', '-t', '-w', '0', doc_path]
@@ -676,11 +747,7 @@ def extract_text_with_antiword(doc_path, output_path):
         # antiwordコマンドを実行してテキストを抽出
         result = subprocess.run(cmd, capture_output=True, text=True, check=True, encoding='utf-8')
         
-        # 結果をファイルに書き込む
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(result.stdout)
-        
-        return output_path
+        return result.stdout
     except Exception as e:
         # より詳細なエラー情報を出力
         print(f"antiwordでの変換に詳細なエラー: {str(e)}")
@@ -692,20 +759,20 @@ def extract_text_with_custom_python(doc_path, output_path):
     日本語テキストの抽出に特化
     """
     try:
-        # バイナリモードでファイルを開く
-        with open(doc_path, 'rb') as f:
-            content = f.read()
+        # OLE2構造を解析し、テキストを含むWordDocumentストリームだけを読み込む
+        content = read_doc_text_bytes(doc_path)
         
         # テキスト部分を抽出（ASCII文字と日本語文字）
         text_bytes = bytearray()
         
         # まず、明らかなXML/テキスト部分を探す
-        xml_start = content.find(b'<?xml')
+        xml_match = re.search(rb'<\?xml', content)
+        xml_start = xml_match.start() if xml_match else -1
         if xml_start > 0:
             xml_content = content[xml_start:]
             # XMLをデコード
             try:
-                xml_text = xml_content.decode('utf-8', errors='ignore')
+                xml_text = str(xml_content, 'utf-8', 'ignore')
                 # XMLタグを除去
                 xml_text = re.sub(r'<[^>]+>', ' ', xml_text)
                 # 余分な空白を整理
@@ -777,9 +844,10 @@ def extract_text_with_custom_python(doc_path, output_path):
         print(f"カスタムPython処理でのエラー: {str(e)}")
         raise e
 
-def convert_doc_to_docx_then_text(doc_path, output_path):
+def convert_doc_to_docx_then_text(doc_path, output_path, session=None):
     """
     .docファイルを一旦.docxに変換してからテキストに変換する
+    session（WordSession）を指定した場合は起動済みのWordを使い回す
     """
     # 絶対パスに変換
     doc_path = os.path.abspath(doc_path)
@@ -790,43 +858,18 @@ def convert_doc_to_docx_then_text(doc_path, output_path):
     temp_file = os.path.join(temp_dir, "temp.docx")
     
     try:
-        # Wordアプリケーションの起動
-        word = win32com.client.DispatchEx("Word.Application")
-        word.Visible = False
-        word.DisplayAlerts = False
-        
-        try:
-            # docファイルを開く
+        with session_scope(session) as word:
+            # docファイルを開き、docxとして保存
             print(f"Word COMでファイルを開いています: {doc_path}")
-            doc = word.Documents.Open(doc_path, ReadOnly=True)
-            
-            # docxとして保存
             print(f"ファイルをDOCXとして保存中: {temp_file}")
-            doc.SaveAs2(temp_file, FileFormat=16)  # 16 = docx
-            
-            # docxファイルを閉じる
-            doc.Close()
-            
-            # docxをテキストに変換
-            print("DOCXからテキストへの変換を実行中...")
-            result = convert_docx_to_text(temp_file, output_path)
-            
-            return result
-        
-        except Exception as e:
-            print(f"DOC→DOCX変換エラー（{doc_path}）: {str(e)}")
-            traceback.print_exc()
-            raise e
+            word.save_as_docx(doc_path, temp_file)
         
-        finally:
-            # Wordアプリケーションを終了
-            try:
-                word.Quit()
-            except:
-                pass
+        # docxをテキストに変換
+        print("DOCXからテキストへの変換を実行中...")
+        return convert_docx_to_text(temp_file, output_path)
     
     except Exception as e:
-        print(f"Word COM初期化エラー: {str(e)}")
+        print(f"DOC→DOCX変換エラー（{doc_path}）: {str(e)}")
         traceback.print_exc()
         raise e
     
@@ -895,7 +938,75 @@ def extract_text_with_powershell(doc_path, output_path):
         except Exception as e:
             print(f"一時スクリプトファイルの削除に失敗: {str(e)}")
 
-def process_directory(directory_path, recursive=True, force_utf8=False, use_sjis=False):
+def convert_word_file(file_path, force_utf8=False, use_sjis=False,
+                      exhaustive=False, accept_jp_ratio=ACCEPT_JP_RATIO, accept_min_length=ACCEPT_MIN_LENGTH,
+                      details=None, cache=None, sections=None, postprocess=None, word_session=None, cancel=None,
+                      on_method=None):
+    """
+    拡張子に応じて.docまたは.docxファイルをテキストファイルに変換する
+    sectionsは.docxファイルの抽出対象のセクション、postprocessは書き込む前に適用する後処理、
+    word_sessionは.docの変換でWordを使う場合に使い回すセッション、
+    cancelはis_set()がTrueになると変換を中断するトークン（開始前または.docの変換方法の合間に確認する）、
+    on_methodは.docの変換方法を一つ試すたびに呼ばれる関数（convert_doc_to_textを参照）
+    
+    Returns:
+        str: 作成されたテキストファイルのパス（失敗した場合はNone）
+    """
+    if cancel is not None and cancel.is_set():
+        if details is not None:
+            details.update(cancelled=True)
+        return None
+    if file_path.lower().endswith('.docx'):
+        return convert_docx_to_text(file_path, details=details, cache=cache, sections=sections,
+                                    postprocess=postprocess)
+    return convert_doc_to_text(file_path, force_utf8=force_utf8, use_sjis=use_sjis,
+                               exhaustive=exhaustive, accept_jp_ratio=accept_jp_ratio,
+                               accept_min_length=accept_min_length, details=details, cache=cache,
+                               postprocess=postprocess, word_session=word_session, cancel=cancel,
+                               on_method=on_method)
+
+def convert_file_job(file_path, options, cache_path=None, cache_max_bytes=DEFAULT_MAX_BYTES, cancel=None):
+    """
+    プロセスプールのワーカーで1ファイルを変換する
+    並列実行時にファイルごとの出力が混ざらないよう、標準出力をまとめて返す
+    
+    Args:
+        file_path (str): 変換するファイルのパス
+        options (dict): convert_word_fileに渡すオプション
+        cache_path (str, optional): 抽出結果のキャッシュファイルのパス
+        cache_max_bytes (int): キャッシュの上限サイズ（バイト）
+        cancel (optional): is_set()がTrueになると変換を中断するトークン（conversion_pool.SlotTokenなど）
+    
+    Returns:
+        tuple: (ファイルパス, 出力パス, エラーメッセージ, 変換中の出力, 変換方法などの詳細)
+        詳細の'seconds'はワーカーでの変換にかかった時間（秒）
+    """
+    log = io.StringIO()
+    output_path = None
+    error = None
+    details = {}
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+        cache = None
+        try:
+            if cache_path:
+                cache = ExtractionCache(cache_path, cache_max_bytes)
+            # Wordはワーカーごとに一つだけ起動し、複数のファイルで使い回す
+            output_path = convert_word_file(file_path, details=details, cache=cache,
+                                            word_session=worker_session(), cancel=cancel, **options)
+        except Exception as e:
+            error = str(e)
+            traceback.print_exc()
+        finally:
+            if cache is not None:
+                cache.close()
+    details['seconds'] = time.perf_counter() - start
+    return file_path, output_path, error, log.getvalue(), details
+
+def process_directory(directory_path, recursive=True, force_utf8=False, use_sjis=False,
+                      exhaustive=False, accept_jp_ratio=ACCEPT_JP_RATIO, accept_min_length=ACCEPT_MIN_LENGTH,
+                      jobs=1, incremental=False, cache_path=None, cache_max_bytes=DEFAULT_MAX_BYTES,
+                      sections=None, postprocess=None, word_session=None, cancel=None, on_event=None):
     """
     指定したディレクトリ内のすべてのWordファイル（.docと.docx）をテキストに変換する
     
@@ -904,17 +1015,71 @@ def process_directory(directory_path, recursive=True, force_utf8=False, use_sjis
         recursive (bool): サブディレクトリも再帰的に処理するかどうか
         force_utf8 (bool): UTF-8エンコーディングを優先的に使用するかどうか
         use_sjis (bool): Shift-JISエンコーディングを優先的に使用するかどうか
+        exhaustive (bool): .docの変換ですべての方法を試して比較するかどうか
+        accept_jp_ratio (float): .docの変換結果を採用する日本語文字の最小比率
+        accept_min_length (int): .docの変換結果を採用する最小文字数
+        jobs (int): 並列に変換するプロセス数（1の場合は順番に変換）
+        incremental (bool): マニフェストに記録された前回の変換以降に変更のないファイルをスキップするかどうか
+        cache_path (str, optional): 指定した場合は内容が同じファイルの抽出結果をこのキャッシュから再利用する
+        cache_max_bytes (int): キャッシュの上限サイズ（バイト）
+        sections (tuple, optional): .docxファイルから抽出するセクション
+        postprocess (tuple, optional): 書き込む前に適用する後処理（クリーニング済みのテキストを一度の書き込みで出力する）
+        word_session (WordSession, optional): 順番に変換する場合にWordを使い回すセッション
+            （Noneの場合は処理の間だけ作成する。並列の場合はワーカーごとに作成する）
+        cancel (threading.Event, optional): セットされると未処理のファイルを変換せず、
+            変換中のファイルは現在の変換方法が終わった時点で中断する
+        on_event (callable, optional): 進捗を受け取る関数。on_event(イベント名, 内容の辞書)の形で呼ばれ、
+            内容には処理の開始からの経過時間（'elapsed'、秒）が含まれる
+            - 'discovered': 変換するファイルの数（'total'）と変更がないためスキップするファイルの数（'up_to_date'）
+            - 'started': 変換を開始したファイル（'file'。並列の場合はワーカーに投入した時点）
+            - 'method': .docの変換で試した変換方法（'file', 'method', 'seconds', 'result'。変換方法が終わるたびに通知する）
+            - 'succeeded': 変換に成功したファイル（'file', 'output', 'method', 'seconds'）
+            - 'failed': 変換に失敗したファイル（'file', 'error', 'seconds'）
+            - 'cancelled': キャンセルにより中断したファイル（'file'）
+            並列の場合の'method'は、ワーカーのプロセスでの変換が終わった時点でまとめて通知する
+            on_eventで発生したエラーは表示するだけで、変換は続ける
     
     Returns:
         tuple: (成功したファイルのリスト, 失敗したファイルのリスト)
+        スキップしたファイルは成功したファイルに含まれ、キャンセルしたファイルはどちらにも含まれない
     """
     # 絶対パスに変換
     directory_path = os.path.abspath(directory_path)
     print(f"ディレクトリを処理中: {directory_path}")
+    started_at = time.perf_counter()
+    
+    def emit(event, **info):
+        """on_eventに進捗を通知する（通知先でエラーが発生しても変換は続ける）"""
+        if on_event is None:
+            return
+        info['elapsed'] = time.perf_counter() - started_at
+        try:
+            on_event(event, info)
+        except Exception as e:
+            print(f"進捗の通知に失敗しました（{event}）: {str(e)}")
+            traceback.print_exc()
+    
+    def emit_result(file_str, output_path, error, details, seconds, replay_methods=False):
+        """
+        1ファイルの変換結果を通知する
+        replay_methodsがTrueの場合は、先に試した変換方法をまとめて通知する（別のプロセスで変換した場合）
+        """
+        if replay_methods:
+            for attempt in details.get('attempts', ()):
+                emit('method', file=file_str, **attempt)
+        if details.get('cancelled'):
+            emit('cancelled', file=file_str)
+        elif error is None and output_path:
+            emit('succeeded', file=file_str, output=output_path, method=details.get('method'), seconds=seconds)
+        else:
+            emit('failed', file=file_str, error=error or "変換失敗", seconds=seconds)
     
     # 成功・失敗したファイルのリスト
     success_files = []
     failed_files = []
+    manifest = None
+    cache = None
+    own_session = None
     
     try:
         # 再帰的検索パターン
@@ -929,43 +1094,122 @@ def process_directory(directory_path, recursive=True, force_utf8=False, use_sjis
         
         print(f"検索結果: {len(docx_files)} DOCX ファイル, {len(doc_files)} DOC ファイル")
         
-        # .docxファイルを処理
-        for docx_file in docx_files:
-            docx_file_str = str(docx_file)
-            print(f"処理中: {docx_file_str}")
-            try:
-                output_path = convert_docx_to_text(docx_file_str)
-                if output_path:
-                    print(f"  変換完了: {output_path}")
-                    success_files.append(docx_file_str)
+        # .docxファイル、.docファイルの順に処理
+        word_files = [str(f) for f in docx_files] + [str(f) for f in doc_files]
+        options = {
+            'force_utf8': force_utf8,
+            'use_sjis': use_sjis,
+            'exhaustive': exhaustive,
+            'accept_jp_ratio': accept_jp_ratio,
+            'accept_min_length': accept_min_length,
+        }
+        if sections is not None:
+            # 指定がない場合は従来のマニフェストの記録と同じオプションになるようにする
+            options['sections'] = list(sections)
+        if postprocess:
+            options['postprocess'] = list(postprocess)
+        
+        if incremental:
+            # 前回の変換以降に変更のないファイルは変換しない
+            manifest = ConversionManifest(directory_path)
+            pending_files = []
+            for file_str in word_files:
+                if manifest.is_up_to_date(file_str, options):
+                    success_files.append(file_str)
                 else:
-                    print(f"  変換失敗: {docx_file_str}")
-                    failed_files.append(docx_file_str)
-            except Exception as e:
-                print(f"  変換エラー（{docx_file_str}）: {str(e)}")
-                traceback.print_exc()
-                failed_files.append(docx_file_str)
+                    pending_files.append(file_str)
+            print(f"変更のないファイル: {len(word_files) - len(pending_files)}, 変換対象: {len(pending_files)}")
+            word_files = pending_files
+        emit('discovered', total=len(word_files), up_to_date=len(success_files))
         
-        # .docファイルを処理
-        for doc_file in doc_files:
-            doc_file_str = str(doc_file)
-            print(f"処理中: {doc_file_str}")
-            try:
-                output_path = convert_doc_to_text(doc_file_str, force_utf8=force_utf8, use_sjis=use_sjis)
-                if output_path:
+        def record_result(file_str, output_path, details):
+            """変換結果をマニフェストに反映する"""
+            if manifest is None:
+                return
+            if output_path:
+                manifest.record(file_str, output_path, details.get('method'), options)
+            else:
+                manifest.remove(file_str)
+        
+        if jobs > 1 and len(word_files) > 1:
+            # 複数プロセスで並列に変換し、完了したファイルから順に結果を出力
+            print(f"{jobs} プロセスで並列に変換します")
+            # multiprocessingの読み込みは重いため、並列処理を行う場合だけ読み込む
+            from conversion_pool import ConversionPool
+            
+            def handle_result(file_str, output_path, error, log, details):
+                print(f"処理中: {file_str}")
+                if log:
+                    print(log, end='' if log.endswith('\n') else '\n')
+                emit_result(file_str, output_path, error, details, details.get('seconds'), replay_methods=True)
+                if details.get('cancelled'):
+                    print(f"  キャンセル: {file_str}")
+                    return
+                record_result(file_str, output_path if error is None else None, details)
+                if error is not None:
+                    print(f"  変換エラー（{file_str}）: {error}")
+                    failed_files.append(file_str)
+                elif output_path:
                     print(f"  変換完了: {output_path}")
-                    success_files.append(doc_file_str)
+                    success_files.append(file_str)
                 else:
-                    print(f"  変換失敗: {doc_file_str}")
-                    failed_files.append(doc_file_str)
-            except Exception as e:
-                print(f"  変換エラー（{doc_file_str}）: {str(e)}")
-                traceback.print_exc()
-                failed_files.append(doc_file_str)
+                    print(f"  変換失敗: {file_str}")
+                    failed_files.append(file_str)
+            
+            with ConversionPool(jobs, cache_path=cache_path, cache_max_bytes=cache_max_bytes) as pool:
+                skipped = pool.run(word_files, options, handle_result, cancel,
+                                   on_submit=lambda file_str: emit('started', file=file_str))
+            if skipped:
+                print(f"キャンセルにより変換しなかったファイル: {len(skipped)}")
+        else:
+            if cache_path:
+                cache = ExtractionCache(cache_path, cache_max_bytes)
+            if word_session is None:
+                # すべてのファイルで一つのWordを使い回す（Wordは最初に使われた時点で起動する）
+                word_session = own_session = WordSession()
+            for index, file_str in enumerate(word_files):
+                if cancel is not None and cancel.is_set():
+                    print(f"キャンセルにより変換しなかったファイル: {len(word_files) - index}")
+                    break
+                print(f"処理中: {file_str}")
+                emit('started', file=file_str)
+                start = time.perf_counter()
+                details = {}
+                output_path = None
+                error = None
+                try:
+                    output_path = convert_word_file(file_str, details=details, cache=cache,
+                                                    word_session=word_session, cancel=cancel,
+                                                    on_method=lambda attempt: emit('method', file=file_str, **attempt),
+                                                    **options)
+                    if details.get('cancelled'):
+                        print(f"  キャンセル: {file_str}")
+                    else:
+                        record_result(file_str, output_path, details)
+                        if output_path:
+                            print(f"  変換完了: {output_path}")
+                            success_files.append(file_str)
+                        else:
+                            print(f"  変換失敗: {file_str}")
+                            failed_files.append(file_str)
+                except Exception as e:
+                    error = str(e)
+                    print(f"  変換エラー（{file_str}）: {error}")
+                    traceback.print_exc()
+                    record_result(file_str, None, {})
+                    failed_files.append(file_str)
+                emit_result(file_str, output_path, error, details, time.perf_counter() - start)
     
     except Exception as e:
         print(f"ディレクトリ処理エラー: {str(e)}")
         traceback.print_exc()
+    finally:
+        if manifest is not None:
+            manifest.close()
+        if cache is not None:
+            cache.close()
+        if own_session is not None:
+            own_session.close()
     
     return success_files, failed_files
 
@@ -974,12 +1218,21 @@ def extract_text_with_binary_parsing(doc_path, output_path):
     バイナリデータから直接日本語テキストを抽出する
     複数のエンコーディングでテキストを抽出し、最も良質なものを選択する
     """
+    text = get_text_with_binary_parsing(doc_path)
+    write_text_file(output_path, text)
+    print(f"バイナリ解析によるテキスト抽出完了: {output_path}")
+    return output_path
+
+@DOC_BACKENDS.register("バイナリ解析", ('.doc',), cost=0.2, tier=1, fallback=True)
+def get_text_with_binary_parsing(doc_path):
+    """
+    バイナリ解析でテキストを抽出し、ファイルに書き込まずに返す
+    """
     try:
         print(f"バイナリ解析による日本語テキスト抽出を開始({doc_path})...")
         
-        # バイナリモードでファイルを開く
-        with open(doc_path, 'rb') as f:
-            content = f.read()
+        # OLE2構造を解析し、テキストを含むWordDocumentストリームだけを読み込む
+        content = read_doc_text_bytes(doc_path)
         
         # 試すエンコーディングのリスト
         encodings = ['utf-8', 'utf-16le', 'utf-16be', 'shift_jis', 'euc-jp', 'cp932', 'iso-2022-jp']
@@ -989,13 +1242,12 @@ def extract_text_with_binary_parsing(doc_path, output_path):
         for encoding in encodings:
             try:
                 # ファイル全体をデコード
-                text = content.decode(encoding, errors='ignore')
+                text = str(content, encoding, 'ignore')
                 
                 # 日本語文字が含まれているか確認
-                jp_chars = re.findall(r'[ぁ-んァ-ヶ一-龠々〆〜]', text)
-                jp_ratio = len(jp_chars) / max(len(text), 1)
+                jp_count, jp_ratio = japanese_stats(text)
                 
-                print(f"  エンコーディング {encoding}: テキスト長={len(text)}, 日本語文字数={len(jp_chars)}, 比率={jp_ratio:.2%}")
+                print(f"  エンコーディング {encoding}: テキスト長={len(text)}, 日本語文字数={jp_count}, 比率={jp_ratio:.2%}")
                 
                 if len(text) > 100 and jp_ratio > 0.01:
                     # 意味のある段落だけを抽出
@@ -1012,8 +1264,7 @@ def extract_text_with_binary_parsing(doc_path, output_path):
                     if meaningful_paras:
                         filtered_text = '\n'.join(meaningful_paras)
                         # 再度日本語比率をチェック
-                        jp_chars = re.findall(r'[ぁ-んァ-ヶ一-龠々〆〜]', filtered_text)
-                        jp_ratio = len(jp_chars) / max(len(filtered_text), 1)
+                        jp_count, jp_ratio = japanese_stats(filtered_text)
                         
                         if len(filtered_text) > 100 and jp_ratio > 0.05:
                             encoding_results.append((filtered_text, jp_ratio, encoding))
@@ -1022,56 +1273,15 @@ def extract_text_with_binary_parsing(doc_path, output_path):
         
         # バイナリデータから2バイト単位で日本語文字を直接抽出する試み
         try:
-            i = 0
-            chars = []
-            current_chunk = []
-            
-            while i < len(content) - 1:
-                # 2バイト単位で処理（UTF-16LE想定）
-                if i + 2 <= len(content):
-                    char_code = struct.unpack('<H', content[i:i+2])[0]
-                    
-                    # 日本語文字の範囲チェック
-                    is_japanese = ((0x3040 <= char_code <= 0x309F) or  # ひらがな
-                                  (0x30A0 <= char_code <= 0x30FF) or  # カタカナ
-                                  (0x4E00 <= char_code <= 0x9FFF) or  # 漢字
-                                  (char_code in [0x3000, 0x3001, 0x3002, 0xFF01, 0xFF0C, 0xFF0E, 0xFF1A, 0xFF1F]))  # 句読点など
-                    
-                    if is_japanese:
-                        try:
-                            char = content[i:i+2].decode('utf-16le', errors='ignore')
-                            current_chunk.append(char)
-                        except:
-                            pass
-                    else:
-                        # 空白や改行なども取り込む
-                        if char_code in [0x0020, 0x0009, 0x000A, 0x000D]:  # スペース、タブ、改行
-                            try:
-                                char = content[i:i+2].decode('utf-16le', errors='ignore')
-                                current_chunk.append(char)
-                            except:
-                                pass
-                        elif len(current_chunk) > 10:  # 十分な長さの日本語チャンクが見つかった
-                            chars.append(''.join(current_chunk))
-                            current_chunk = []
-                i += 2
-            
-            # 最後のチャンクも追加
-            if current_chunk and len(current_chunk) > 10:
-                chars.append(''.join(current_chunk))
+            # UTF-16LEとして日本語文字と空白類を一括で抽出する
+            chars = scan_direct_chunks(content)
             
             if chars:
-                # チャンク間の重複を削除
-                unique_chunks = []
-                for chunk in chars:
-                    if chunk not in unique_chunks:
-                        unique_chunks.append(chunk)
-                
-                binary_text = '\n'.join(unique_chunks)
+                # チャンク間の重複を削除（出現順を保ったままハッシュで判定）
+                binary_text = '\n'.join(dict.fromkeys(chars))
                 
                 # 日本語比率を再チェック
-                jp_chars = re.findall(r'[ぁ-んァ-ヶ一-龠々〆〜]', binary_text)
-                jp_ratio = len(jp_chars) / max(len(binary_text), 1)
+                jp_count, jp_ratio = japanese_stats(binary_text)
                 
                 if len(binary_text) > 100 and jp_ratio > 0.1:
                     encoding_results.append((binary_text, jp_ratio, "binary_direct"))
@@ -1089,12 +1299,7 @@ def extract_text_with_binary_parsing(doc_path, output_path):
             # 余分な空行を整理
             best_text = re.sub(r'\n{3,}', '\n\n', best_text)
             
-            # テキストファイルに書き込む
-            with open(output_path, 'w', encoding='utf-8') as out_file:
-                out_file.write(best_text)
-            
-            print(f"バイナリ解析によるテキスト抽出完了: {output_path}")
-            return output_path
+            return best_text
         else:
             raise Exception("有効な日本語テキストが見つかりませんでした")
     
@@ -1103,134 +1308,161 @@ def extract_text_with_binary_parsing(doc_path, output_path):
         traceback.print_exc()
         raise
 
-def extract_text_doc_to_docx(doc_path, output_path):
+def extract_text_doc_to_docx(doc_path, output_path, session=None):
     """
     .docファイルを一度.docxに変換してからテキストを抽出する
     """
+    return write_text_file(output_path, get_text_doc_to_docx(doc_path, session))
+
+def doc_to_docx_unavailable():
+    """
+    .docxへの変換を経由する方法が利用できない場合はその理由を返す（WindowsはWord COM、それ以外はLibreOfficeを使う）
+    """
+    if platform.system() == 'Windows':
+        if is_backend_available('win32com.client'):
+            return None
+        return disabled_backends().get('win32com.client')
+    # libreoffice_poolは.docxへの変換を経由する場合だけ読み込む（起動時間の短縮）
+    from libreoffice_pool import find_soffice
+    if find_soffice() is None:
+        return "LibreOfficeがインストールされていません"
+    return None
+
+@DOC_BACKENDS.register("docからdocxへの変換を経由", ('.doc',), cost=5.0, tier=2, check=doc_to_docx_unavailable,
+                       options=('session',))
+def get_text_doc_to_docx(doc_path, session=None):
+    """
+    .docxへの変換を経由してテキストを抽出し、ファイルに書き込まずに返す
+    WindowsではWord（sessionを指定した場合はそのWord）、それ以外ではLibreOfficeで.docxに変換する
+    """
     try:
         print(f"docからdocxへの変換を経由したテキスト抽出を開始({doc_path})...")
         
-        # 一時的なdocxファイルパスを生成
-        temp_docx_path = f"{os.path.splitext(doc_path)[0]}_temp.docx"
-        
-        # Windowsの場合はWord COMを使用
-        if platform.system() == 'Windows':
-            try:
-                import win32com.client
-                word_app = win32com.client.Dispatch("Word.Application")
-                word_app.Visible = False
-                
+        # 一時的なdocxファイルは専用の一時ディレクトリに作成する（元の文書の隣にある.docxを上書きしない）
+        # LibreOfficeのコマンドラインは出力先のディレクトリに「元のファイル名.docx」で保存する
+        outdir = tempfile.mkdtemp(prefix='doc_to_docx_')
+        temp_docx_path = os.path.join(outdir, f"{Path(doc_path).stem}.docx")
+        try:
+            # Windowsの場合はWord COMを使用
+            if platform.system() == 'Windows':
                 try:
-                    # docファイルを開く
-                    doc = word_app.Documents.Open(os.path.abspath(doc_path), ReadOnly=True)
-                    
-                    # docxとして保存
-                    doc.SaveAs2(os.path.abspath(temp_docx_path), FileFormat=16)  # 16はdocx形式
-                    doc.Close(SaveChanges=False)
-                finally:
-                    word_app.Quit()
-                
-                # python-docxを使用してdocxからテキストを抽出
-                import docx
-                doc = docx.Document(temp_docx_path)
-                
-                # 段落を取得
-                paragraphs = []
-                for para in doc.paragraphs:
-                    if para.text.strip():
-                        paragraphs.append(para.text)
-                
-                # テーブルからもテキストを抽出
-                for table in doc.tables:
-                    for row in table.rows:
-                        for cell in row.cells:
-                            for para in cell.paragraphs:
-                                if para.text.strip():
-                                    paragraphs.append(para.text)
-                
-                # 結果のテキストをファイルに書き込む
-                text = '\n'.join(paragraphs)
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write(text)
-                
-                # 一時ファイルを削除
-                if os.path.exists(temp_docx_path):
-                    os.remove(temp_docx_path)
-                
-                return output_path
-            except Exception as e:
-                print(f"  Word COMでのdocx変換に失敗: {str(e)}")
-                if os.path.exists(temp_docx_path):
-                    os.remove(temp_docx_path)
-                raise
-        else:
-            # Windowsでない場合はLibreOfficeを使用する（インストールされている必要がある）
-            try:
-                # LibreOfficeコマンドラインでの変換
-                if platform.system() == 'Darwin':  # macOS
-                    soffice_path = '/Applications/LibreOffice.app/Contents/MacOS/soffice'
-                else:  # Linux
-                    soffice_path = 'libreoffice'
-                
-                cmd = f'"{soffice_path}" --headless --convert-to docx --outdir "{os.path.dirname(temp_docx_path)}" "{doc_path}"'
-                result = subprocess.run(cmd, shell=True, stderr=subprocess.PIPE)
-                
-                if result.returncode != 0:
-                    error_message = result.stderr.decode('utf-8', errors='ignore')
-                    raise Exception(f"LibreOffice変換エラー: {error_message}")
-                
-                # docxファイルからテキストを抽出
-                import docx
-                doc = docx.Document(temp_docx_path)
-                
-                paragraphs = []
-                for para in doc.paragraphs:
-                    if para.text.strip():
-                        paragraphs.append(para.text)
-                
-                # テーブルテキストも抽出
-                for table in doc.tables:
-                    for row in table.rows:
-                        for cell in row.cells:
-                            for para in cell.paragraphs:
-                                if para.text.strip():
-                                    paragraphs.append(para.text)
-                
-                # 結果のテキストをファイルに書き込む
-                text = '\n'.join(paragraphs)
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write(text)
-                
-                # 一時ファイルを削除
-                if os.path.exists(temp_docx_path):
-                    os.remove(temp_docx_path)
-                
-                return output_path
-            except Exception as e:
-                print(f"  LibreOfficeでのdocx変換に失敗: {str(e)}")
-                if os.path.exists(temp_docx_path):
-                    os.remove(temp_docx_path)
-                raise
-                
-        # どちらの方法も失敗した場合
-        raise Exception("docxへの変換処理が失敗しました")
+                    # docファイルを開き、docxとして保存
+                    with session_scope(session) as word:
+                        word.save_as_docx(doc_path, temp_docx_path)
+                except Exception as e:
+                    print(f"  Word COMでのdocx変換に失敗: {str(e)}")
+                    raise
+            else:
+                # Windowsでない場合はLibreOfficeを使用する（インストールされている必要がある）
+                try:
+                    convert_with_libreoffice(doc_path, temp_docx_path)
+                except Exception as e:
+                    print(f"  LibreOfficeでのdocx変換に失敗: {str(e)}")
+                    raise
+            
+            # docxの段落と表のセル内の段落からテキストを抽出
+            with DocxPackage(temp_docx_path) as package:
+                paragraphs = [text for text in package.all_paragraphs() if text.strip()]
+            
+            return '\n'.join(paragraphs)
+        finally:
+            # 一時ファイルを削除
+            shutil.rmtree(outdir, ignore_errors=True)
     
     except Exception as e:
         print(f"docからdocxへの変換経由でのテキスト抽出に失敗: {str(e)}")
         traceback.print_exc()
         raise
 
+def convert_with_libreoffice(doc_path, docx_path):
+    """
+    LibreOfficeでdoc_pathを.docxに変換してdocx_pathに保存する
+    UNOが使える場合は常駐させたLibreOfficeで、使えない場合はファイルごとにコマンドラインで変換する
+    （コマンドラインの場合、docx_pathのファイル名は「doc_pathのファイル名.docx」である必要がある）
+    """
+    # libreoffice_poolは.docxへの変換を経由する場合だけ読み込む（起動時間の短縮）
+    from libreoffice_pool import find_soffice, pool_unavailable_reason, get_shared_pool
+    if pool_unavailable_reason() is None:
+        # 常駐させたLibreOfficeで変換する（起動にかかる時間は最初の一回だけ）
+        get_shared_pool().convert(doc_path, docx_path)
+        return docx_path
+    
+    # ファイル名に引用符や$などが含まれていても解釈されないよう、シェルを介さずに引数のリストで起動する
+    cmd = [find_soffice(), '--headless', '--convert-to', 'docx', '--outdir', os.path.dirname(docx_path), doc_path]
+    result = subprocess.run(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        error_message = result.stderr.decode('utf-8', errors='ignore')
+        raise Exception(f"LibreOffice変換エラー: {error_message}")
+    if not os.path.exists(docx_path):
+        raise Exception(f"LibreOfficeの変換結果が見つかりません: {docx_path}")
+    return docx_path
+
+def parse_number(arg, convert, minimum=None, maximum=None):
+    """
+    --name=VALUE形式の引数の値を数値に変換する
+
+    Args:
+        arg (str): コマンドライン引数
+        convert (callable): intまたはfloat
+        minimum (optional): 許可する最小値
+        maximum (optional): 許可する最大値
+
+    Returns:
+        変換した数値
+
+    Raises:
+        Exception: 数値でない場合、または範囲外の場合
+    """
+    name, _, value = arg.partition("=")
+    try:
+        number = convert(value)
+    except ValueError:
+        kind = "整数" if convert is int else "数値"
+        raise Exception(f"{name}には{kind}を指定してください: '{value}'")
+    if (minimum is not None and number < minimum) or (maximum is not None and number > maximum):
+        if maximum is None:
+            bounds = f"{minimum}以上の値"
+        elif minimum is None:
+            bounds = f"{maximum}以下の値"
+        else:
+            bounds = f"{minimum}〜{maximum}の範囲の値"
+        raise Exception(f"{name}には{bounds}を指定してください: '{value}'")
+    return number
+
+def print_usage():
+    """コマンドラインの使用方法を表示する"""
+    print("使用方法: python word_to_text_converter.py <マニュアル集のディレクトリパス> [--no-recursive] [--force-utf8] [--use-sjis] [--exhaustive] [--accept-ratio=RATIO] [--accept-length=LENGTH] [--jobs=N] [--incremental] [--cache[=PATH]] [--cache-size=MB] [--sections=SECTIONS] [--postprocess=STAGES] [--lo-workers=N]")
+    print("  --exhaustive: .docの変換ですべての方法を試し、結果を比較する（低速）")
+    print(f"  --accept-ratio=RATIO: 結果を採用して残りの方法を打ち切る日本語比率 (デフォルト: {ACCEPT_JP_RATIO})")
+    print(f"  --accept-length=LENGTH: 結果を採用して残りの方法を打ち切る最小文字数 (デフォルト: {ACCEPT_MIN_LENGTH})")
+    print("  --jobs=N: N個のプロセスで並列に変換する (デフォルト: 1)")
+    print("  --incremental: 前回の変換以降に変更のないファイルをスキップする（マニフェストをディレクトリに保存）")
+    print(f"  --cache[=PATH]: 内容が同じファイルの抽出結果を再利用する (デフォルト: {DEFAULT_CACHE_PATH})")
+    print(f"  --cache-size=MB: キャッシュの上限サイズ (デフォルト: {DEFAULT_MAX_BYTES // (1024 * 1024)} MB)")
+    print(f"  --sections=SECTIONS: .docxから抽出するセクションをカンマ区切りで指定する（{', '.join(SECTIONS)}, all。デフォルト: header,body,footer）")
+    print(f"  --postprocess=STAGES: 書き込む前に適用する後処理をカンマ区切りで指定する（{', '.join(POSTPROCESS_STAGES)}。指定した順に適用）")
+    print("  --lo-workers=N: .docx経由の変換で常駐させるLibreOfficeの数（変換プロセスごと。デフォルト: 1）")
+
 def main():
-    if len(sys.argv) < 2:
-        print("使用方法: python word_to_text_converter.py <マニュアル集のディレクトリパス> [--no-recursive] [--force-utf8] [--use-sjis]")
+    if len(sys.argv) < 2 or sys.argv[1] in ("-h", "--help"):
+        print_usage()
         return
     
     directory_path = sys.argv[1]
     recursive = True
     force_utf8 = False
     use_sjis = False
+    exhaustive = False
+    accept_jp_ratio = ACCEPT_JP_RATIO
+    accept_min_length = ACCEPT_MIN_LENGTH
+    jobs = 1
+    incremental = False
+    cache_path = None
+    cache_max_bytes = DEFAULT_MAX_BYTES
+    sections = None
+    postprocess = None
     
-    if len(sys.argv) > 2:
+    try:
         for arg in sys.argv[2:]:
             if arg == "--no-recursive":
                 recursive = False
@@ -1238,6 +1470,33 @@ def main():
                 force_utf8 = True
             elif arg == "--use-sjis":
                 use_sjis = True
+            elif arg == "--exhaustive":
+                exhaustive = True
+            elif arg.startswith("--accept-ratio="):
+                accept_jp_ratio = parse_number(arg, float, 0.0, 1.0)
+            elif arg.startswith("--accept-length="):
+                accept_min_length = parse_number(arg, int, 0)
+            elif arg.startswith("--jobs="):
+                jobs = max(parse_number(arg, int), 1)
+            elif arg == "--incremental":
+                incremental = True
+            elif arg == "--cache":
+                cache_path = DEFAULT_CACHE_PATH
+            elif arg.startswith("--cache="):
+                cache_path = arg.split("=", 1)[1]
+            elif arg.startswith("--cache-size="):
+                cache_max_bytes = int(parse_number(arg, float, 0.0) * 1024 * 1024)
+            elif arg.startswith("--sections="):
+                sections = parse_sections(arg.split("=", 1)[1])
+            elif arg.startswith("--postprocess="):
+                postprocess = parse_stages(arg.split("=", 1)[1])
+            elif arg.startswith("--lo-workers="):
+                from libreoffice_pool import configure_shared_pool
+                configure_shared_pool(parse_number(arg, int))
+    except Exception as e:
+        print(f"エラー: {str(e)}")
+        print_usage()
+        return
     
     if not os.path.exists(directory_path):
         print(f"エラー: 指定されたパス '{directory_path}' が存在しません。")
@@ -1248,8 +1507,17 @@ def main():
         print(f"再帰的処理: {'有効' if recursive else '無効'}")
         print(f"UTF-8優先: {'有効' if force_utf8 else '無効'}")
         print(f"Shift-JIS優先: {'有効' if use_sjis else '無効'}")
+        print(f"全方法比較: {'有効' if exhaustive else '無効'}")
+        print(f"並列プロセス数: {jobs}")
+        print(f"差分変換: {'有効' if incremental else '無効'}")
+        print(f"抽出結果キャッシュ: {cache_path if cache_path else '無効'}")
+        print(f"抽出セクション: {','.join(sections) if sections else 'header,body,footer'}")
+        print(f"後処理: {stages_key(postprocess) or 'なし'}")
         
-        success_files, failed_files = process_directory(directory_path, recursive, force_utf8, use_sjis)
+        success_files, failed_files = process_directory(directory_path, recursive, force_utf8, use_sjis,
+                                                        exhaustive, accept_jp_ratio, accept_min_length, jobs,
+                                                        incremental, cache_path, cache_max_bytes, sections,
+                                                        postprocess)
         
         print("\n変換処理が完了しました。")
         print(f"成功: {len(success_files)}ファイル")
@@ -1267,13 +1535,23 @@ def main():
         print(f"UTF-8優先: {'有効' if force_utf8 else '無効'}")
         print(f"Shift-JIS優先: {'有効' if use_sjis else '無効'}")
         
-        if file_path.lower().endswith('.docx'):
-            output_path = convert_docx_to_text(file_path)
-        elif file_path.lower().endswith('.doc'):
-            output_path = convert_doc_to_text(file_path, force_utf8=force_utf8, use_sjis=use_sjis)
-        else:
+        if not file_path.lower().endswith(('.doc', '.docx')):
             print(f"エラー: サポートされていないファイル形式です。'.doc'または'.docx'ファイルを指定してください。")
             return
+        
+        cache = ExtractionCache(cache_path, cache_max_bytes) if cache_path else None
+        try:
+            if file_path.lower().endswith('.docx'):
+                output_path = convert_docx_to_text(file_path, cache=cache, sections=sections,
+                                                   postprocess=postprocess)
+            else:
+                output_path = convert_doc_to_text(file_path, force_utf8=force_utf8, use_sjis=use_sjis,
+                                                  exhaustive=exhaustive, accept_jp_ratio=accept_jp_ratio,
+                                                  accept_min_length=accept_min_length, cache=cache,
+                                                  postprocess=postprocess)
+        finally:
+            if cache is not None:
+                cache.close()
             
         if output_path:
             print(f"変換完了: {output_path}")
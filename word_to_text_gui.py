@@ -5,6 +5,8 @@ import os
 import sys
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
+import time
+import queue
 import threading
 from pathlib import Path
 import traceback  # トレースバック情報を取得するためのモジュール
@@ -17,9 +19,20 @@ logging.basicConfig(level=logging.DEBUG,
 logger = logging.getLogger(__name__)
 logger.info("プログラムを開始します")
 
+# 変換スレッドからの更新（ログ・進捗など）を画面に反映する間隔（ミリ秒）
+UI_TICK_MS = 100
+
+# 一度の反映で処理する更新の最大数（残りは次の反映で処理する）
+MAX_EVENTS_PER_TICK = 5000
+
+# ログに残す最大行数（超えた分は古い行から削除する）
+LOG_MAX_LINES = 5000
+
 # word_to_text_converter.pyからインポート
 try:
     from word_to_text_converter import convert_docx_to_text, convert_doc_to_text, process_directory, extract_japanese_text_enhanced
+    from extraction_cache import ExtractionCache, DEFAULT_CACHE_PATH
+    from conversion_pool import ConversionPool
     print("モジュールのインポートに成功しました")
     logger.info("モジュールのインポートに成功しました")
 except ImportError as e:
@@ -54,15 +67,24 @@ class WordToTextConverterGUI:
         self.is_recursive = tk.BooleanVar(value=True)
         self.force_utf8 = tk.BooleanVar(value=True)  # UTF-8優先フラグ
         self.use_sjis = tk.BooleanVar(value=False)   # Shift-JIS優先フラグ
+        self.use_cache = tk.BooleanVar(value=True)   # 抽出結果キャッシュの使用フラグ
+        self.jobs = tk.IntVar(value=os.cpu_count() or 1)   # 並列に変換するプロセス数
+        self.cache = None
         self.is_running = False
+        # キャンセルボタンでセットし、変換中のファイルは現在の変換方法が終わった時点で中断する
+        self.cancel_event = threading.Event()
         self.total_files = 0
         self.processed_files = 0
+        self.started_at = None   # 変換を開始した時刻（処理速度と残り時間の計算に使う）
         self.success_files = 0
         self.failed_files = 0
         self.failed_file_list = []  # 失敗したファイルのリスト
+        # 変換スレッドからの更新のキュー（画面にはUI_TICK_MSごとにまとめて反映する）
+        self.events = queue.Queue()
         
         # GUIの設定
         self._setup_ui()
+        self.root.after(UI_TICK_MS, self._drain_events)
         
         # ドラッグ&ドロップの設定
         try:
@@ -123,6 +145,7 @@ class WordToTextConverterGUI:
         self.cancel_button.config(state=tk.NORMAL)
         self.save_failed_list_button.config(state=tk.DISABLED)
         self.is_running = True
+        self.cancel_event.clear()
         
         # ログの初期化
         self.log_text.delete(1.0, tk.END)
@@ -134,6 +157,7 @@ class WordToTextConverterGUI:
         # 進捗の初期化
         self.total_files = 1
         self.processed_files = 0
+        self.started_at = time.perf_counter()
         self.success_files = 0
         self.failed_files = 0
         self.failed_file_list = []
@@ -162,6 +186,7 @@ class WordToTextConverterGUI:
         self.cancel_button.config(state=tk.NORMAL)
         self.save_failed_list_button.config(state=tk.DISABLED)
         self.is_running = True
+        self.cancel_event.clear()
         
         # ログの初期化
         self.log_text.delete(1.0, tk.END)
@@ -173,6 +198,7 @@ class WordToTextConverterGUI:
         # 進捗の初期化
         self.total_files = len(word_files)
         self.processed_files = 0
+        self.started_at = time.perf_counter()
         self.success_files = 0
         self.failed_files = 0
         self.failed_file_list = []
@@ -181,96 +207,118 @@ class WordToTextConverterGUI:
         # スレッドで実行
         threading.Thread(target=self._convert_multiple_files, args=(word_files,)).start()
     
+    def _get_cache(self):
+        """抽出結果のキャッシュを返す（使用しない設定の場合はNone）"""
+        if not self.use_cache.get():
+            return None
+        if self.cache is None:
+            try:
+                self.cache = ExtractionCache(DEFAULT_CACHE_PATH)
+            except Exception as e:
+                logger.error(f"キャッシュを開けませんでした: {e}")
+                return None
+        return self.cache
+    
     def _convert_single_file(self, file_path):
         """単一ファイルの変換をスレッドで実行"""
         try:
             if file_path.lower().endswith('.docx'):
-                output_path = convert_docx_to_text(file_path)
+                output_path = convert_docx_to_text(file_path, cache=self._get_cache())
                 if output_path:
                     self.success_files += 1
-                    self.root.after(0, lambda: self._log(f"変換完了: {output_path}"))
+                    self._log(f"変換完了: {output_path}")
                 else:
                     self.failed_files += 1
                     self._add_to_failed_list(file_path, "変換失敗")
             elif file_path.lower().endswith('.doc'):
-                output_path = convert_doc_to_text(file_path, force_utf8=self.force_utf8.get(), use_sjis=self.use_sjis.get())
-                if output_path:
+                details = {}
+                output_path = convert_doc_to_text(file_path, force_utf8=self.force_utf8.get(), use_sjis=self.use_sjis.get(),
+                                                  details=details, cache=self._get_cache(), cancel=self.cancel_event)
+                if details.get('cancelled'):
+                    self._log(f"キャンセル: {file_path}")
+                elif output_path:
                     self.success_files += 1
-                    self.root.after(0, lambda: self._log(f"変換完了: {output_path}"))
+                    self._log(f"変換完了: {output_path}")
                 else:
                     self.failed_files += 1
                     self._add_to_failed_list(file_path, "変換失敗")
         except Exception as e:
             error_msg = str(e)
             self.failed_files += 1
-            self.root.after(0, lambda: self._log(f"エラー（{file_path}）: {error_msg}"))
+            self._log(f"エラー（{file_path}）: {error_msg}")
             self._add_to_failed_list(file_path, error_msg)
         
         self.processed_files += 1
         progress = (self.processed_files / self.total_files) * 100
-        self.root.after(0, lambda: self._update_progress(progress, f"完了"))
+        self._update_progress(progress, f"完了")
         
         # 完了メッセージ
         if self.is_running:
             summary = f"変換処理が完了しました。成功: {self.success_files}, 失敗: {self.failed_files}"
-            self.root.after(0, lambda: self._log(summary))
+            self._log(summary)
             if self.failed_files > 0:
-                self.root.after(0, lambda: messagebox.showinfo("完了", f"{summary}\n\n失敗したファイルがあります。詳細はログを確認してください。"))
+                self._post(lambda: messagebox.showinfo("完了", f"{summary}\n\n失敗したファイルがあります。詳細はログを確認してください。"))
             else:
-                self.root.after(0, lambda: messagebox.showinfo("完了", summary))
+                self._post(lambda: messagebox.showinfo("完了", summary))
         
         self.is_running = False
-        self.root.after(0, self._reset_ui)
+        self._post(self._reset_ui)
     
     def _convert_multiple_files(self, files):
-        """複数ファイルの変換をスレッドで実行"""
-        for file_path in files:
-            if not self.is_running:
-                break
-            
-            self.root.after(0, lambda f=file_path: self._log(f"処理中: {f}"))
-            
-            try:
-                if file_path.lower().endswith('.docx'):
-                    output_path = convert_docx_to_text(file_path)
-                    if output_path:
-                        self.success_files += 1
-                        self.root.after(0, lambda p=output_path: self._log(f"  変換完了: {p}"))
-                    else:
-                        self.failed_files += 1
-                        self._add_to_failed_list(file_path, "変換失敗")
-                elif file_path.lower().endswith('.doc'):
-                    output_path = convert_doc_to_text(file_path, force_utf8=self.force_utf8.get(), use_sjis=self.use_sjis.get())
-                    if output_path:
-                        self.success_files += 1
-                        self.root.after(0, lambda p=output_path: self._log(f"  変換完了: {p}"))
-                    else:
-                        self.failed_files += 1
-                        self._add_to_failed_list(file_path, "変換失敗")
-            except Exception as e:
-                error_msg = str(e)
+        """複数ファイルの変換をスレッドで実行（ファイルごとに別のプロセスで並列に変換する）"""
+        options = {'force_utf8': self.force_utf8.get(), 'use_sjis': self.use_sjis.get()}
+        cache_path = DEFAULT_CACHE_PATH if self.use_cache.get() else None
+        
+        def on_result(file_path, output_path, error, log, details):
+            """変換が終わったファイルの結果を反映する（このスレッドで呼ばれる）"""
+            if details.get('cancelled'):
+                self._log(f"キャンセル: {file_path}")
+                return
+            self._log(f"処理中: {file_path}")
+            if error is not None:
                 self.failed_files += 1
-                self.root.after(0, lambda f=file_path, err=error_msg: self._log(f"  エラー（{f}）: {err}"))
-                self._add_to_failed_list(file_path, error_msg)
+                self._log(f"  エラー（{file_path}）: {error}")
+                self._add_to_failed_list(file_path, error)
+            elif output_path:
+                self.success_files += 1
+                self._log(f"  変換完了: {output_path}")
+            else:
+                self.failed_files += 1
+                self._add_to_failed_list(file_path, "変換失敗")
             
             self.processed_files += 1
             progress = (self.processed_files / self.total_files) * 100
-            self.root.after(0, lambda p=progress: self._update_progress(p, f"処理中... ({self.processed_files}/{self.total_files})"))
+            self._update_progress(progress, self._progress_text())
+        
+        try:
+            with ConversionPool(self.jobs.get(), cache_path=cache_path) as pool:
+                self._log(f"{pool.jobs} プロセスで並列に変換します")
+                skipped = pool.run(files, options, on_result, self.cancel_event)
+            if skipped:
+                self._log(f"キャンセルにより変換しなかったファイル: {len(skipped)}")
+        except Exception as e:
+            error_msg = f"エラーが発生しました: {str(e)}"
+            self._log(error_msg)
+            logger.error(error_msg, exc_info=True)
         
         # 完了メッセージ
         if self.is_running:
             summary = f"変換処理が完了しました。成功: {self.success_files}, 失敗: {self.failed_files}, 合計: {self.total_files}"
-            self.root.after(0, lambda: self._log(summary))
-            self.root.after(0, lambda: self._update_progress(100, "完了"))
+            self._log(summary)
+            self._update_progress(100, "完了")
             
             if self.failed_files > 0:
-                self.root.after(0, lambda: self._log(f"\n失敗したファイルが {self.failed_files} 件あります。「失敗リスト」タブで確認できます。"))
-                self.root.after(0, lambda: messagebox.showinfo("完了", f"{summary}\n\n失敗したファイルが {self.failed_files} 件あります。「失敗リスト」タブで確認してください。"))
+                self._log(f"\n失敗したファイルが {self.failed_files} 件あります。「失敗リスト」タブで確認できます。")
+                self._post(lambda: messagebox.showinfo("完了", f"{summary}\n\n失敗したファイルが {self.failed_files} 件あります。「失敗リスト」タブで確認してください。"))
             else:
-                self.root.after(0, lambda: messagebox.showinfo("完了", summary))
+                self._post(lambda: messagebox.showinfo("完了", summary))
+        elif self.cancel_event.is_set():
+            summary = f"変換処理をキャンセルしました。成功: {self.success_files}, 失敗: {self.failed_files}, 合計: {self.total_files}"
+            self._log(summary)
+            self._update_progress(text="キャンセルされました")
         
         self.is_running = False
-        self.root.after(0, self._reset_ui)
+        self._post(self._reset_ui)
     
     def _setup_ui(self):
         """GUIのレイアウトを設定"""
@@ -297,6 +345,12 @@ class WordToTextConverterGUI:
         ttk.Checkbutton(option_frame, text="サブディレクトリも含めて変換する", variable=self.is_recursive).pack(anchor=tk.W, padx=5, pady=2)
         ttk.Checkbutton(option_frame, text="UTF-8エンコーディングを優先する（日本語特化）", variable=self.force_utf8).pack(anchor=tk.W, padx=5, pady=2)
         ttk.Checkbutton(option_frame, text="Shift-JISエンコーディングを優先する", variable=self.use_sjis).pack(anchor=tk.W, padx=5, pady=2)
+        ttk.Checkbutton(option_frame, text="同じ内容のファイルは前回の変換結果を再利用する", variable=self.use_cache).pack(anchor=tk.W, padx=5, pady=2)
+        
+        jobs_frame = ttk.Frame(option_frame)
+        jobs_frame.pack(anchor=tk.W, padx=5, pady=2)
+        ttk.Label(jobs_frame, text="並列に変換するプロセス数:").pack(side=tk.LEFT)
+        ttk.Spinbox(jobs_frame, from_=1, to=max(os.cpu_count() or 1, 32), textvariable=self.jobs, width=5).pack(side=tk.LEFT, padx=5)
         
         # 操作ボタン部分
         button_frame = ttk.Frame(main_frame, padding=5)
@@ -383,19 +437,77 @@ class WordToTextConverterGUI:
             logger.info(f"ディレクトリが選択されました: {directory}")
     
     def _log(self, message):
-        """ログにメッセージを追加"""
-        self.log_text.insert(tk.END, message + "\n")
-        self.log_text.see(tk.END)
+        """ログにメッセージを追加（どのスレッドからも呼べる。画面には次の反映でまとめて追加する）"""
+        self.events.put(('log', message))
         logger.info(message)
     
     def _update_progress(self, value=None, text=None):
-        """進捗状況を更新"""
-        if value is not None:
-            self.progress_var.set(value)
+        """進捗状況を更新（どのスレッドからも呼べる。反映の間に複数回更新した場合は最後の値だけを表示する）"""
+        self.events.put(('progress', value, text))
+    
+    def _post(self, callback):
+        """ログなどの更新と同じ順序で、UIスレッドでcallbackを実行する（どのスレッドからも呼べる）"""
+        self.events.put(('call', callback))
+    
+    def _drain_events(self):
+        """
+        キューに溜まった更新をまとめて画面に反映する（UI_TICK_MSごとにUIスレッドで実行する）
+        ログと失敗リストはそれぞれ一度の挿入にまとめ、進捗は最後の値だけを一度更新する
+        """
+        log_lines = []
+        failed_texts = []
+        progress = [None, None]
+        
+        def flush():
+            if log_lines:
+                self._append_log(log_lines[-LOG_MAX_LINES:])
+                log_lines.clear()
+            if failed_texts:
+                self.failed_text.insert(tk.END, ''.join(failed_texts))
+                self.failed_text.see(tk.END)
+                failed_texts.clear()
+            value, text = progress
+            if value is not None:
+                self.progress_var.set(value)
+            if text is not None:
+                self.status_label.config(text=text)
+                logger.info(f"進捗状況を更新: {text}")
+            progress[:] = [None, None]
         
-        if text is not None:
-            self.status_label.config(text=text)
-            logger.info(f"進捗状況を更新: {text}")
+        try:
+            for _ in range(MAX_EVENTS_PER_TICK):
+                try:
+                    event = self.events.get_nowait()
+                except queue.Empty:
+                    break
+                kind = event[0]
+                if kind == 'log':
+                    log_lines.append(event[1])
+                elif kind == 'failed':
+                    failed_texts.append(event[1])
+                elif kind == 'progress':
+                    if event[1] is not None:
+                        progress[0] = event[1]
+                    if event[2] is not None:
+                        progress[1] = event[2]
+                else:
+                    # メッセージボックスなどは、それまでの更新を反映してから実行する
+                    flush()
+                    event[1]()
+            flush()
+        except Exception as e:
+            logger.error(f"画面の更新中にエラーが発生しました: {e}", exc_info=True)
+        finally:
+            self.root.after(UI_TICK_MS, self._drain_events)
+    
+    def _append_log(self, lines):
+        """ログに複数行を一度に追加し、LOG_MAX_LINESを超えた古い行を削除する"""
+        self.log_text.insert(tk.END, "\n".join(lines) + "\n")
+        # 末尾は常に空行のため、実際の行数は最終行の番号から1を引いた数
+        excess = int(self.log_text.index(tk.END).split('.')[0]) - 1 - LOG_MAX_LINES
+        if excess > 0:
+            self.log_text.delete("1.0", f"{excess + 1}.0")
+        self.log_text.see(tk.END)
     
     def _save_failed_list(self):
         """失敗したファイルのリストをテキストファイルとして保存"""
@@ -454,6 +566,7 @@ class WordToTextConverterGUI:
             self.cancel_button.config(state=tk.NORMAL)
             self.save_failed_list_button.config(state=tk.DISABLED)
             self.is_running = True
+            self.cancel_event.clear()
             
             # ログと失敗リストの初期化
             self.log_text.delete(1.0, tk.END)
@@ -466,6 +579,7 @@ class WordToTextConverterGUI:
             # 進捗の初期化
             self.total_files = 0
             self.processed_files = 0
+            self.started_at = time.perf_counter()
             self.success_files = 0
             self.failed_files = 0
             self.failed_file_list = []
@@ -482,48 +596,95 @@ class WordToTextConverterGUI:
         """ディレクトリ内のファイルを変換（スレッドで実行）"""
         try:
             # process_directory関数を使用して変換
-            success_files, failed_files = process_directory(directory_path, recursive, force_utf8, use_sjis)
+            cache_path = DEFAULT_CACHE_PATH if self.use_cache.get() else None
+            # 失敗したファイルは変換中に届く進捗（_on_directory_event）で失敗リストに追加する
+            success_files, failed_files = process_directory(directory_path, recursive, force_utf8, use_sjis,
+                                                            jobs=self.jobs.get(), cache_path=cache_path,
+                                                            cancel=self.cancel_event,
+                                                            on_event=self._on_directory_event)
             
-            # 結果を更新
+            # 結果を更新（変更がないためスキップしたファイルは成功に含まれる）
             self.success_files = len(success_files)
             self.failed_files = len(failed_files)
             self.total_files = self.success_files + self.failed_files
             self.processed_files = self.total_files
-            self.failed_file_list = failed_files
             
-            # 失敗したファイルを失敗リストに表示
-            for file in failed_files:
-                self._add_to_failed_list(file)
+            if self.cancel_event.is_set():
+                summary = f"変換処理をキャンセルしました。成功: {self.success_files}, 失敗: {self.failed_files}"
+                self._log(summary)
+                self._update_progress(text="キャンセルされました")
+                return
             
             # 完了メッセージ
             summary = f"変換処理が完了しました。成功: {self.success_files}, 失敗: {self.failed_files}, 合計: {self.total_files}"
-            self.root.after(0, lambda: self._log(summary))
-            self.root.after(0, lambda: self._update_progress(100, "完了"))
+            self._log(summary)
+            self._update_progress(100, "完了")
             
             if self.failed_files > 0:
-                self.root.after(0, lambda: self._log(f"\n失敗したファイルが {self.failed_files} 件あります。「失敗リスト」タブで確認できます。"))
-                self.root.after(0, lambda: messagebox.showinfo("完了", f"{summary}\n\n失敗したファイルが {self.failed_files} 件あります。「失敗リスト」タブで確認してください。"))
+                self._log(f"\n失敗したファイルが {self.failed_files} 件あります。「失敗リスト」タブで確認できます。")
+                self._post(lambda: messagebox.showinfo("完了", f"{summary}\n\n失敗したファイルが {self.failed_files} 件あります。「失敗リスト」タブで確認してください。"))
             else:
-                self.root.after(0, lambda: messagebox.showinfo("完了", summary))
+                self._post(lambda: messagebox.showinfo("完了", summary))
         
         except Exception as e:
             error_msg = f"エラーが発生しました: {str(e)}"
-            self.root.after(0, lambda err=error_msg: self._log(error_msg))
-            self.root.after(0, lambda: self._update_progress(text="エラーが発生しました"))
+            self._log(error_msg)
+            self._update_progress(text="エラーが発生しました")
             logger.error(error_msg, exc_info=True)
         
         finally:
             self.is_running = False
-            self.root.after(0, self._reset_ui)
+            self._post(self._reset_ui)
+    
+    def _on_directory_event(self, event, info):
+        """process_directoryの進捗を反映する（変換スレッドで呼ばれる）"""
+        if event == 'discovered':
+            self.total_files = info['total']
+            self.started_at = time.perf_counter()
+            self._log(f"変換対象: {info['total']} ファイル（変更がないためスキップ: {info['up_to_date']}）")
+            self._update_progress(0, self._progress_text())
+        elif event == 'started':
+            self._update_progress(text=f"{self._progress_text()} - {os.path.basename(info['file'])}")
+        elif event == 'method':
+            self._log(f"  {info['method']}: {info['seconds']:.2f}秒（{info['result']}）")
+        elif event == 'cancelled':
+            self._log(f"キャンセル: {info['file']}")
+        else:
+            self.processed_files += 1
+            if event == 'succeeded':
+                self.success_files += 1
+                self._log(f"変換完了: {info['output']}（{info['method']}、{info['seconds']:.2f}秒）")
+            else:
+                self.failed_files += 1
+                self._log(f"変換失敗: {info['file']}（{info['error']}）")
+                self._add_to_failed_list(info['file'], info['error'])
+            progress = (self.processed_files / self.total_files) * 100 if self.total_files else 100
+            self._update_progress(progress, self._progress_text())
+    
+    def _progress_text(self):
+        """処理済みのファイル数と、処理速度（ファイル/秒）・残り時間の目安を返す"""
+        text = f"処理中... ({self.processed_files}/{self.total_files})"
+        elapsed = time.perf_counter() - self.started_at if self.started_at is not None else 0
+        if self.processed_files == 0 or elapsed <= 0:
+            return text
+        rate = self.processed_files / elapsed
+        remaining = max(self.total_files - self.processed_files, 0) / rate
+        minutes, seconds = divmod(int(remaining), 60)
+        hours, minutes = divmod(minutes, 60)
+        eta = f"{hours}時間{minutes}分" if hours else f"{minutes}分{seconds}秒" if minutes else f"{seconds}秒"
+        return f"{text} {rate:.1f}ファイル/秒, 残り約{eta}"
     
     def _cancel_conversion(self):
         """変換処理をキャンセル"""
         if self.is_running:
             if messagebox.askyesno("確認", "変換処理をキャンセルしますか？"):
                 self.is_running = False
-                self._log("変換処理をキャンセルしました。")
-                self._update_progress(text="キャンセルされました")
-                self._reset_ui()
+                # 未処理のファイルは変換せず、変換中のファイルは現在の変換方法が終わった時点で中断する
+                # （UIは変換スレッドが終了した時点で元に戻す）
+                self.cancel_event.set()
+                self.cancel_button.config(state=tk.DISABLED)
+                self._log("変換処理をキャンセルしています（変換中のファイルは現在の変換方法が終わった時点で中断します）...")
+                self._update_progress(text="キャンセル中...")
                 logger.info("変換処理がキャンセルされました")
     
     def _reset_ui(self):
@@ -544,8 +705,7 @@ class WordToTextConverterGUI:
             text += f"\n  -> 原因: {error_message}"
         text += "\n\n"
         
-        self.root.after(0, lambda t=text: self.failed_text.insert(tk.END, t))
-        self.root.after(0, lambda: self.failed_text.see(tk.END))
+        self.events.put(('failed', text))
         logger.warning(f"失敗リストに追加: {file_path}, 原因: {error_message}")
 
 def main():